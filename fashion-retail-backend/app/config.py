@@ -1,6 +1,12 @@
 #fashion-retail-backend/app/config.py
 import os
 
+ENGINES = ["forecast", "recommend", "monitor", "chat"]
+
+def _engine_list(name: str, allowed: list) -> list:
+    """Comma-separated engine names from the environment (default: all), restricted to `allowed`."""
+    return [e.strip() for e in os.environ.get(name, ",".join(ENGINES)).split(",") if e.strip() in allowed]
+
 class Settings:
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
     MODEL_DIR = os.path.join(os.path.dirname(BASE_DIR), "models")
@@ -13,4 +19,94 @@ class Settings:
     ANOMALY_PATH = os.path.join(MODEL_DIR, "anomaly.pth")
     ARTICLES_PATH = os.path.join(MODEL_DIR, "articles.csv")
 
+    # Memory-mapped ids/features/FAISS shared by all workers, Arrow catalog (see app/core/shared_artifacts.py)
+    SHARED_MMAP = os.environ.get("SHARED_MMAP", "1") == "1"
+    ARTICLES_ARROW_PATH = os.path.join(MODEL_DIR, "articles.arrow")
+    IDS_NPY_PATH = os.path.join(MODEL_DIR, "article_ids.npy")
+
+    # Forecasting
+    FORECAST_BATCH_SIZE = int(os.environ.get("FORECAST_BATCH_SIZE", 64))
+    FORECAST_MAX_BATCH_ITEMS = int(os.environ.get("FORECAST_MAX_BATCH_ITEMS", 1000))
+    FORECAST_CACHE_SIZE = int(os.environ.get("FORECAST_CACHE_SIZE", 2000))
+    FORECAST_CACHE_TTL = float(os.environ.get("FORECAST_CACHE_TTL", 24 * 3600))
+    # "live" = TFT inference per request, "store" = serve precomputed forecasts, live only on miss
+    FORECAST_SERVE_MODE = os.environ.get("FORECAST_SERVE_MODE", "live")
+    FORECAST_STORE_PATH = os.path.join(MODEL_DIR, "forecasts_precomputed.parquet")
+    # Store mode: requests re-check the store file for a newer version at most this often (0 = never)
+    FORECAST_STORE_CHECK_SECONDS = float(os.environ.get("FORECAST_STORE_CHECK_SECONDS", 60))
+    # POST /api/forecast/history/append only updates the worker that receives it, so it is off by
+    # default under several uvicorn workers (WEB_CONCURRENCY > 1): use app.jobs.ingest_transactions
+    # and restart the workers instead
+    HISTORY_APPEND_API = os.environ.get(
+        "HISTORY_APPEND_API", "1" if int(os.environ.get("WEB_CONCURRENCY", 1)) <= 1 else "0"
+    ) == "1"
+
+    # Anomaly Detection
+    ANOMALY_CHUNK_SIZE = int(os.environ.get("ANOMALY_CHUNK_SIZE", 65536))
+    ANOMALY_STREAM_CHUNK_SIZE = int(os.environ.get("ANOMALY_STREAM_CHUNK_SIZE", 100_000))
+    ANOMALY_NORM_SCALE = float(os.environ.get("ANOMALY_NORM_SCALE", 50.0)) # Calibrated on the Kaggle data
+    MONITOR_WINDOW = int(os.environ.get("MONITOR_WINDOW", 28))
+    MONITOR_MAX_ARTICLES = int(os.environ.get("MONITOR_MAX_ARTICLES", 100_000))
+    # Days of history before an article is scored against its own baseline instead of ANOMALY_NORM_SCALE
+    MONITOR_MIN_HISTORY_DAYS = int(os.environ.get("MONITOR_MIN_HISTORY_DAYS", 7))
+    MONITOR_MIN_SCALE = float(os.environ.get("MONITOR_MIN_SCALE", 1.0))  # Floor for slow sellers
+
+    # Chat (RAG)
+    CHAT_MODEL_NAME = os.environ.get("CHAT_MODEL_NAME", "all-MiniLM-L6-v2")
+    CHAT_INDEX_DIR = os.environ.get("CHAT_INDEX_DIR", MODEL_DIR)
+    CHAT_LLM_MODEL = os.environ.get("CHAT_LLM_MODEL", "llama-3.3-70b-versatile")
+    # "groq" = remote completion, "stub" = deterministic local template (tests / offline load runs)
+    CHAT_LLM_BACKEND = os.environ.get("CHAT_LLM_BACKEND", "groq")
+    CHAT_STUB_TOKEN_DELAY_MS = float(os.environ.get("CHAT_STUB_TOKEN_DELAY_MS", 0))
+    CHAT_LLM_TEMPERATURE = float(os.environ.get("CHAT_LLM_TEMPERATURE", 0.5))
+    CHAT_LLM_MAX_TOKENS = int(os.environ.get("CHAT_LLM_MAX_TOKENS", 300))
+    CHAT_LLM_TIMEOUT = float(os.environ.get("CHAT_LLM_TIMEOUT", 20))
+    CHAT_LLM_MAX_RETRIES = int(os.environ.get("CHAT_LLM_MAX_RETRIES", 2))
+    CHAT_LLM_BACKOFF = float(os.environ.get("CHAT_LLM_BACKOFF", 0.5)) # seconds, doubled per retry (with jitter)
+    CHAT_LLM_MAX_CONNECTIONS = int(os.environ.get("CHAT_LLM_MAX_CONNECTIONS", 20))
+    CHAT_LLM_MAX_CONCURRENCY = int(os.environ.get("CHAT_LLM_MAX_CONCURRENCY", 8))
+    CHAT_LLM_QUEUE_TIMEOUT = float(os.environ.get("CHAT_LLM_QUEUE_TIMEOUT", 5)) # wait for a free slot, then 503
+    CHAT_CANDIDATES = int(os.environ.get("CHAT_CANDIDATES", 20)) # per retriever (dense and BM25) before fusion
+    CHAT_TOP_K = int(os.environ.get("CHAT_TOP_K", 5))
+    CHAT_SNIPPET_DESC_CHARS = int(os.environ.get("CHAT_SNIPPET_DESC_CHARS", 240))
+    CHAT_CONTEXT_TOKEN_BUDGET = int(os.environ.get("CHAT_CONTEXT_TOKEN_BUDGET", 600)) # inventory block only
+    CHAT_EMBED_CACHE_SIZE = int(os.environ.get("CHAT_EMBED_CACHE_SIZE", 1000))
+    CHAT_CACHE_SIZE = int(os.environ.get("CHAT_CACHE_SIZE", 512))
+    CHAT_CACHE_TTL = float(os.environ.get("CHAT_CACHE_TTL", 3600))
+    # Paraphrase hits: reuse a reply when a recent query with the same filters is this close (cosine)
+    CHAT_SEMANTIC_CACHE = os.environ.get("CHAT_SEMANTIC_CACHE", "0") == "1"
+    CHAT_SEMANTIC_THRESHOLD = float(os.environ.get("CHAT_SEMANTIC_THRESHOLD", 0.95))
+
+    # Engines served by this process (e.g. ENABLED_ENGINES=monitor for a watchdog-only worker).
+    # Disabled engines are never imported: no routers, no torch/CLIP/SBERT/Groq imports.
+    ENGINES = ENGINES
+    ENABLED_ENGINES = _engine_list("ENABLED_ENGINES", ENGINES)
+
+    # Observability: /metrics is always on; `X-Profile: 1` per-request Server-Timing can be disabled
+    PROFILE_HEADER_ENABLED = os.environ.get("PROFILE_HEADER_ENABLED", "1") == "1"
+
+    # Background warm-up after startup (comma-separated engines; empty = load lazily on first request)
+    WARMUP_ENGINES = _engine_list("WARMUP_ENGINES", ENABLED_ENGINES)
+    WARMUP_INFERENCE = os.environ.get("WARMUP_INFERENCE", "1") == "1" # one dummy inference per engine once loaded
+
+    # Visual Search index: flat | flat_fp16 | ivf_flat | ivf_fp16 | ivf_pq | hnsw | hnsw_fp16
+    # (build ANN variants with `python -m app.jobs.build_image_index`)
+    IMAGE_INDEX_TYPE = os.environ.get("IMAGE_INDEX_TYPE", "flat")
+    FAISS_NPROBE = int(os.environ.get("FAISS_NPROBE", 16))
+    FAISS_EF_SEARCH = int(os.environ.get("FAISS_EF_SEARCH", 64))
+
+    # Visual Search micro-batching
+    VISUAL_BATCH_SIZE = int(os.environ.get("VISUAL_BATCH_SIZE", 16))
+    VISUAL_BATCH_WAIT_MS = float(os.environ.get("VISUAL_BATCH_WAIT_MS", 5))
+
+    # Inference executors: worker threads and max in-flight jobs (running + queued) per engine
+    ENGINE_WORKERS = {
+        name: int(os.environ.get(f"{name.upper()}_WORKERS", default))
+        for name, default in {"forecast": 2, "recommend": 2, "monitor": 2, "chat": 4}.items()
+    }
+    ENGINE_MAX_PENDING = {
+        name: int(os.environ.get(f"{name.upper()}_MAX_PENDING", 16 * workers))
+        for name, workers in ENGINE_WORKERS.items()
+    }
+
 settings = Settings()
\ No newline at end of file
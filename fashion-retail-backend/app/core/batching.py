@@ -0,0 +1,85 @@
+#fashion-retail-backend/app/core/batching.py
+import asyncio
+import contextvars
+from app.core.executor import EngineExecutor, EngineSaturated
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching in front of a batch function.
+    Concurrent submit() calls are collected for up to `max_wait_ms` or `max_batch_size`
+    items, run as one call of `batch_fn(items) -> results` on the engine executor, and
+    each caller's future is resolved with its own result. While every executor worker
+    is busy, new requests keep accumulating, so batches grow with load.
+    """
+    def __init__(self, batch_fn, executor: EngineExecutor, max_batch_size: int, max_wait_ms: float):
+        self.batch_fn = batch_fn
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._loop = None
+        self._queue = None
+        self._task = None
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.executor.max_pending * self.max_batch_size)
+            self._slots = asyncio.Semaphore(self.executor.max_workers)
+            # Fresh context: the collector outlives the request that happened to start it
+            self._task = contextvars.Context().run(loop.create_task, self._collect())
+
+    async def submit(self, item):
+        self._ensure_started()
+        future = self._loop.create_future()
+        try:
+            self._queue.put_nowait((item, future))
+        except asyncio.QueueFull:
+            raise EngineSaturated(self.executor.name)
+        return await future
+
+    async def _collect(self):
+        while True:
+            # Wait for a free worker first: requests queue up meanwhile and form a bigger batch
+            await self._slots.acquire()
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            self._loop.create_task(self._run(batch))
+
+    async def _run(self, batch):
+        try:
+            results = await self.executor.run(self.batch_fn, [item for item, _ in batch])
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "queued": self._queue.qsize() if self._queue else 0,
+        }
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
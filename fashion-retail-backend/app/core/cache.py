@@ -0,0 +1,86 @@
+#fashion-retail-backend/app/core/cache.py
+import threading
+import time
+from collections import OrderedDict
+
+class LRUTTLCache:
+    """
+    Thread-safe LRU cache with an optional time-to-live per entry.
+    Keeps hit/miss/eviction counters for the admin and metrics endpoints.
+    """
+    def __init__(self, maxsize: int = 1024, ttl: float = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key):
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[0] if entry else None
+
+    def discard_if(self, predicate) -> int:
+        """Removes every entry whose key matches `predicate`; returns how many were removed."""
+        with self._lock:
+            doomed = [k for k in self._data if predicate(k)]
+            for k in doomed:
+                del self._data[k]
+        return len(doomed)
+
+    def rekey(self, fn) -> int:
+        """Replaces every key with `fn(key)`, keeping order and expiry; None drops the entry. Returns how many were dropped."""
+        with self._lock:
+            moved = OrderedDict()
+            for key, entry in self._data.items():
+                new_key = fn(key)
+                if new_key is not None:
+                    moved[new_key] = entry
+            dropped = len(self._data) - len(moved)
+            self._data = moved
+        return dropped
+
+    def clear(self) -> int:
+        with self._lock:
+            removed = len(self._data)
+            self._data.clear()
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
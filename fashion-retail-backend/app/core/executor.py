@@ -0,0 +1,72 @@
+#fashion-retail-backend/app/core/executor.py
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from app.config import settings
+
+class EngineSaturated(Exception):
+    """Raised when an engine already has its maximum number of queued + running jobs."""
+    def __init__(self, engine: str):
+        super().__init__(f"{engine} engine is saturated, retry shortly")
+        self.engine = engine
+
+class EngineExecutor:
+    """
+    Bounded worker pool for one engine's blocking model work.
+    Keeps heavy inference off the event loop; beyond `max_pending` in-flight jobs
+    new work is rejected (EngineSaturated -> 503) instead of queueing without bound.
+    """
+    def __init__(self, name: str, max_workers: int, max_pending: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max(max_pending, max_workers)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-engine")
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    async def run(self, fn, *args, **kwargs):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise EngineSaturated(self.name)
+            self.pending += 1
+        # Carry contextvars (request profile) into the worker thread
+        context = contextvars.copy_context()
+        try:
+            future = self._pool.submit(functools.partial(context.run, fn, *args, **kwargs))
+        except BaseException:
+            self._job_done(None)
+            raise
+        # Released when the job really finishes (or is dropped from the queue), not when
+        # the awaiting request is cancelled: a cancelled request's job may still be running
+        future.add_done_callback(self._job_done)
+        return await asyncio.wrap_future(future)
+
+    def _job_done(self, future):
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+executors = {
+    name: EngineExecutor(name, workers, settings.ENGINE_MAX_PENDING[name])
+    for name, workers in settings.ENGINE_WORKERS.items()
+}
+
+def get_executor(name: str) -> EngineExecutor:
+    return executors[name]
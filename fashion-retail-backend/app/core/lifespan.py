@@ -1,36 +1,53 @@
+import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-import pandas as pd
 from app.config import settings
+from app.core.executor import executors
+from app.core.warmup import start_warmup
 
-# Import ALL Services
-from app.services.forecasting_service import forecaster
-from app.services.recommendation_service import recommender
-from app.services.anomaly_service import watchdog
-from app.services.chat_service import chat_engine
+# Services are imported per enabled engine (ENABLED_ENGINES), never all at once
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    print("\n🚀 STARTUP: Initializing Fashion Retail Intelligence System...")
+def _load_forecast_data():
+    from app.services.feature_pipeline import load_or_build_history
+    from app.services.forecasting_service import forecaster
 
-    # 1. Load Data (Keep this, it is safe and fast)
+    # Features are cached on disk and only rebuilt when the source changes
     try:
         print(f"📦 Loading Historical Data...")
-        df = pd.read_parquet(settings.DATA_PATH)
-        forecaster.load_data(df)
+        forecaster.load_history(load_or_build_history(settings.DATA_PATH, settings.ARTICLES_PATH))
         print("   ✅ History Data Loaded.")
     except Exception as e:
         print(f"   ❌ Data Load Failed: {e}")
 
-    # 2. LAZY LOAD STRATEGY: 
-    # We commented these out to prevent startup crashes. 
-    # They will now load automatically the first time they are used.
-    
-    # forecaster.load_model()   <-- This was causing the SegFault
-    # recommender.load_model()
-    # watchdog.load_model()
-    # chat_engine.load_resources()
+    if settings.FORECAST_SERVE_MODE == "store":
+        if os.path.exists(settings.FORECAST_STORE_PATH):
+            forecaster.load_store(settings.FORECAST_STORE_PATH)
+        else:
+            print(f"   ⚠️ Forecast store not found at {settings.FORECAST_STORE_PATH}, serving live.")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    print("\n🚀 STARTUP: Initializing Fashion Retail Intelligence System...")
+    print(f"   Engines enabled: {', '.join(settings.ENABLED_ENGINES) or 'none'}")
+
+    # 1. Load Data
+    if "forecast" in settings.ENABLED_ENGINES:
+        _load_forecast_data()
+
+    # 2. BACKGROUND WARM-UP:
+    # Loading inline here used to crash/stall startup, so engines load in daemon threads
+    # after the server is up. Requests that arrive first wait on the same per-engine lock
+    # (no duplicate loads); engines not listed in WARMUP_ENGINES still load on first use.
+    start_warmup(settings.WARMUP_ENGINES, inference=settings.WARMUP_INFERENCE)
 
-    print("✅ SYSTEM READY: Engines will load on demand.\n")
+    print(f"✅ SYSTEM READY: Warming up {', '.join(settings.WARMUP_ENGINES) or 'nothing'} in the background.\n")
     yield
-    print("🛑 SHUTDOWN: Cleaning up resources...")
\ No newline at end of file
+    print("🛑 SHUTDOWN: Cleaning up resources...")
+    if "recommend" in settings.ENABLED_ENGINES:
+        from app.services.recommendation_service import visual_batcher
+        await visual_batcher.close()
+    if "chat" in settings.ENABLED_ENGINES:
+        from app.services.chat_service import chat_engine
+        await chat_engine.llm.aclose()
+    for executor in executors.values():
+        executor.shutdown()
\ No newline at end of file
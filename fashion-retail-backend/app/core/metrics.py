@@ -0,0 +1,163 @@
+#fashion-retail-backend/app/core/metrics.py
+import contextvars
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency buckets (seconds): sub-ms cache hits up to multi-second LLM calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _label_text(labelnames, values) -> str:
+    if not labelnames:
+        return ""
+    escape = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    pairs = ",".join(f'{k}="{escape(v)}"' for k, v in zip(labelnames, values))
+    return "{" + pairs + "}"
+
+class Counter:
+    """Monotonic counter with optional labels."""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(labels.get(k, "") for k in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> list:
+        with self._lock:
+            return [f"{self.name}{_label_text(self.labelnames, key)} {value}" for key, value in self._values.items()]
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics) with optional labels."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(k, "") for k in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def samples(self) -> list:
+        lines = []
+        names = self.labelnames + ("le",)
+        with self._lock:
+            for key, (counts, total, count) in self._series.items():
+                cumulative = 0
+                for bound, n in zip(self.buckets, counts):
+                    cumulative += n
+                    le = "+Inf" if bound == math.inf else repr(bound)
+                    lines.append(f"{self.name}_bucket{_label_text(names, key + (le,))} {cumulative}")
+                lines.append(f"{self.name}_sum{_label_text(self.labelnames, key)} {total}")
+                lines.append(f"{self.name}_count{_label_text(self.labelnames, key)} {count}")
+        return lines
+
+class MetricsRegistry:
+    """
+    In-process registry rendered in the Prometheus text format on /metrics.
+    `collectors` are callables returning (name, kind, help, [(labels, value)]) for values
+    that already live elsewhere (cache and executor counters) and are read at scrape time.
+    """
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, help, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: tuple = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def register_collector(self, fn):
+        self._collectors.append(fn)
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        for collect in self._collectors:
+            try:
+                families = collect()
+            except Exception as e:
+                print(f"⚠️ Metrics collector failed: {e}")
+                continue
+            for name, kind, help, samples in families:
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_label_text(tuple(labels), tuple(labels.values()))} {value}")
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram(
+    "fris_stage_seconds", "Latency of engine pipeline stages.", ("engine", "stage")
+)
+HTTP_REQUESTS = registry.counter(
+    "fris_http_requests_total", "HTTP requests by route and status.", ("method", "route", "status")
+)
+HTTP_SECONDS = registry.histogram(
+    "fris_http_request_seconds", "HTTP request latency (until response headers).", ("method", "route")
+)
+
+# Per-request profile (X-Profile header): a list of (stage, seconds) shared by the request's tasks/threads
+_profile = contextvars.ContextVar("fris_profile", default=None)
+
+def start_profile():
+    return _profile.set([])
+
+def finish_profile(token) -> list:
+    timings = _profile.get()
+    _profile.reset(token)
+    return timings or []
+
+def server_timing(timings: list) -> str:
+    """Server-Timing header value, e.g. `chat.embed;dur=12.31, chat.llm;dur=820.50`."""
+    return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in timings)
+
+def record(engine: str, name: str, seconds: float):
+    STAGE_SECONDS.observe(seconds, engine=engine, stage=name)
+    timings = _profile.get()
+    if timings is not None:
+        timings.append((f"{engine}.{name}", seconds))
+
+@contextmanager
+def stage(engine: str, name: str):
+    """Times one pipeline stage into fris_stage_seconds (and the request profile, if on)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(engine, name, time.perf_counter() - started)
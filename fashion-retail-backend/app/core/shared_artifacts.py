@@ -0,0 +1,92 @@
+#fashion-retail-backend/app/core/shared_artifacts.py
+"""
+Loaders for the large read-only artifacts in mmap-friendly formats.
+The article-id .npy, the history feature .npy files and FAISS indexes are used straight
+from the mapping: they live in the OS page cache, so every uvicorn worker on the box
+shares one physical copy. The catalog is different: pandas needs its own columns, so each
+worker still holds a private copy; the Arrow file only skips CSV parsing and arrives
+already dictionary-encoded. Each loader falls back to the original format when the
+converted file is missing or older than its source
+(run `python -m app.jobs.export_shared_artifacts` to produce them).
+"""
+import os
+import pickle
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from app.config import settings
+
+def _is_fresh(converted: str, source: str) -> bool:
+    if not os.path.exists(converted):
+        return False
+    return not os.path.exists(source) or os.path.getmtime(converted) >= os.path.getmtime(source)
+
+@contextmanager
+def atomic_path(path: str):
+    """
+    Yields a temp path next to `path` and renames it over `path` once the block succeeds.
+    Workers that mapped the old file keep its pages (overwriting it in place can SIGBUS
+    them), and an interrupted write never leaves a truncated file behind.
+    """
+    tmp_path = path + ".tmp"
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def read_articles(columns: list = None) -> pd.DataFrame:
+    """
+    articles.csv as a DataFrame, from the Arrow IPC copy when available (no CSV parsing;
+    dictionary columns arrive as categoricals). The frame is a per-process copy, not shared pages.
+    """
+    if settings.SHARED_MMAP and _is_fresh(settings.ARTICLES_ARROW_PATH, settings.ARTICLES_PATH):
+        import pyarrow as pa
+        with pa.memory_map(settings.ARTICLES_ARROW_PATH) as source:
+            table = pa.ipc.open_file(source).read_all()
+            if columns:
+                table = table.select(columns)
+            return table.to_pandas()
+    return pd.read_csv(settings.ARTICLES_PATH, usecols=columns)
+
+def load_article_ids():
+    """Row -> article id mapping of the image index (mmap'd int64 .npy, else the pickle)."""
+    if settings.SHARED_MMAP and _is_fresh(settings.IDS_NPY_PATH, settings.IDS_PATH):
+        return np.load(settings.IDS_NPY_PATH, mmap_mode="r")
+    with open(settings.IDS_PATH, "rb") as f:
+        return pickle.load(f)
+
+def read_faiss_index(path: str):
+    """Reads a FAISS index memory-mapped when the installed FAISS supports it for this index type."""
+    import faiss
+    if settings.SHARED_MMAP:
+        flags = [getattr(faiss, "IO_FLAG_MMAP_IFC", None), faiss.IO_FLAG_MMAP]
+        for flag in flags:
+            if flag is None:
+                continue
+            try:
+                return faiss.read_index(path, flag | faiss.IO_FLAG_READ_ONLY)
+            except RuntimeError:
+                continue
+    return faiss.read_index(path)
+
+def export_articles():
+    import pyarrow as pa
+    from app.services.catalog_service import TEXT_COLUMNS
+    table = pa.Table.from_pandas(pd.read_csv(settings.ARTICLES_PATH), preserve_index=False)
+    # Same encoding the catalog applies on load, done once here: to_pandas() then yields categoricals
+    for i, field in enumerate(table.schema):
+        is_text = pa.types.is_string(field.type) or pa.types.is_large_string(field.type)
+        if is_text and field.name not in TEXT_COLUMNS:
+            table = table.set_column(i, field.name, table.column(i).dictionary_encode())
+    # Uncompressed IPC file: the on-disk layout is the in-memory layout, so it can be mapped
+    with atomic_path(settings.ARTICLES_ARROW_PATH) as tmp_path:
+        with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+def export_article_ids():
+    with open(settings.IDS_PATH, "rb") as f:
+        ids = pickle.load(f)
+    with atomic_path(settings.IDS_NPY_PATH) as tmp_path, open(tmp_path, "wb") as f:
+        np.save(f, np.asarray([int(i) for i in ids], dtype=np.int64))
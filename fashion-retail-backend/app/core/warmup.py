@@ -0,0 +1,84 @@
+#fashion-retail-backend/app/core/warmup.py
+import threading
+import time
+
+class EngineLoader:
+    """
+    Loads one engine at most once at a time: the first caller runs `load_fn`,
+    concurrent callers (warm-up thread or early requests) block on the same lock
+    and reuse the result instead of loading the model a second time.
+    """
+    def __init__(self, name: str, load_fn, ready_fn, warm_fn=None):
+        self.name = name
+        self.load_fn = load_fn
+        self.ready_fn = ready_fn
+        self.warm_fn = warm_fn
+        self._lock = threading.Lock()
+        self.state = "pending"
+        self.load_seconds = None
+        self.warm_seconds = None
+        self.error = None
+        loaders[name] = self
+
+    def ensure(self) -> bool:
+        """Returns True once the engine is usable, loading it first if needed."""
+        if self.ready_fn():
+            return True
+        with self._lock:
+            # Someone else may have finished the load while we waited
+            if self.ready_fn():
+                return True
+            self.state = "loading"
+            started = time.perf_counter()
+            try:
+                self.load_fn()
+                self.error = None
+            except Exception as e:
+                self.error = str(e)
+            self.load_seconds = round(time.perf_counter() - started, 3)
+            ready = self.ready_fn()
+            self.state = "ready" if ready else "failed"
+            return ready
+
+    def warm(self, inference: bool = True):
+        """Background entry point: load, then optionally run one dummy inference."""
+        if not self.ensure() or not inference or self.warm_fn is None:
+            return
+        started = time.perf_counter()
+        try:
+            self.warm_fn()
+            self.warm_seconds = round(time.perf_counter() - started, 3)
+            print(f"🔥 {self.name} engine warmed up ({self.warm_seconds}s).")
+        except Exception as e:
+            print(f"⚠️ {self.name} warm-up inference failed: {e}")
+
+    def status(self) -> dict:
+        if self.state != "loading" and self.ready_fn():
+            self.state = "ready"
+        return {
+            "state": self.state,
+            "ready": self.state == "ready",
+            "load_seconds": self.load_seconds,
+            "warmup_seconds": self.warm_seconds,
+            "error": self.error,
+        }
+
+loaders = {}
+
+def get_loader(name: str) -> EngineLoader:
+    return loaders[name]
+
+def start_warmup(names: list, inference: bool = True) -> list:
+    """Starts one daemon thread per engine; returns the threads (startup does not wait for them)."""
+    threads = []
+    for name in names:
+        if name not in loaders:
+            print(f"⚠️ Unknown engine '{name}' in WARMUP_ENGINES, skipping.")
+            continue
+        thread = threading.Thread(target=loaders[name].warm, args=(inference,), name=f"warmup-{name}", daemon=True)
+        thread.start()
+        threads.append(thread)
+    return threads
+
+def readiness() -> dict:
+    return {name: loader.status() for name, loader in loaders.items()}
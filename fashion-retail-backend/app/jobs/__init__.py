@@ -0,0 +1 @@
+#fashion-retail-backend/app/jobs/__init__.py
\ No newline at end of file
@@ -0,0 +1,69 @@
+#fashion-retail-backend/app/jobs/benchmark_image_index.py
+"""
+Recall@k / QPS / memory of image index variants against the exhaustive index.
+Usage: python -m app.jobs.benchmark_image_index [--kind hnsw --kind ivf_pq] [--queries 1000] [--k 10]
+Variants are loaded from disk when built, otherwise built in memory first.
+"""
+import argparse
+import json
+import os
+import time
+import numpy as np
+import faiss
+from app.config import settings
+from app.services.image_index import INDEX_KINDS, apply_search_params, build_index, extract_vectors, image_index_path
+
+def recall_at_k(truth: np.ndarray, found: np.ndarray) -> float:
+    hits = sum(len(set(t) & set(f)) for t, f in zip(truth.tolist(), found.tolist()))
+    return hits / truth.size
+
+def time_search(index, queries: np.ndarray, k: int, single: bool):
+    started = time.perf_counter()
+    if single:
+        found = np.vstack([index.search(q[None, :], k)[1] for q in queries])
+    else:
+        found = index.search(queries, k)[1]
+    return found, len(queries) / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ANN image index variants.")
+    parser.add_argument("--kind", action="append", choices=list(INDEX_KINDS))
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, default=settings.FAISS_NPROBE)
+    parser.add_argument("--ef-search", type=int, default=settings.FAISS_EF_SEARCH)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    kinds = args.kind or list(INDEX_KINDS)
+
+    flat = faiss.read_index(settings.FAISS_PATH)
+    vectors = extract_vectors(flat)
+    rng = np.random.default_rng(args.seed)
+    # Catalog vectors with a small perturbation stand in for real query photos
+    queries = vectors[rng.choice(len(vectors), size=min(args.queries, len(vectors)), replace=False)]
+    queries = (queries + rng.normal(scale=0.01, size=queries.shape)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    truth = flat.search(queries, args.k)[1]
+
+    report = []
+    for kind in kinds:
+        path = image_index_path(kind)
+        index = faiss.read_index(path) if os.path.exists(path) else build_index(vectors, kind, flat.metric_type)
+        apply_search_params(index, args.nprobe, args.ef_search)
+
+        found, batch_qps = time_search(index, queries, args.k, single=False)
+        _, single_qps = time_search(index, queries[:200], args.k, single=True)
+        report.append({
+            "kind": kind,
+            f"recall@{args.k}": round(recall_at_k(truth, found), 4),
+            "batch_qps": round(batch_qps, 1),
+            "single_qps": round(single_qps, 1),
+            "memory_mb": round(faiss.serialize_index(index).nbytes / 1e6, 2),
+        })
+        print(json.dumps(report[-1]))
+
+    print(json.dumps({"k": args.k, "queries": len(queries), "nprobe": args.nprobe,
+                      "ef_search": args.ef_search, "results": report}, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+#fashion-retail-backend/app/jobs/build_chat_index.py
+"""
+Offline build of the chat engine's SBERT embeddings, FAISS and BM25 indexes,
+and the per-article LLM context snippets.
+Usage: python -m app.jobs.build_chat_index [--force]
+"""
+import argparse
+from app.services.chat_service import chat_engine
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the persisted indexes and snippets used by the chat engine.")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if articles.csv and the model are unchanged")
+    args = parser.parse_args()
+
+    chat_engine.load_resources(rebuild_index=args.force)
+    if not chat_engine.loader.status()["ready"]:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
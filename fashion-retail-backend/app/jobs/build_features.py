@@ -0,0 +1,21 @@
+#fashion-retail-backend/app/jobs/build_features.py
+"""
+Offline feature build for the forecasting history.
+Usage: python -m app.jobs.build_features [--force]
+"""
+import argparse
+from app.config import settings
+from app.services.feature_pipeline import build_artifact, load_or_build_history
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the forecast history feature artifact.")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the source fingerprint is unchanged")
+    args = parser.parse_args()
+
+    if args.force:
+        build_artifact(settings.DATA_PATH, settings.ARTICLES_PATH)
+    else:
+        load_or_build_history(settings.DATA_PATH, settings.ARTICLES_PATH)
+
+if __name__ == "__main__":
+    main()
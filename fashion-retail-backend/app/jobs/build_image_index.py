@@ -0,0 +1,37 @@
+#fashion-retail-backend/app/jobs/build_image_index.py
+"""
+Converts the exhaustive CLIP image index into approximate (ANN) variants.
+Usage: python -m app.jobs.build_image_index --kind ivf_pq [--kind hnsw ...] [--nlist 1024] [--m 64]
+"""
+import argparse
+import os
+import time
+import faiss
+from app.config import settings
+from app.core.shared_artifacts import atomic_path
+from app.services.image_index import INDEX_KINDS, build_index, extract_vectors, image_index_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Build ANN variants of the image index.")
+    parser.add_argument("--kind", action="append", choices=[k for k in INDEX_KINDS if k != "flat"], required=True)
+    parser.add_argument("--nlist", type=int, default=None, help="IVF lists (default ~4*sqrt(n))")
+    parser.add_argument("--m", type=int, default=64, help="PQ sub-quantizers (bytes per vector)")
+    parser.add_argument("--hnsw-m", type=int, default=32, help="HNSW graph degree")
+    args = parser.parse_args()
+
+    flat = faiss.read_index(settings.FAISS_PATH)
+    vectors = extract_vectors(flat)
+    print(f"📐 Loaded {vectors.shape[0]:,} x {vectors.shape[1]} vectors from {settings.FAISS_PATH}")
+
+    for kind in args.kind:
+        started = time.perf_counter()
+        index = build_index(vectors, kind, flat.metric_type, nlist=args.nlist, m=args.m, hnsw_m=args.hnsw_m)
+        path = image_index_path(kind)
+        # Swapped in whole: running workers may have the previous index memory-mapped
+        with atomic_path(path) as tmp_path:
+            faiss.write_index(index, tmp_path)
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"   ✅ {kind}: {path} ({size_mb:.1f} MB, {time.perf_counter() - started:.1f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+#fashion-retail-backend/app/jobs/export_shared_artifacts.py
+"""
+Converts read-only artifacts to faster-loading formats:
+article_ids.pkl -> article_ids.npy and history features -> one .npy per feature
+(memory-mapped, shared across uvicorn workers; taken from the existing feature artifact,
+so ingested days are kept); articles.csv -> articles.arrow
+(dictionary-encoded, skips CSV parsing; still one private copy per worker).
+Usage: python -m app.jobs.export_shared_artifacts
+"""
+import os
+from app.config import settings
+from app.core.shared_artifacts import export_article_ids, export_articles
+from app.services.feature_pipeline import export_history_arrays
+
+def main():
+    if os.path.exists(settings.ARTICLES_PATH):
+        export_articles()
+        print(f"✅ {settings.ARTICLES_ARROW_PATH}")
+    if os.path.exists(settings.IDS_PATH):
+        export_article_ids()
+        print(f"✅ {settings.IDS_NPY_PATH}")
+    if os.path.exists(settings.DATA_PATH):
+        prefix = export_history_arrays(settings.DATA_PATH, settings.ARTICLES_PATH)
+        print(f"✅ {prefix}.*.npy")
+
+if __name__ == "__main__":
+    main()
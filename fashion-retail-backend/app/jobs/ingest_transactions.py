@@ -0,0 +1,52 @@
+"""
+Daily refresh: folds new transactions into the forecast history artifact without a full rebuild.
+Feature work is proportional to the new days (plus a 28-day look-back); writing the result
+still rewrites the whole artifact (plain I/O, O(history)). Artifact files are replaced
+atomically, so running API workers keep their current history until restarted; a
+single-worker API can take the same rows live via POST /api/forecast/history/append.
+Note: build_features --force rebuilds from DATA_PATH alone and drops days ingested here.
+Usage: python -m app.jobs.ingest_transactions new_days.parquet [more.csv ...] [--dry-run]
+"""
+import argparse
+import os
+import time
+import pandas as pd
+from app.config import settings
+from app.services.feature_pipeline import append_history, load_or_build_history, persist_history
+
+def read_batch(path: str) -> pd.DataFrame:
+    """t_dat, article_id and (optionally) sales columns from a Parquet or CSV file."""
+    if os.path.splitext(path)[1].lower() == ".csv":
+        frame = pd.read_csv(path, dtype={"article_id": str})
+    else:
+        frame = pd.read_parquet(path)
+    columns = [c for c in ["t_dat", "article_id", "sales"] if c in frame.columns]
+    return frame[columns]
+
+def main():
+    parser = argparse.ArgumentParser(description="Append new days of transactions to the forecast history.")
+    parser.add_argument("paths", nargs="+", help="Parquet/CSV files with t_dat, article_id[, sales]")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing the artifact")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    history = load_or_build_history(settings.DATA_PATH, settings.ARTICLES_PATH)
+    batch = pd.concat([read_batch(p) for p in args.paths], ignore_index=True)
+
+    print(f"📥 Ingesting {len(batch):,} rows from {len(args.paths)} file(s)...")
+    summary = append_history(history, batch)
+    summary.pop("updated_ids")
+    for key, value in summary.items():
+        print(f"   - {key}: {value}")
+
+    if summary["unknown_articles"]:
+        print("   ⚠️ Articles outside the history were skipped; they need a full feature rebuild.")
+    if args.dry_run or not (summary["days_added"] or summary.get("corrected_rows")):
+        print("ℹ️ Artifact left unchanged.")
+        return
+    persist_history(history, settings.DATA_PATH, settings.ARTICLES_PATH,
+                    note={"rows": summary["rows"], "last_day": summary["last_day"], "sources": args.paths})
+    print(f"✅ History extended to {summary['last_day']} in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
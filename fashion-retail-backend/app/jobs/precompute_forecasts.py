@@ -0,0 +1,80 @@
+#fashion-retail-backend/app/jobs/precompute_forecasts.py
+"""
+Nightly job: 28-day quantile forecasts for every article in the history.
+Usage: python -m app.jobs.precompute_forecasts [--workers 4] [--batch-size 64] [--output path]
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from app.config import settings
+from app.services.feature_pipeline import load_or_build_history
+from app.services.forecast_store import ForecastStore, QUANTILE_PREFIX
+from app.services.forecasting_service import _checkpoint_hash
+
+def _init_worker(threads: int):
+    import torch
+    from app.services.forecasting_service import forecaster
+
+    torch.set_num_threads(threads)
+    forecaster.load_history(load_or_build_history(settings.DATA_PATH, settings.ARTICLES_PATH))
+    forecaster.load_model()
+
+def _forecast_shard(args) -> pd.DataFrame:
+    item_ids, batch_size = args
+    from app.services.forecasting_service import forecaster
+
+    rows = []
+    for result in forecaster.predict_many(item_ids, batch_size=batch_size, with_quantiles=True):
+        if "error" in result:
+            print(f"   ⚠️ {result['item_id']}: {result['error']}")
+            continue
+        for entry in result["forecast"]:
+            row = {"item_id": result["item_id"], "date": entry["date"], "prediction": entry["prediction"]}
+            for q, value in entry.get("quantiles", {}).items():
+                row[f"{QUANTILE_PREFIX}{q}"] = value
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute catalog-wide forecasts into the forecast store.")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 1) // 2))
+    parser.add_argument("--batch-size", type=int, default=settings.FORECAST_BATCH_SIZE)
+    parser.add_argument("--shard-size", type=int, default=250, help="Articles per worker task")
+    parser.add_argument("--output", default=settings.FORECAST_STORE_PATH)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    # Built once here so every worker finds a fresh feature artifact on disk
+    history = load_or_build_history(settings.DATA_PATH, settings.ARTICLES_PATH)
+    item_ids = [str(i) for i in history.article_ids]
+    shards = [(item_ids[i:i + args.shard_size], args.batch_size) for i in range(0, len(item_ids), args.shard_size)]
+    threads = max(1, (os.cpu_count() or 1) // args.workers)
+
+    print(f"🔮 Forecasting {len(item_ids):,} articles in {len(shards)} shards on {args.workers} worker(s)...")
+    if args.workers == 1:
+        _init_worker(threads)
+        frames = [_forecast_shard(shard) for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(threads,)) as pool:
+            frames = list(pool.map(_forecast_shard, shards))
+
+    frame = pd.concat(frames, ignore_index=True)
+    if frame.empty:
+        print("❌ No forecasts produced, store left unchanged.")
+        return
+
+    frame['date'] = pd.to_datetime(frame['date'])
+    for col in frame.columns:
+        if col == 'prediction' or col.startswith(QUANTILE_PREFIX):
+            frame[col] = frame[col].astype(np.float32)
+    frame['history_version'] = history.version
+    frame['model_version'] = _checkpoint_hash(settings.TFT_MODEL_PATH)
+
+    ForecastStore.write(frame, args.output)
+    print(f"✅ Wrote {frame['item_id'].nunique():,} forecasts to {args.output} in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
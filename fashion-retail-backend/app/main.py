@@ -1,13 +1,18 @@
 #fashion-retail-backend/app/main.py
 import os
+import importlib
+import time
 # ⚠️ FIX MAC CRASHES:
 os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from app.core.executor import EngineSaturated
 from app.core.lifespan import lifespan
-from app.routers import health, forecast, recommend, monitor # 
-from app.routers import health, forecast, recommend, monitor, chat
+from app.core.metrics import HTTP_REQUESTS, HTTP_SECONDS, finish_profile, server_timing, start_profile
+from app.config import settings
+from app.routers import health, metrics
 
 app = FastAPI(title="FRIS API", lifespan=lifespan)
 
@@ -20,12 +25,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Register All Routers
+# Request metrics + opt-in profiling: send `X-Profile: 1` to get per-stage timings
+# back in a `Server-Timing` header (stages that run after headers, e.g. streamed LLM tokens, are not included)
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    token = start_profile() if settings.PROFILE_HEADER_ENABLED and request.headers.get("X-Profile") == "1" else None
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        elapsed = time.perf_counter() - started
+        # Route template (e.g. /api/forecast/{item_id}), never the raw path, to keep label cardinality bounded
+        endpoint = request.scope.get("endpoint")
+        route = getattr(request.scope.get("route"), "path", None) or (endpoint.__name__ if endpoint else "unmatched")
+        HTTP_REQUESTS.inc(method=request.method, route=route, status=status)
+        HTTP_SECONDS.observe(elapsed, method=request.method, route=route)
+        timings = finish_profile(token) if token is not None else None
+    if timings is not None:
+        response.headers["Server-Timing"] = server_timing(timings + [("total", elapsed)])
+        response.headers["Timing-Allow-Origin"] = "*"
+    return response
+
+# Backpressure: a saturated engine answers 503 instead of queueing forever
+@app.exception_handler(EngineSaturated)
+async def engine_saturated_handler(request: Request, exc: EngineSaturated):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+# Register Routers (one module per engine, only for ENABLED_ENGINES)
 app.include_router(health.router)
-app.include_router(forecast.router)
-app.include_router(recommend.router)
-app.include_router(monitor.router) 
-app.include_router(chat.router)
+app.include_router(metrics.router)
+for engine in settings.ENABLED_ENGINES:
+    app.include_router(importlib.import_module(f"app.routers.{engine}").router)
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,7 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict
-from app.services.chat_service import chat_engine
+from app.services.chat_service import chat_engine, encode_event
 
 router = APIRouter(prefix="/api/chat", tags=["Chat"])
 
@@ -13,5 +14,42 @@ async def chat_endpoint(request: ChatRequest):
     """
     Hybrid RAG Chatbot Endpoint.
     """
-    response = chat_engine.generate_response(request.messages)
-    return {"reply": response}
\ No newline at end of file
+    response = await chat_engine.agenerate_response(request.messages)
+    return {"reply": response}
+
+@router.post("/stream")
+async def chat_stream_endpoint(request: ChatRequest, format: str = Query("ndjson", pattern="^(ndjson|sse)$")):
+    """
+    Streaming variant: an `items` event with the retrieved product cards, then `token`
+    events as the reply is generated, then `done`. NDJSON lines or Server-Sent Events.
+    """
+    # Retrieval runs before the response starts, so a saturated engine still answers 503
+    prepared = await chat_engine.aretrieve(request.messages)
+
+    async def frames():
+        async for event in chat_engine.astream_events(prepared):
+            yield encode_event(event, format)
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(frames(), media_type=media_type, headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.get("/cache/stats")
+async def chat_cache_stats():
+    """
+    Admin: response cache (exact + semantic) and query-embedding cache counters.
+    """
+    return {"responses": chat_engine.responses.stats(), "embeddings": chat_engine.embeddings.stats()}
+
+@router.get("/llm")
+async def chat_llm_stats():
+    """
+    Admin: active LLM provider with call/retry/failure counters.
+    """
+    return chat_engine.llm.stats()
+
+@router.post("/cache/clear")
+async def clear_chat_cache():
+    """
+    Admin: drop every cached reply (e.g. after a catalog or prompt change).
+    """
+    return {"removed": chat_engine.responses.clear()}
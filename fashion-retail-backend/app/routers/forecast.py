@@ -1,15 +1,94 @@
 #fashion-retail-backend/app/routers/forecast.py
+import pandas as pd
 from fastapi import APIRouter, HTTPException
+from app.config import settings
+from app.core.executor import get_executor
+from app.schemas.request_models import ForecastBatchRequest, ForecastCacheRequest, HistoryAppendRequest
 from app.services.forecasting_service import forecaster
 
 router = APIRouter(prefix="/api/forecast", tags=["Forecasting"])
 
+@router.post("/batch")
+async def get_forecast_batch(request: ForecastBatchRequest):
+    """
+    Get 28-day sales forecasts for many items in one pass.
+    Sample Input: {"item_ids": ["706016001", "372860001"], "batch_size": 64}
+    """
+    if not request.item_ids:
+        raise HTTPException(status_code=400, detail="No item_ids provided")
+    if len(request.item_ids) > settings.FORECAST_MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.FORECAST_MAX_BATCH_ITEMS} items per batch")
+
+    results = await get_executor("forecast").run(forecaster.predict_many, request.item_ids, batch_size=request.batch_size)
+
+    if all(r.get("error") == "Service not ready" for r in results):
+        raise HTTPException(status_code=400, detail="Service not ready")
+
+    return {"results": results}
+
+@router.get("/cache")
+async def get_cache_stats():
+    """
+    Admin: forecast cache size and hit/miss counters.
+    """
+    return forecaster.cache.stats()
+
+@router.post("/cache/invalidate")
+async def invalidate_cache(request: ForecastCacheRequest):
+    """
+    Admin: drop cached forecasts for the given items (or everything when item_ids is omitted).
+    """
+    removed = forecaster.invalidate_cache(request.item_ids)
+    return {"invalidated": removed}
+
+@router.post("/cache/warm")
+async def warm_cache(request: ForecastCacheRequest):
+    """
+    Admin: precompute and cache forecasts for a list of items.
+    """
+    if not request.item_ids:
+        raise HTTPException(status_code=400, detail="No item_ids provided")
+    return await get_executor("forecast").run(forecaster.warm_cache, request.item_ids)
+
+@router.post("/history/append")
+async def append_history(request: HistoryAppendRequest):
+    """
+    Admin: fold new daily sales into the live history without reloading it.
+    Only the new days (plus a 28-day look-back) are recomputed and only affected forecasts are dropped.
+    Updates only the worker that receives the request, so it is disabled (HISTORY_APPEND_API=0,
+    the default when WEB_CONCURRENCY > 1) for multi-worker deployments: run app.jobs.ingest_transactions
+    and restart the workers instead. persist=true also rewrites the artifact on disk (a full rewrite).
+    Sample Input: {"records": [{"t_dat": "2020-09-23", "article_id": "706016001", "sales": 3}]}
+    """
+    if not settings.HISTORY_APPEND_API:
+        raise HTTPException(status_code=409, detail="History append API disabled (multi-worker); use app.jobs.ingest_transactions")
+    if not request.records:
+        raise HTTPException(status_code=400, detail="No records provided")
+    frame = pd.DataFrame({
+        "t_dat": [r.t_dat for r in request.records],
+        "article_id": [r.article_id for r in request.records],
+        "sales": [r.sales for r in request.records],
+    })
+    result = await get_executor("forecast").run(forecaster.ingest, frame, persist=request.persist)
+
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
+
+@router.post("/store/reload")
+async def reload_store():
+    """
+    Admin: reload the precomputed forecast store now (e.g. right after the nightly job).
+    """
+    reloaded = await get_executor("forecast").run(forecaster.refresh_store, force=True)
+    return {"reloaded": reloaded, "items": len(forecaster.store) if forecaster.store is not None else 0}
+
 @router.get("/{item_id}")
 async def get_forecast(item_id: str):
     """
     Get 28-day sales forecast for a specific item.
     """
-    result = forecaster.predict(item_id)
+    result = await get_executor("forecast").run(forecaster.predict, item_id)
     
     if "error" in result:
         raise HTTPException(status_code=400, detail=result["error"])
@@ -1,8 +1,28 @@
 #fashion-retail-backend/app/routers/health.py
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.config import settings
+from app.core.warmup import readiness
 
 router = APIRouter(prefix="/health", tags=["System"])
 
 @router.get("/")
 async def health_check():
-    return {"status": "healthy", "service": "Fashion Retail Intelligence"}
\ No newline at end of file
+    engines = readiness()
+    warming = [name for name in settings.WARMUP_ENGINES if name in engines and not engines[name]["ready"]]
+    return {
+        "status": "warming_up" if warming else "healthy",
+        "service": "Fashion Retail Intelligence",
+        "engines": engines,
+    }
+
+@router.get("/ready")
+async def readiness_check():
+    """
+    Readiness probe: 503 until every engine in WARMUP_ENGINES has loaded.
+    """
+    engines = readiness()
+    pending = [name for name in settings.WARMUP_ENGINES if name in engines and not engines[name]["ready"]]
+    if pending:
+        return JSONResponse(status_code=503, content={"ready": False, "pending": pending})
+    return {"ready": True}
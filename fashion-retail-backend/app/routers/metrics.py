@@ -0,0 +1,69 @@
+#fashion-retail-backend/app/routers/metrics.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.config import settings
+from app.core.executor import executors
+from app.core.metrics import registry
+from app.core.warmup import readiness
+
+router = APIRouter(tags=["System"])
+
+def _cache_families(caches: dict) -> list:
+    """Hit/miss/eviction counters and size of the LRU caches, labelled by cache name."""
+    stats = {name: cache.stats() for name, cache in caches.items()}
+    families = []
+    for field, kind in (("hits", "counter"), ("misses", "counter"), ("evictions", "counter"), ("size", "gauge")):
+        suffix = "_total" if kind == "counter" else ""
+        families.append((
+            f"fris_cache_{field}{suffix}", kind, f"Cache {field}.",
+            [({"cache": name}, s[field]) for name, s in stats.items() if field in s],
+        ))
+    return families
+
+def collect_engine_stats() -> list:
+    """Scrape-time view of counters that already live in the engines (executors, caches, batcher, LLM)."""
+    families = []
+    for field, kind in (("pending", "gauge"), ("completed", "counter"), ("rejected", "counter")):
+        suffix = "_total" if kind == "counter" else ""
+        families.append((
+            f"fris_executor_{field}{suffix}", kind, f"Engine executor jobs {field}.",
+            [({"engine": name}, executor.stats()[field]) for name, executor in executors.items()],
+        ))
+    families.append((
+        "fris_engine_ready", "gauge", "1 once the engine's models are loaded.",
+        [({"engine": name}, int(status["ready"])) for name, status in readiness().items()],
+    ))
+
+    caches = {}
+    if "forecast" in settings.ENABLED_ENGINES:
+        from app.services.forecasting_service import forecaster
+        caches["forecast"] = forecaster.cache
+    if "chat" in settings.ENABLED_ENGINES:
+        from app.services.chat_service import chat_engine
+        caches["chat_embeddings"] = chat_engine.embeddings
+        responses = chat_engine.responses.stats()
+        families.append((
+            "fris_chat_response_cache_total", "counter", "Chat response cache lookups by outcome.",
+            [({"outcome": o}, responses[f"{o}_hits" if o != "misses" else o]) for o in ("exact", "semantic", "misses")],
+        ))
+        llm = chat_engine.llm.stats()
+        families.append((
+            "fris_llm_calls_total", "counter", "LLM provider calls by outcome.",
+            [({"provider": llm["provider"], "outcome": o}, llm[o]) for o in ("calls", "retries", "failures")],
+        ))
+    if "recommend" in settings.ENABLED_ENGINES:
+        from app.services.recommendation_service import visual_batcher
+        batches = visual_batcher.stats()
+        families.append(("fris_visual_batches_total", "counter", "Visual search micro-batches run.", [({}, batches["batches"])]))
+        families.append(("fris_visual_batch_items_total", "counter", "Images scored in micro-batches.", [({}, batches["items"])]))
+    families.extend(_cache_families(caches))
+    return families
+
+registry.register_collector(collect_engine_stats)
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus scrape endpoint: stage/request latency histograms plus engine counters.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
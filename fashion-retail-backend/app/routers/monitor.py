@@ -1,6 +1,14 @@
 #fashion-retail-backend/app/routers/monitor.py
-from fastapi import APIRouter, Body, HTTPException
-from app.services.anomaly_service import watchdog
+import json
+import shutil
+import tempfile
+from fastapi import APIRouter, Body, File, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from app.config import settings
+from app.core.executor import EngineSaturated, get_executor
+from app.services.anomaly_service import monitor, watchdog
+from app.services.transaction_readers import FORMATS, detect_format, iter_transaction_chunks
 
 # --- 🚨 THIS VARIABLE IS REQUIRED ---
 router = APIRouter(prefix="/api/monitor", tags=["Anomaly Detection"])
@@ -14,5 +22,76 @@ async def check_anomalies(transactions: list = Body(...)):
     if not transactions:
         raise HTTPException(status_code=400, detail="No transactions provided")
         
-    results = watchdog.detect(transactions)
-    return results
\ No newline at end of file
+    results = await get_executor("monitor").run(watchdog.detect, transactions)
+    return results
+
+@router.post("/check/stream")
+async def check_anomalies_stream(file: UploadFile = File(...), format: str = None, only_critical: bool = False):
+    """
+    Upload a transaction file (NDJSON, CSV or Parquet) -> NDJSON stream of results.
+    Rows are scored chunk by chunk, so memory does not grow with the file size.
+    Use ?only_critical=true to stream back just the CRITICAL rows.
+    """
+    fmt = format or detect_format(file.filename)
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format, expected one of {list(FORMATS)}")
+
+    # The upload is closed once this handler returns, so copy it to a file the stream owns
+    spool = tempfile.TemporaryFile()
+    await run_in_threadpool(shutil.copyfileobj, file.file, spool)
+    spool.seek(0)
+
+    # Each step (read + score one chunk) runs as its own job on the bounded monitor
+    # pool, so streamed uploads count against max_pending like /check does
+    executor = get_executor("monitor")
+    chunks = iter_transaction_chunks(spool, fmt, settings.ANOMALY_STREAM_CHUNK_SIZE)
+    lines = watchdog.detect_stream(chunks, only_critical=only_critical)
+    try:
+        # First step before the response starts: saturation is still a plain 503
+        first = await executor.run(next, lines, None)
+    except BaseException:
+        spool.close()
+        raise
+
+    async def stream():
+        try:
+            block = first
+            while block is not None:
+                if block:
+                    yield block
+                try:
+                    block = await executor.run(next, lines, None)
+                except EngineSaturated as e:
+                    # Headers are already sent: end the stream with an error line instead
+                    yield json.dumps({"error": str(e), "status": "ERROR"}) + "\n"
+                    return
+        finally:
+            spool.close()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@router.post("/events")
+async def ingest_events(events: list = Body(...)):
+    """
+    Real-time mode: feed raw sales events, lag_7 is derived from per-article state.
+    Sample Input: [{"article_id": "706016001", "t_dat": "2020-09-22", "sales": 3}]
+    """
+    if not events:
+        raise HTTPException(status_code=400, detail="No events provided")
+
+    return await get_executor("monitor").run(monitor.ingest, events)
+
+@router.get("/state")
+async def monitor_state():
+    """
+    Size and counters of the online monitor state.
+    """
+    return monitor.stats()
+
+@router.delete("/state")
+async def reset_monitor_state():
+    """
+    Drops all per-article rolling windows.
+    """
+    monitor.reset()
+    return monitor.stats()
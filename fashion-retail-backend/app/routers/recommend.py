@@ -1,6 +1,8 @@
 #fashion-retail-backend/app/routers/recommend.py
 from fastapi import APIRouter, UploadFile, File, HTTPException
-from app.services.recommendation_service import recommender
+from app.core.executor import EngineSaturated
+from app.core.metrics import stage
+from app.services.recommendation_service import visual_batcher
 
 # --- 🚨 THIS VARIABLE IS WHAT MAIN.PY IS LOOKING FOR ---
 router = APIRouter(prefix="/api/recommend", tags=["Visual Search"])
@@ -15,11 +17,15 @@ async def visual_search(file: UploadFile = File(...)):
         image_bytes = await file.read()
         
         # Pass to the service
-        result = recommender.search(image_bytes)
+        # Queue wait + the shared batch (its per-stage timings are recorded by the batch itself)
+        with stage("recommend", "batched_search"):
+            result = await visual_batcher.submit(image_bytes)
         
         if "error" in result:
             raise HTTPException(status_code=500, detail=result["error"])
             
         return result
+    except (HTTPException, EngineSaturated):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
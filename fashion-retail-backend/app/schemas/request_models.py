@@ -1,10 +1,27 @@
 #fashion-retail-backend/app/schemas/request_models.py
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
 class Transaction(BaseModel):
     sales: float
     lag_7: float
 
 class TransactionBatch(BaseModel):
-    transactions: List[Transaction]
\ No newline at end of file
+    transactions: List[Transaction]
+
+class ForecastBatchRequest(BaseModel):
+    item_ids: List[str]
+    batch_size: Optional[int] = Field(None, ge=1)
+
+class ForecastCacheRequest(BaseModel):
+    item_ids: Optional[List[str]] = None
+
+class SalesRecord(BaseModel):
+    t_dat: str
+    article_id: str
+    # Rows without sales are single transactions and are counted per day
+    sales: float = 1.0
+
+class HistoryAppendRequest(BaseModel):
+    records: List[SalesRecord]
+    persist: bool = False
@@ -1,20 +1,34 @@
 #fashion-retail-backend/app/services/anomaly_service.py
-import torch
-import torch.nn as nn
 import numpy as np
+import pandas as pd
+import json
 import os
+import threading
+from collections import OrderedDict
+from datetime import date
 from app.config import settings
+from app.core.metrics import stage
+from app.core.warmup import EngineLoader
 
 class AnomalyService:
     def __init__(self):
         self.model = None
         self.threshold = 2.0 # Threshold from our Kaggle analysis
+        self.critical_error = 0.5 # Reconstruction error above which a row is flagged
+        self._weights = None
+        self._ready = False
+        self.loader = EngineLoader("monitor", self.load_model, lambda: self._ready,
+                                   warm_fn=lambda: self.score(np.zeros(8, dtype=np.float32), np.zeros(8, dtype=np.float32)))
         
     def load_model(self):
         print(f"⏳ Loading Anomaly Detector from {settings.ANOMALY_PATH}...")
         try:
+            # torch is only needed to read the checkpoint; scoring itself is NumPy
+            import torch
+            import torch.nn as nn
+
             # 1. Define Architecture (Must match Kaggle exactly)
-            self.model = nn.Sequential(
+            model = nn.Sequential(
                 nn.Linear(2, 1), # Input: [Volume, Lag_7]
                 nn.Tanh(),
                 nn.Linear(1, 2)  # Reconstruction
@@ -23,60 +37,306 @@ class AnomalyService:
             # 2. Load Weights
             if os.path.exists(settings.ANOMALY_PATH):
                 state_dict = torch.load(settings.ANOMALY_PATH, map_location='cpu')
-                self.model.load_state_dict(state_dict)
-                self.model.eval()
+                model.load_state_dict(state_dict)
+                model.eval()
                 print("✅ Anomaly Detector Loaded.")
             else:
                 print(f"⚠️ Anomaly model file not found at {settings.ANOMALY_PATH}")
+
+            # Weights first, flag last: scoring only starts once both are in place
+            self._weights = self._extract_weights(model)
+            self.model = model
+            self._ready = True
                 
         except Exception as e:
             print(f"❌ Error loading Anomaly Model: {e}")
 
-    def detect(self, transactions: list):
+    @staticmethod
+    def _extract_weights(model) -> tuple:
+        # The 2->1->2 autoencoder is tiny, so batch scoring runs as plain NumPy matmuls
+        encoder, decoder = model[0], model[2]
+        return tuple(
+            p.detach().cpu().numpy().astype(np.float32)
+            for p in (encoder.weight.T, encoder.bias, decoder.weight.T, decoder.bias)
+        )
+
+    def score(self, sales: np.ndarray, lag: np.ndarray, scale=None) -> np.ndarray:
         """
-        Input: List of {"sales": 50, "lag_7": 45}
-        Output: List of {"status": "OK", "score": 0.1}
+        Reconstruction error for whole columns of sales / lag_7 values.
+        `scale` is the normalisation divisor, either one value or one per row
+        (defaults to ANOMALY_NORM_SCALE).
+        Works in chunks of ANOMALY_CHUNK_SIZE rows to bound temporary memory.
         """
+        w1, b1, w2, b2 = self._weights
+        scale = np.broadcast_to(np.asarray(settings.ANOMALY_NORM_SCALE if scale is None else scale, dtype=np.float64), (len(sales),))
+        errors = np.empty(len(sales), dtype=np.float32)
+        chunk = settings.ANOMALY_CHUNK_SIZE
+        for start in range(0, len(sales), chunk):
+            stop = start + chunk
+            # Normalization Logic (Calibrated)
+            x = np.empty((len(sales[start:stop]), 2), dtype=np.float32)
+            x[:, 0] = sales[start:stop] / scale[start:stop]
+            x[:, 1] = lag[start:stop] / scale[start:stop]
+            reconstruction = np.tanh(x @ w1 + b1) @ w2 + b2
+            errors[start:stop] = np.mean((x - reconstruction) ** 2, axis=1)
+        return errors
+
+    @staticmethod
+    def _column(transactions: list, key: str) -> np.ndarray:
+        raw = [tx.get(key, 0) if isinstance(tx, dict) else None for tx in transactions]
+        try:
+            return np.array(raw, dtype=np.float64)
+        except (TypeError, ValueError):
+            # Mixed garbage (e.g. "abc"): coerce so bad rows become NaN and are reported below
+            return pd.to_numeric(pd.Series(raw, dtype=object), errors='coerce').to_numpy(dtype=np.float64)
+
+    @staticmethod
+    def _row_error(tx) -> str:
+        try:
+            if not isinstance(tx, dict):
+                raise TypeError(f"transaction must be an object, got {type(tx).__name__}")
+            float(tx.get('sales', 0))
+            float(tx.get('lag_7', 0))
+            return "sales and lag_7 must be finite numbers"
+        except Exception as e:
+            return str(e)
+
+    def _ensure_loaded(self) -> bool:
         # ⚠️ LAZY LOAD: If model isn't loaded, load it now!
-        if self.model is None:
+        if not self._ready:
             print("⚠️ Lazy Loading Anomaly Detector...")
-            self.load_model()
+            self.loader.ensure()
+        return self._ready
+
+    def _format(self, sales, lag, row_errors):
+        valid = np.isfinite(sales) & np.isfinite(lag)
+        errors = np.zeros(len(sales), dtype=np.float32)
+        errors[valid] = self.score(sales[valid], lag[valid])
+        # Threshold Check
+        critical = errors > self.critical_error
 
+        return [
+            {"sales": s, "reconstruction_error": round(e, 4), "status": "CRITICAL" if c else "OK"}
+            if ok else {"error": row_errors(i), "status": "ERROR"}
+            for i, (s, e, c, ok) in enumerate(zip(sales.tolist(), errors.tolist(), critical.tolist(), valid.tolist()))
+        ]
+
+    def detect(self, transactions: list):
+        """
+        Input: List of {"sales": 50, "lag_7": 45}
+        Output: List of {"status": "OK", "score": 0.1}
+        """
         # If it's STILL None after trying to load, return error (but ideally this won't happen)
-        if self.model is None:
+        if not self._ensure_loaded():
             return [{"error": "Anomaly Model could not be loaded", "status": "CRITICAL", "sales": 0, "reconstruction_error": 0}]
 
-        results = []
-        
-        for tx in transactions:
-            try:
-                sales = float(tx.get('sales', 0))
-                lag = float(tx.get('lag_7', 0))
-
-                # Normalization Logic (Calibrated)
-                vol_norm = sales / 50.0 
-                lag_norm = lag / 50.0
-                
-                input_tensor = torch.FloatTensor([[vol_norm, lag_norm]])
-                
-                # Inference
-                with torch.no_grad():
-                    reconstruction = self.model(input_tensor)
-                    loss = torch.mean((input_tensor - reconstruction)**2).item()
-                
-                # Threshold Check
-                status = "CRITICAL" if loss > 0.5 else "OK"
-                
-                results.append({
-                    "sales": sales,
-                    "reconstruction_error": round(loss, 4),
-                    "status": status
-                })
-                
-            except Exception as e:
-                results.append({"error": str(e), "status": "ERROR"})
-            
+        with stage("monitor", "parse"):
+            sales = self._column(transactions, 'sales')
+            lag = self._column(transactions, 'lag_7')
+        with stage("monitor", "score"):
+            return self._format(sales, lag, lambda i: self._row_error(transactions[i]))
+
+    def detect_frame(self, frame: pd.DataFrame):
+        """Same as detect, for a DataFrame chunk (missing columns count as 0, like missing keys)."""
+        columns = []
+        for key in ('sales', 'lag_7'):
+            if key in frame.columns:
+                columns.append(pd.to_numeric(frame[key], errors='coerce').to_numpy(dtype=np.float64))
+            else:
+                columns.append(np.zeros(len(frame)))
+        with stage("monitor", "score"):
+            return self._format(*columns, lambda i: "sales and lag_7 must be finite numbers")
+
+    def detect_stream(self, chunks, only_critical: bool = False):
+        """
+        Scores an iterator of chunks (lists of dicts or DataFrames) and yields NDJSON lines.
+        Memory stays bounded by one chunk; every result carries its 0-based input `row`.
+        Yields exactly once per chunk ("" when nothing in it is reported), so callers
+        can step through the input one chunk at a time.
+        """
+        if not self._ensure_loaded():
+            yield json.dumps({"error": "Anomaly Model could not be loaded", "status": "CRITICAL"}) + "\n"
+            return
+
+        offset = 0
+        for chunk in chunks:
+            results = self.detect_frame(chunk) if isinstance(chunk, pd.DataFrame) else self.detect(chunk)
+            lines = []
+            for i, result in enumerate(results):
+                if only_critical and result["status"] != "CRITICAL":
+                    continue
+                result["row"] = offset + i
+                lines.append(json.dumps(result))
+            offset += len(results)
+            yield "\n".join(lines) + "\n" if lines else ""
+
+
+class OnlineAnomalyMonitor:
+    """
+    Stateful feed processor for raw sales events {"article_id", "t_dat" | "day", "sales"}.
+    Each article owns one fixed-size ring buffer of daily totals, so lag_7 and the
+    rolling mean/std are maintained incrementally and every event costs O(1).
+    Memory is bounded by MONITOR_MAX_ARTICLES x MONITOR_WINDOW; the least recently
+    seen article is evicted when the table is full.
+    """
+    def __init__(self, scorer: AnomalyService, window: int = None, max_articles: int = None):
+        self.scorer = scorer
+        self.window = max(window or settings.MONITOR_WINDOW, 8)
+        self.max_articles = max_articles or settings.MONITOR_MAX_ARTICLES
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._slots = OrderedDict()
+            self._free = []
+            self._ring = None
+            self._allocate(min(1024, self.max_articles))
+            self.events = 0
+            self.evictions = 0
+
+    def _allocate(self, capacity: int):
+        old = self._ring
+        ring = np.zeros((capacity, self.window), dtype=np.float64)
+        counts = np.zeros(capacity, dtype=np.int64)     # days seen; ring position = count % window
+        last_day = np.full(capacity, -1, dtype=np.int64)
+        sums = np.zeros(capacity, dtype=np.float64)
+        sumsq = np.zeros(capacity, dtype=np.float64)
+        if old is not None:
+            n = len(old)
+            ring[:n], counts[:n], last_day[:n] = old, self._counts, self._last_day
+            sums[:n], sumsq[:n] = self._sums, self._sumsq
+        # Free slots are popped from the end, so lower slots are handed out first
+        self._free.extend(range(capacity - 1, (0 if old is None else len(old)) - 1, -1))
+        self._ring, self._counts, self._last_day, self._sums, self._sumsq = ring, counts, last_day, sums, sumsq
+
+    def _slot(self, article_id) -> int:
+        slot = self._slots.get(article_id)
+        if slot is not None:
+            self._slots.move_to_end(article_id)
+            return slot
+        if not self._free:
+            if len(self._ring) < self.max_articles:
+                self._allocate(min(len(self._ring) * 2, self.max_articles))
+            else:
+                _, slot = self._slots.popitem(last=False)
+                self.evictions += 1
+                self._ring[slot] = 0.0
+                self._counts[slot], self._last_day[slot] = 0, -1
+                self._sums[slot] = self._sumsq[slot] = 0.0
+                self._free.append(slot)
+        slot = self._free.pop()
+        self._slots[article_id] = slot
+        return slot
+
+    def _push_day(self, slot: int, value: float):
+        pos = self._counts[slot] % self.window
+        old = self._ring[slot, pos]
+        self._ring[slot, pos] = value
+        self._sums[slot] += value - old
+        self._sumsq[slot] += value * value - old * old
+        self._counts[slot] += 1
+
+    def _advance(self, slot: int, day: int):
+        """Moves an article's ring to `day`, filling skipped days with zero sales."""
+        last = self._last_day[slot]
+        gap = day - last if last >= 0 else 1
+        if gap > self.window:
+            self._ring[slot] = 0.0
+            self._sums[slot] = self._sumsq[slot] = 0.0
+            self._counts[slot] += gap - 1
+            gap = 1
+        for _ in range(gap):
+            self._push_day(slot, 0.0)
+        self._last_day[slot] = day
+
+    @staticmethod
+    def _day(event: dict, fallback: int) -> int:
+        if "day" in event:
+            return int(event["day"])
+        if "t_dat" in event:
+            return date.fromisoformat(str(event["t_dat"])[:10]).toordinal()
+        return fallback
+
+    def ingest(self, events: list):
+        """
+        Updates the per-article state with each event and scores the article's running
+        daily total against its lag_7. Events without a day start a new day.
+        Once an article has MONITOR_MIN_HISTORY_DAYS of history, sales and lag_7 are
+        normalised by its own rolling mean over the previous days, so a spike is judged
+        against the article's usual volume; until then ANOMALY_NORM_SCALE applies.
+        """
+        if not self.scorer._ensure_loaded():
+            return [{"error": "Anomaly Model could not be loaded", "status": "CRITICAL"}]
+
+        rows, errors = [], {}
+        with self._lock:
+            for i, event in enumerate(events):
+                try:
+                    article_id = str(event["article_id"])
+                    quantity = float(event.get("sales", 1))
+                    slot = self._slot(article_id)
+                    last = int(self._last_day[slot])
+                    day = self._day(event, last + 1 if last >= 0 else 0)
+                    if last >= 0 and day < last:
+                        raise ValueError(f"out-of-order event for day {day}, article is at day {last}")
+                    if day != last:
+                        self._advance(slot, day)
+
+                    pos = (self._counts[slot] - 1) % self.window
+                    today = self._ring[slot, pos] + quantity
+                    self._sums[slot] += quantity
+                    self._sumsq[slot] += today * today - self._ring[slot, pos] ** 2
+                    self._ring[slot, pos] = today
+
+                    count = int(self._counts[slot])
+                    lag_7 = self._ring[slot, (count - 8) % self.window] if count > 7 else 0.0
+                    n = min(count, self.window)
+                    mean = self._sums[slot] / n
+                    std = max(self._sumsq[slot] / n - mean * mean, 0.0) ** 0.5
+                    # Baseline excludes today, otherwise a spike would dampen its own score
+                    if count > settings.MONITOR_MIN_HISTORY_DAYS:
+                        baseline = max((self._sums[slot] - today) / max(n - 1, 1), settings.MONITOR_MIN_SCALE)
+                    else:
+                        baseline = settings.ANOMALY_NORM_SCALE
+                    rows.append((i, article_id, day, today, lag_7, mean, std, baseline))
+                    self.events += 1
+                except Exception as e:
+                    errors[i] = str(e)
+
+        scores = self.scorer.score(
+            np.array([r[3] for r in rows], dtype=np.float64),
+            np.array([r[4] for r in rows], dtype=np.float64),
+            np.array([r[7] for r in rows], dtype=np.float64),
+        ) if rows else np.empty(0, dtype=np.float32)
+
+        results = [None] * len(events)
+        for (i, article_id, day, today, lag_7, mean, std, baseline), loss in zip(rows, scores.tolist()):
+            results[i] = {
+                "article_id": article_id,
+                "day": day,
+                "sales": today,
+                "lag_7": lag_7,
+                "rolling_mean": round(mean, 4),
+                "zscore": round((today - mean) / std, 4) if std > 0 else 0.0,
+                "baseline": round(baseline, 4),
+                "reconstruction_error": round(loss, 4),
+                "status": "CRITICAL" if loss > self.scorer.critical_error else "OK",
+            }
+        for i, message in errors.items():
+            results[i] = {"error": message, "status": "ERROR"}
         return results
 
+    def stats(self) -> dict:
+        return {
+            "articles": len(self._slots),
+            "max_articles": self.max_articles,
+            "window_days": self.window,
+            "events": self.events,
+            "evictions": self.evictions,
+            "state_bytes": int(sum(a.nbytes for a in (self._ring, self._counts, self._last_day, self._sums, self._sumsq))),
+        }
+
 
-watchdog = AnomalyService()
\ No newline at end of file
+watchdog = AnomalyService()
+monitor = OnlineAnomalyMonitor(watchdog)
\ No newline at end of file
@@ -0,0 +1,74 @@
+#fashion-retail-backend/app/services/catalog_service.py
+import threading
+import numpy as np
+import pandas as pd
+from app.core.shared_artifacts import read_articles
+
+# Free text stays as plain strings; every other text column is dictionary-encoded
+TEXT_COLUMNS = {"prod_name", "detail_desc"}
+
+class CatalogService:
+    """
+    One shared, compact copy of articles.csv for all engines.
+    article_id is an int64 key, repeated attributes are categoricals, and an
+    id -> row hash index answers bulk lookups without string work per request.
+    """
+    def __init__(self):
+        self.df = None
+        self._index = None
+        self._display_ids = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        with self._lock:
+            if self.df is not None:
+                return
+            print("🗂️ Loading Article Catalog...")
+            df = read_articles()
+            df['article_id'] = df['article_id'].astype('int64')
+            for col in df.columns:
+                is_text = df[col].dtype == object or isinstance(df[col].dtype, pd.StringDtype)
+                if is_text and col not in TEXT_COLUMNS:
+                    df[col] = df[col].astype('category')
+            self._index = pd.Index(df['article_id'])
+            self.df = df
+            print(f"✅ Catalog Ready ({len(df):,} articles, {df.memory_usage(deep=True).sum() / 1e6:.0f} MB).")
+
+    def ensure_loaded(self) -> pd.DataFrame:
+        if self.df is None:
+            self.load()
+        return self.df
+
+    @staticmethod
+    def to_key(article_id) -> int:
+        """'0706016001', '706016001' and 706016001 all map to the same int64 key."""
+        return int(article_id)
+
+    @staticmethod
+    def format_id(article_id) -> str:
+        # Standard H&M format: 10 digits with leading zeros
+        return str(int(article_id)).zfill(10)
+
+    @property
+    def display_ids(self) -> np.ndarray:
+        """Zero-filled 10-digit ids for every row, rendered once."""
+        if self._display_ids is None:
+            self._display_ids = np.char.zfill(self.ensure_loaded()['article_id'].to_numpy().astype(str), 10)
+        return self._display_ids
+
+    def rows(self, article_ids) -> np.ndarray:
+        """Row positions for many ids at once (-1 where the id is unknown)."""
+        self.ensure_loaded()
+        keys = np.asarray([self.to_key(a) for a in article_ids], dtype=np.int64)
+        return self._index.get_indexer(keys)
+
+    def lookup(self, article_ids, columns: list = None) -> pd.DataFrame:
+        """Catalog rows for the ids that exist, in request order."""
+        rows = self.rows(article_ids)
+        frame = self.df.iloc[rows[rows >= 0]]
+        return frame[columns] if columns else frame
+
+    def frame(self, columns: list) -> pd.DataFrame:
+        return self.ensure_loaded()[columns]
+
+catalog = CatalogService()
@@ -1,55 +1,111 @@
 
 import pandas as pd
 import numpy as np
-import faiss
 import re
-import os
-from functools import lru_cache
-from sentence_transformers import SentenceTransformer
-from groq import Groq
+import json
+import time
 from app.config import settings
+from app.core.cache import LRUTTLCache
+from app.core.executor import get_executor
+from app.core.metrics import record, stage
+from app.core.warmup import EngineLoader
+from app.services.catalog_service import catalog
+from app.services.context_snippets import load_or_build_snippets, select_within_budget
+from app.services.response_cache import ChatResponseCache
+from app.services.llm_providers import LLMUnavailable, build_provider
+from app.services.lexical_index import load_or_build_lexical_index, reciprocal_rank_fusion, tokenize
+from app.services.text_index import load_or_build_text_index
+
+# Fields behind the BM25 index; the product name is repeated to weight exact name matches
+LEXICAL_FIELDS = ('prod_name', 'prod_name', 'detail_desc', 'product_type_name', 'product_group_name',
+                  'colour_group_name', 'graphical_appearance_name', 'index_group_name', 'section_name')
 
 class ChatService:
     def __init__(self):
         self.df = None
         self.model = None
         self.index = None
+        self.lexical = None
+        self.snippets = None
+        self.snippet_tokens = None
+        self._ready = False
         self.dims = 384
-        
-        self.groq_client = Groq(
-            api_key=os.environ.get("GROQ_API_KEY", "YOUR_API_KEY_HERE")
+        # Per-instance caches: query embeddings, and full LLM replies (exact + optional semantic hits)
+        self.embeddings = LRUTTLCache(maxsize=settings.CHAT_EMBED_CACHE_SIZE)
+        self.responses = ChatResponseCache(
+            maxsize=settings.CHAT_CACHE_SIZE, ttl=settings.CHAT_CACHE_TTL,
+            semantic=settings.CHAT_SEMANTIC_CACHE, threshold=settings.CHAT_SEMANTIC_THRESHOLD,
         )
+        
+        # LLM backend (CHAT_LLM_BACKEND): pooled Groq client or the offline template provider
+        self.llm = build_provider()
+        self.loader = EngineLoader("chat", self.load_resources, lambda: self._ready, warm_fn=self.warm_up)
 
-    def load_resources(self):
-        print("💬 Loading Chat Engine (SBERT + FAISS)...")
+    def load_resources(self, rebuild_index: bool = False):
+        print("💬 Loading Chat Engine (SBERT + FAISS + BM25)...")
         try:
-            self.df = pd.read_csv(settings.ARTICLES_PATH)
-            self.df['article_id'] = self.df['article_id'].astype(str).str.zfill(10)
+            # Everything is built into locals and published at the end, so the engine
+            # never looks ready (ensure() skips its lock) while half-loaded
+            # Shared with the other engines: read-only here
+            df = catalog.ensure_loaded()
             
-            # Load SBERT
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
+            # Load SBERT (imported here: sentence_transformers pulls in torch + transformers).
+            # A pre-assigned encoder is kept, e.g. the synthetic one used by benchmarks/
+            model = self.model
+            if model is None:
+                from sentence_transformers import SentenceTransformer
+                model = SentenceTransformer(settings.CHAT_MODEL_NAME)
             
-            # Build Text Index
-            print("   - Building Vector Index...")
+            # Text Index (persisted on disk, only new/changed articles are re-embedded)
             # We include 'index_group_name' (Menswear/Ladieswear) in the text for better matching
+            text = {col: df[col].astype(object) for col in ('prod_name', 'detail_desc', 'colour_group_name', 'index_group_name')}
             text_data = (
-                self.df['prod_name'] + " " + 
-                self.df['detail_desc'] + " " + 
-                self.df['colour_group_name'] + " " +
-                self.df['index_group_name'] 
+                text['prod_name'] + " " + 
+                text['detail_desc'] + " " + 
+                text['colour_group_name'] + " " +
+                text['index_group_name'] 
             ).fillna("").tolist()
             
-            embeddings = self.model.encode(text_data, convert_to_numpy=True)
-            self.index = faiss.IndexFlatL2(self.dims)
-            self.index.add(embeddings)
+            index = load_or_build_text_index(
+                catalog.display_ids, text_data, model, settings.CHAT_MODEL_NAME, settings.ARTICLES_PATH,
+                force=rebuild_index
+            )
+            lexical = load_or_build_lexical_index(
+                lambda: self._lexical_documents(df), settings.ARTICLES_PATH, expected_count=len(df), force=rebuild_index
+            )
+            # LLM context blocks rendered once per catalog version, not per request
+            snippets, snippet_tokens = load_or_build_snippets(
+                df, catalog.display_ids, settings.ARTICLES_PATH, force=rebuild_index
+            )
+            attribute_codes, attribute_names = self._encode_attributes(df)
+
+            self.df, self.model, self.index, self.lexical = df, model, index, lexical
+            self.snippets, self.snippet_tokens = snippets, snippet_tokens
+            self.attribute_codes, self.attribute_names = attribute_codes, attribute_names
+            self._selectors = LRUTTLCache(maxsize=256)
+            self._ready = True
             print(f"✅ Chat Engine Ready ({self.index.ntotal} items indexed).")
             
         except Exception as e:
             print(f"❌ Error loading Chat Engine: {e}")
 
-    @lru_cache(maxsize=100)
+    @staticmethod
+    def _lexical_documents(df: pd.DataFrame) -> list:
+        columns = [col for col in LEXICAL_FIELDS if col in df.columns]
+        fields = [df[col].astype(object).fillna("").astype(str).tolist() for col in columns]
+        return [tokenize(" ".join(values)) for values in zip(*fields)]
+
     def embed_query(self, query: str):
-        return self.model.encode([query])
+        query_vec = self.embeddings.get(query)
+        if query_vec is None:
+            query_vec = self.model.encode([query])
+            self.embeddings.set(query, query_vec)
+        return query_vec
+
+    def warm_up(self):
+        """One SBERT encode plus a hybrid search, bypassing the query caches."""
+        query = "black cotton dress"
+        self.hybrid_search(query, self.model.encode([query]), {}, k=settings.CHAT_TOP_K)
 
     def extract_filters(self, query: str) -> dict:
         filters = {}
@@ -77,75 +133,152 @@ class ChatService:
                 
         return filters
 
-    def apply_filters(self, candidates: pd.DataFrame, filters: dict) -> pd.DataFrame:
-        df = candidates.copy()
+    @staticmethod
+    def _encode_attributes(df: pd.DataFrame):
+        """Integer-codes the filterable columns once so filters never touch strings per request."""
+        codes, names = {}, {}
+        for col in ('colour_group_name', 'index_group_name'):
+            values = df[col].astype('category')
+            codes[col] = values.cat.codes.to_numpy()
+            names[col] = pd.Series(values.cat.categories)
+        return codes, names
+
+    def _attribute_mask(self, col: str, pattern: str) -> np.ndarray:
+        # Match against the few distinct category names, then expand to rows via the codes
+        matching = np.flatnonzero(self.attribute_names[col].str.contains(pattern, case=False, na=False).to_numpy())
+        return np.isin(self.attribute_codes[col], matching)
+
+    def filter_rows(self, filters: dict):
+        """
+        Catalog row ids that satisfy the filters, or None when there is nothing to filter on.
+        """
+        mask = None
         
         # Price Filter
-        if 'max_price' in filters and 'price' in df.columns:
-             df = df[df['price'] <= filters['max_price']]
+        if 'max_price' in filters and 'price' in self.df.columns:
+            mask = self.df['price'].to_numpy() <= filters['max_price']
         
         # Color Filter
         if 'color' in filters:
-            df = df[df['colour_group_name'].str.contains(filters['color'], case=False, na=False)]
+            color_mask = self._attribute_mask('colour_group_name', filters['color'])
+            mask = color_mask if mask is None else mask & color_mask
 
         # Gender Filter (New)
         if 'gender' in filters:
             # We check index_group_name (e.g., "Ladieswear", "Menswear", "Divided", "Baby/Children")
-            # If user wants Men, we look for 'Menswear' OR 'Divided' (Unisex) if strictly needed
-            target = filters['gender']
-            if target == 'Menswear':
-                # Filter for Menswear explicitly
-                df = df[df['index_group_name'].str.contains('Men', case=False, na=False)]
-            elif target == 'Ladieswear':
-                df = df[df['index_group_name'].str.contains('Ladies|Woman', case=False, na=False)]
-            elif target == 'Baby':
-                df = df[df['index_group_name'].str.contains('Baby', case=False, na=False)]
+            patterns = {'Menswear': 'Men', 'Ladieswear': 'Ladies|Woman', 'Baby': 'Baby'}
+            if filters['gender'] in patterns:
+                gender_mask = self._attribute_mask('index_group_name', patterns[filters['gender']])
+                mask = gender_mask if mask is None else mask & gender_mask
             
-        return df
-
-    def build_context(self, items: pd.DataFrame) -> str:
-        """Formats the data for the LLM with new design elements"""
-        context_parts = []
-        for _, row in items.iterrows():
-            # Use the new color names and structure
-            item_str = f"""
-- Item ID: {row['article_id']}
-- Name: {row['prod_name']}
-- Section: {row['index_group_name']} ({row['section_name']})
-- Category: {row['product_group_name']}
-- Color: {row['colour_group_name']}
-- Description: {row['detail_desc']}
-"""
-            context_parts.append(item_str)
-        return "\n".join(context_parts)
+        return None if mask is None else np.flatnonzero(mask).astype('int64')
 
-    def generate_response(self, messages: list):
-        if self.index is None:
-            self.load_resources()
-            
-        if self.index is None:
-            return "System is starting up..."
+    def _filter_state(self, filters: dict):
+        """(rows, FAISS selector, boolean row mask) for the filters, cached per filter combination."""
+        if not filters:
+            return None, None, None
+        key = tuple(sorted(filters.items()))
+        cached = self._selectors.get(key)
+        if cached is None:
+            import faiss
+            rows = self.filter_rows(filters)
+            selector = faiss.IDSelectorBatch(rows) if rows is not None and len(rows) else None
+            mask = None
+            if rows is not None:
+                mask = np.zeros(len(self.df), dtype=bool)
+                mask[rows] = True
+            cached = (rows, selector, mask)
+            self._selectors.set(key, cached)
+        return cached
+
+    def filtered_search(self, query_vec, filters: dict, k: int):
+        """
+        Top-k search restricted to rows matching the filters (FAISS ID selector),
+        so restrictive filters still return a full, correctly ranked top-k.
+        Returns an empty list when no catalog row matches the filters.
+        """
+        rows, selector, _ = self._filter_state(filters)
+
+        if rows is None:
+            _, I = self.index.search(query_vec, k)
+            return [i for i in I[0] if i != -1]
+        if selector is None:
+            return []
+
+        import faiss
+        params = faiss.SearchParameters()
+        params.sel = selector
+        _, I = self.index.search(query_vec, min(k, len(rows)), params=params)
+        return [i for i in I[0] if i != -1]
+
+    def hybrid_search(self, query: str, query_vec, filters: dict, k: int):
+        """
+        Dense (SBERT) and lexical (BM25) candidates under the same filters, merged with
+        reciprocal-rank fusion. Exact terms ("denim", product names) surface through BM25,
+        so each retriever only needs a short candidate list.
+        """
+        dense = self.filtered_search(query_vec, filters, settings.CHAT_CANDIDATES)
+        if self.lexical is None:
+            return dense[:k]
+        rows, _, mask = self._filter_state(filters)
+        if rows is not None and not len(rows):
+            return []
+        lexical = self.lexical.search(query, settings.CHAT_CANDIDATES, mask=mask)
+        return reciprocal_rank_fusion([dense, lexical], k)
+
+    def item_cards(self, items: pd.DataFrame) -> list:
+        """Compact, JSON-ready view of the retrieved items for the UI."""
+        columns = [col for col in ('prod_name', 'product_type_name', 'colour_group_name', 'index_group_name', 'price') if col in items.columns]
+        cards = items[columns].astype(object).where(items[columns].notna(), None).to_dict('records')
+        for card, aid in zip(cards, items['article_id']):
+            card['article_id'] = catalog.format_id(aid)
+        return cards
+
+    def build_context(self, rows: list):
+        """
+        Joins the precomputed snippets of the ranked rows that fit in CHAT_CONTEXT_TOKEN_BUDGET.
+        Returns (context text, rows actually included).
+        """
+        kept = select_within_budget(rows, self.snippet_tokens, settings.CHAT_CONTEXT_TOKEN_BUDGET)
+        return "\n\n".join(self.snippets[kept]), kept
+
+    def retrieve(self, messages: list):
+        """
+        CPU-bound half of the pipeline: filter extraction, embedding, vector search and prompt.
+        A cached reply (exact, or semantic once the query is embedded) returns early with its cards.
+        Returns None while the engine cannot be loaded.
+        """
+        if not self._ready and not self.loader.ensure():
+            return None
 
         last_user_msg = messages[-1]['content']
         
-        filters = self.extract_filters(last_user_msg)
-        query_vec = self.embed_query(last_user_msg)
-        
-        D, I = self.index.search(query_vec, k=50) 
+        with stage("chat", "filter"):
+            filters = self.extract_filters(last_user_msg)
+        # Cache before retrieval: a repeated question costs no embedding or search
+        cached = self.responses.lookup_exact(last_user_msg, filters)
+        if cached is not None:
+            return self._cached(last_user_msg, filters, cached)
+        with stage("chat", "embed"):
+            query_vec = self.embed_query(last_user_msg)
+        if self.responses.semantic:
+            cached = self.responses.lookup_similar(last_user_msg, filters, query_vec)
+            if cached is not None:
+                return self._cached(last_user_msg, filters, cached)
         
-        candidate_indices = [i for i in I[0] if i != -1 and i < len(self.df)]
-        candidates_df = self.df.iloc[candidate_indices]
+        with stage("chat", "search"):
+            matched_rows = self.hybrid_search(last_user_msg, query_vec, filters, k=settings.CHAT_TOP_K)
         
-        filtered_df = self.apply_filters(candidates_df, filters)
-        
-        if filtered_df.empty:
-            final_df = candidates_df.head(3)
-            system_note = "Note: I couldn't find exact matches for your specific filters, so I am showing the closest visual and semantic matches."
-        else:
-            final_df = filtered_df.head(5)
-            system_note = ""
-
-        context_text = self.build_context(final_df)
+            if not matched_rows:
+                _, I = self.index.search(query_vec, 3)
+                matched_rows = [i for i in I[0] if i != -1]
+                system_note = "Note: I couldn't find exact matches for your specific filters, so I am showing the closest visual and semantic matches."
+            else:
+                system_note = ""
+
+        with stage("chat", "context"):
+            context_text, kept_rows = self.build_context(matched_rows)
+            final_df = self.df.iloc[kept_rows]
         
         # --- NEW PROMPT DESIGN FOR BETTER RESPONSES ---
         system_prompt = f"""
@@ -169,22 +302,110 @@ INSTRUCTIONS:
 4.  If no items from the list precisely match the user's request (e.g., wrong gender, wrong price), politely apologize and offer the closest alternatives from the list. Do NOT invent items.
 5.  End with a friendly closing, inviting further questions.
 """
+        return {
+            "query": last_user_msg, "filters": filters, "items": final_df, "cards": self.item_cards(final_df),
+            "system_prompt": system_prompt,
+            "query_vec": query_vec, "reply": None,
+        }
+
+    @staticmethod
+    def _cached(query: str, filters: dict, entry: dict) -> dict:
+        return {"query": query, "filters": filters, "items": None, "cards": entry["cards"],
+                "system_prompt": None, "query_vec": None, "reply": entry["reply"]}
+
+    def _remember(self, prepared: dict, reply: str):
+        self.responses.store(prepared["query"], prepared["filters"], reply, prepared["query_vec"], prepared["cards"])
+
+    def _llm_messages(self, prepared: dict) -> list:
+        return [
+            {"role": "system", "content": prepared["system_prompt"]},
+            {"role": "user", "content": prepared["query"]} 
+        ]
+
+    def _llm_error(self, e: Exception) -> str:
+        print(f"LLM Error ({self.llm.name}): {str(e)}")
+        return f"I'm having trouble connecting to my brain ({self.llm.name} API). Error: {str(e)}"
+
+    def generate_response(self, messages: list):
+        prepared = self.retrieve(messages)
+        if prepared is None:
+            return "System is starting up..."
+        if prepared["reply"] is not None:
+            return prepared["reply"]
         
         try:
-            completion = self.groq_client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": last_user_msg} 
-                ],
-                temperature=0.5,
-                max_tokens=300,
-                stop=None,
-            )
-            return completion.choices[0].message.content
+            with stage("chat", "llm"):
+                reply = self.llm.complete(self._llm_messages(prepared))
+            self._remember(prepared, reply)
+            return reply
+            
+        except LLMUnavailable as e:
+            return self._llm_error(e)
+
+    async def agenerate_response(self, messages: list):
+        """
+        Non-blocking variant for the API: retrieval runs on the chat executor,
+        the LLM call goes through the provider's async client.
+        """
+        prepared = await self.aretrieve(messages)
+        if prepared is None:
+            return "System is starting up..."
+        if prepared["reply"] is not None:
+            return prepared["reply"]
+        
+        try:
+            with stage("chat", "llm"):
+                reply = await self.llm.acomplete(self._llm_messages(prepared))
+            self._remember(prepared, reply)
+            return reply
             
+        except LLMUnavailable as e:
+            return self._llm_error(e)
+
+    async def aretrieve(self, messages: list):
+        return await get_executor("chat").run(self.retrieve, messages)
+
+    async def _atokens(self, prepared: dict):
+        if prepared["reply"] is not None:
+            yield prepared["reply"]
+            return
+        async for token in self.llm.astream(self._llm_messages(prepared)):
+            yield token
+
+    async def astream_events(self, prepared: dict):
+        """
+        Streaming variant: the item cards go out as soon as retrieval is done,
+        then the reply tokens as the LLM produces them, then a final `done` event.
+        """
+        if prepared is None:
+            yield {"type": "error", "error": "System is starting up..."}
+            return
+        yield {"type": "items", "filters": prepared["filters"], "items": prepared["cards"]}
+
+        parts = []
+        started = time.perf_counter()
+        try:
+            async for token in self._atokens(prepared):
+                if not parts:
+                    record("chat", "llm_first_token", time.perf_counter() - started)
+                parts.append(token)
+                yield {"type": "token", "text": token}
+            record("chat", "llm", time.perf_counter() - started)
         except Exception as e:
-            print(f"Groq Error: {str(e)}")
-            return f"I'm having trouble connecting to my brain (Groq API). Error: {str(e)}"
+            # Headers are already sent, so saturation and provider failures become an error event
+            yield {"type": "error", "error": self._llm_error(e)}
+            return
+
+        reply = "".join(parts)
+        if prepared["reply"] is None:
+            self._remember(prepared, reply)
+        yield {"type": "done", "reply": reply, "cached": prepared["reply"] is not None}
+
+def encode_event(event: dict, fmt: str = "ndjson") -> str:
+    """One stream frame: an NDJSON line, or an SSE `event:`/`data:` block."""
+    data = json.dumps(event, default=str)
+    if fmt == "sse":
+        return f"event: {event['type']}\ndata: {data}\n\n"
+    return data + "\n"
 
-chat_engine = ChatService()
\ No newline at end of file
+chat_engine = ChatService()
@@ -0,0 +1,78 @@
+#fashion-retail-backend/app/services/context_snippets.py
+import json
+import os
+import numpy as np
+import pandas as pd
+from app.config import settings
+from app.core.shared_artifacts import atomic_path
+from app.services.text_index import file_hash
+
+# Bump when the snippet template changes so persisted snippets are re-rendered
+SNIPPET_VERSION = 1
+
+def estimate_tokens(texts) -> np.ndarray:
+    # ~4 characters per token for English text with Llama-style tokenizers
+    return np.ceil(pd.Series(texts, dtype=object).str.len().to_numpy() / 4).astype(np.int32)
+
+def _truncate(text: pd.Series, max_chars: int) -> pd.Series:
+    """Cuts long descriptions at the last word boundary before `max_chars`."""
+    too_long = text.str.len() > max_chars
+    cut = text[too_long].str.slice(0, max_chars).str.replace(r"\s+\S*$", "", regex=True) + "…"
+    return text.where(~too_long, cut)
+
+def render_snippets(df: pd.DataFrame, display_ids, desc_chars: int) -> np.ndarray:
+    """Renders the LLM context block of every catalog row at once (column-wise string ops)."""
+    col = {c: df[c].astype(object).fillna("").astype(str) for c in
+           ('prod_name', 'index_group_name', 'section_name', 'product_group_name', 'colour_group_name', 'detail_desc')}
+    snippets = (
+        "- Item ID: " + pd.Series(display_ids, index=df.index, dtype=object) +
+        "\n- Name: " + col['prod_name'] +
+        "\n- Section: " + col['index_group_name'] + " (" + col['section_name'] + ")" +
+        "\n- Category: " + col['product_group_name'] +
+        "\n- Color: " + col['colour_group_name'] +
+        "\n- Description: " + _truncate(col['detail_desc'], desc_chars)
+    )
+    return snippets.to_numpy(dtype=object)
+
+def load_or_build_snippets(df: pd.DataFrame, display_ids, articles_path: str, force: bool = False):
+    """
+    Per-article context snippets and their token estimates, persisted next to the chat index
+    and re-rendered only when articles.csv or the snippet settings change.
+    """
+    path = os.path.join(settings.CHAT_INDEX_DIR, "chat_snippets.parquet")
+    manifest_path = path + ".json"
+    expected = {"articles_hash": file_hash(articles_path), "version": SNIPPET_VERSION,
+                "desc_chars": settings.CHAT_SNIPPET_DESC_CHARS, "count": len(df)}
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        manifest = {}
+
+    if not force and manifest == expected and os.path.exists(path):
+        print(f"   - Loading context snippets from {path}...")
+        frame = pd.read_parquet(path)
+        return frame['snippet'].to_numpy(dtype=object), frame['tokens'].to_numpy(dtype=np.int32)
+
+    print("   - Rendering context snippets...")
+    snippets = render_snippets(df, display_ids, settings.CHAT_SNIPPET_DESC_CHARS)
+    tokens = estimate_tokens(snippets)
+    with atomic_path(path) as tmp_path:
+        pd.DataFrame({"snippet": snippets, "tokens": tokens}).to_parquet(tmp_path, index=False)
+    with atomic_path(manifest_path) as tmp_path, open(tmp_path, "w") as f:
+        json.dump(expected, f)
+    return snippets, tokens
+
+def select_within_budget(rows, tokens: np.ndarray, budget: int) -> list:
+    """
+    Keeps ranked rows greedily while their snippets fit in `budget` tokens.
+    The top row is always kept so the prompt is never empty.
+    """
+    kept, used = [], 0
+    for row in rows:
+        cost = int(tokens[row])
+        if kept and used + cost > budget:
+            continue
+        kept.append(row)
+        used += cost
+    return kept
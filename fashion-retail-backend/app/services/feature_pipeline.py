@@ -0,0 +1,227 @@
+#fashion-retail-backend/app/services/feature_pipeline.py
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from app.config import settings
+from app.services.catalog_service import catalog
+from app.services.history_store import HistoryStore, STATIC_COLS
+
+# Bump whenever the feature definitions change so stale artifacts are rebuilt
+FEATURE_VERSION = 1
+# Longest look-back of any feature (sales_lag_28): recomputing day t needs sales from t - 28 on
+FEATURE_CONTEXT_DAYS = 28
+
+def artifact_path(data_path: str) -> str:
+    root, _ = os.path.splitext(data_path)
+    return f"{root}.features.v{FEATURE_VERSION}.parquet"
+
+def _arrays_prefix(path: str) -> str:
+    return os.path.splitext(path)[0]
+
+def fingerprint(*paths) -> str:
+    """Cheap identity of the source files (name, size, mtime) plus the feature version."""
+    h = hashlib.sha1(f"v{FEATURE_VERSION}".encode())
+    for path in paths:
+        stat = os.stat(path)
+        h.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return h.hexdigest()
+
+def load_metadata(articles_path: str) -> pd.DataFrame:
+    if articles_path == settings.ARTICLES_PATH:
+        metadata = catalog.frame(['article_id'] + STATIC_COLS).copy()
+    else:
+        metadata = pd.read_csv(articles_path, usecols=['article_id'] + STATIC_COLS)
+    metadata['article_id'] = metadata['article_id'].astype(str)
+    return metadata
+
+def _shift(matrix: np.ndarray, periods: int) -> np.ndarray:
+    shifted = np.zeros_like(matrix)
+    shifted[:, periods:] = matrix[:, :-periods]
+    return shifted
+
+def _rolling_mean(matrix: np.ndarray, window: int) -> np.ndarray:
+    # rolling(window, min_periods=1).mean() along the day axis via cumulative sums
+    csum = np.zeros((matrix.shape[0], matrix.shape[1] + 1), dtype=np.float64)
+    np.cumsum(matrix, axis=1, out=csum[:, 1:])
+    ends = np.arange(1, matrix.shape[1] + 1)
+    starts = np.maximum(ends - window, 0)
+    return ((csum[:, ends] - csum[:, starts]) / (ends - starts)).astype(np.float32)
+
+def compute_features(sales: np.ndarray) -> dict:
+    """Lag and rolling features for an (articles x days) sales matrix."""
+    return {
+        "sales": sales,
+        "sales_lag_7": _shift(sales, 7),
+        "sales_lag_28": _shift(sales, 28),
+        "sales_rolling_mean_7": _rolling_mean(sales, 7),
+    }
+
+def refresh_feature_tail(buffers: dict, rows, start: int, end: int):
+    """Recomputes the lag/rolling features of days [start, end) for `rows` from the sales they depend on."""
+    context = max(0, start - FEATURE_CONTEXT_DAYS)
+    block = compute_features(buffers['sales'][rows, context:end])
+    for col, values in block.items():
+        if col != 'sales':
+            buffers[col][rows, start:end] = values[:, start - context:]
+
+def build_static(article_ids, metadata: pd.DataFrame) -> pd.DataFrame:
+    """Static covariates per article, missing values filled with the catalog mode, as categoricals."""
+    static = metadata.drop_duplicates('article_id').set_index('article_id')[STATIC_COLS].reindex(article_ids)
+    for col in STATIC_COLS:
+        static[col] = static[col].fillna(metadata[col].mode()[0]).astype('category')
+    return static
+
+def aggregate_daily(df: pd.DataFrame) -> pd.DataFrame:
+    """(t_dat, article_id, sales) rows; raw transactions (no sales column) are counted per day."""
+    df = df.assign(t_dat=pd.to_datetime(df['t_dat']), article_id=df['article_id'].astype(str))
+    if 'sales' not in df.columns:
+        print("   - Aggregating raw transactions...")
+        df = df.groupby(['t_dat', 'article_id']).size().reset_index(name='sales')
+    return df
+
+def build_history_features(df: pd.DataFrame, metadata: pd.DataFrame, version: str = None) -> HistoryStore:
+    df = aggregate_daily(df)
+
+    print("   - Calculating Lags & Rolling features...")
+    all_dates = pd.date_range(start=df['t_dat'].min(), end=df['t_dat'].max(), freq='D')
+    sales_pivot = df.pivot(index='t_dat', columns='article_id', values='sales').reindex(all_dates)
+    sales = np.nan_to_num(sales_pivot.to_numpy(dtype=np.float32).T, nan=0.0)
+
+    article_ids = sales_pivot.columns.to_numpy()
+    static = build_static(article_ids, metadata)
+    return HistoryStore(article_ids, all_dates[0], compute_features(np.ascontiguousarray(sales)), static, version=version)
+
+def append_history(store: HistoryStore, df: pd.DataFrame) -> dict:
+    """
+    Folds new daily sales into `store` in place, touching only what the rows reach.
+    New days get their sales (0 for articles without rows, as in the full build) and
+    features; rows for days already in the history replace that day's sales and the
+    feature tail of those articles is recomputed from there. Articles outside the history
+    and days before its start are skipped (they need a full rebuild).
+    The new version is derived from the old one and the rows, so every worker that
+    ingests the same batch ends up with the same version.
+    """
+    daily = aggregate_daily(df).groupby(['t_dat', 'article_id'], as_index=False)['sales'].sum()
+    day = (daily['t_dat'] - store.start_date).dt.days.to_numpy()
+    pos = daily['article_id'].map(store.positions)
+    known = pos.notna().to_numpy()
+    usable = known & (day >= 0)
+    summary = {
+        "rows": len(daily),
+        "unknown_articles": int(daily.loc[~known, 'article_id'].nunique()),
+        "rows_before_history": int((known & (day < 0)).sum()),
+    }
+    day = day[usable]
+    pos = pos[usable].to_numpy(dtype=np.int64)
+    sales = daily['sales'].to_numpy(dtype=np.float32)[usable]
+
+    old_days = store.n_days
+    if not len(day):
+        return {**summary, "days_added": 0, "updated_ids": [], "version": store.version}
+
+    n_days = max(old_days, int(day.max()) + 1)
+    buffers = store.reserve(n_days)
+    for buf in buffers.values():
+        # Spare capacity may hold leftovers from an ingest that failed before publishing
+        buf[:, old_days:n_days] = 0.0
+    buffers['sales'][pos, day] = sales
+
+    if n_days > old_days:
+        refresh_feature_tail(buffers, slice(None), old_days, n_days)
+    corrected = day < old_days
+    if corrected.any():
+        refresh_feature_tail(buffers, np.unique(pos[corrected]), int(day[corrected].min()), n_days)
+
+    h = hashlib.sha1(store.version.encode())
+    for values in (day.astype(np.int64), pos, sales):
+        h.update(np.ascontiguousarray(values).tobytes())
+    store.publish(n_days, h.hexdigest())
+
+    return {
+        **summary,
+        "days_added": n_days - old_days,
+        "corrected_rows": int(corrected.sum()),
+        "first_day": str((store.start_date + pd.Timedelta(days=int(day.min()))).date()),
+        "last_day": str(store.dates[-1].date()),
+        "updated_ids": store.article_ids[np.unique(pos)].tolist(),
+        "version": store.version,
+    }
+
+def persist_history(store: HistoryStore, data_path: str, articles_path: str, note: dict = None):
+    """
+    Rewrites the feature artifact from an ingested store; the manifest keeps the source
+    fingerprint (so the next startup loads it instead of rebuilding) and the new version.
+    This is a full rewrite of the Parquet file and every .npy (I/O grows with the history,
+    there is no feature recomputation): the article-major .npy layout cannot be appended to.
+    """
+    path = artifact_path(data_path)
+    store.to_frame().to_parquet(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)
+    store.save_arrays(_arrays_prefix(path))
+
+    try:
+        with open(path + ".json") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        manifest = {"version": FEATURE_VERSION}
+    manifest["fingerprint"] = fingerprint(data_path, articles_path)
+    manifest["history_version"] = store.version
+    manifest.setdefault("ingested", []).append({"version": store.version, "n_days": store.n_days, **(note or {})})
+    with open(path + ".json", "w") as f:
+        json.dump(manifest, f)
+    print(f"   ✅ Feature artifact updated at {path} ({store.n_days} days)")
+
+def _read_source(data_path: str) -> pd.DataFrame:
+    import pyarrow.parquet as pq
+    available = set(pq.read_schema(data_path).names)
+    columns = [c for c in ['t_dat', 'article_id', 'sales'] if c in available]
+    return pd.read_parquet(data_path, columns=columns)
+
+def build_artifact(data_path: str, articles_path: str) -> HistoryStore:
+    """Runs the full feature build and writes the Parquet artifact plus its fingerprint."""
+    print(f"🛠️ Building history features from {data_path}...")
+    source_fingerprint = fingerprint(data_path, articles_path)
+    store = build_history_features(_read_source(data_path), load_metadata(articles_path), version=source_fingerprint)
+
+    path = artifact_path(data_path)
+    store.to_frame().to_parquet(path, index=False)
+    store.save_arrays(_arrays_prefix(path))
+    with open(path + ".json", "w") as f:
+        json.dump({"fingerprint": source_fingerprint, "version": FEATURE_VERSION}, f)
+    print(f"   ✅ Feature artifact written to {path}")
+    return store
+
+def load_or_build_history(data_path: str, articles_path: str) -> HistoryStore:
+    """Loads the feature artifact when the source fingerprint is unchanged, otherwise rebuilds it."""
+    path = artifact_path(data_path)
+    try:
+        with open(path + ".json") as f:
+            manifest = json.load(f)
+        source_fingerprint = fingerprint(data_path, articles_path)
+        if manifest.get("fingerprint") == source_fingerprint:
+            # Artifacts extended by append_history carry their own version
+            version = manifest.get("history_version", source_fingerprint)
+            prefix = _arrays_prefix(path)
+            if settings.SHARED_MMAP and os.path.exists(f"{prefix}.static.parquet"):
+                print(f"📦 Mapping cached history features from {prefix}.*.npy...")
+                return HistoryStore.load_arrays(prefix, version=version)
+            print(f"📦 Loading cached history features from {path}...")
+            return HistoryStore.from_frame(pd.read_parquet(path), version=version)
+        print("   - Source data changed, rebuilding features...")
+    except FileNotFoundError:
+        print("   - No feature artifact found, building it...")
+    return build_artifact(data_path, articles_path)
+
+def export_history_arrays(data_path: str, articles_path: str) -> str:
+    """
+    Makes sure the memory-mappable .npy copies of the feature artifact exist; returns their prefix.
+    Goes through load_or_build_history, so days added by app.jobs.ingest_transactions are kept
+    (a fresh build_artifact would rebuild from data_path alone and drop them).
+    """
+    prefix = _arrays_prefix(artifact_path(data_path))
+    history = load_or_build_history(data_path, articles_path)
+    if not os.path.exists(f"{prefix}.static.parquet"):
+        history.save_arrays(prefix)
+    return prefix
@@ -0,0 +1,68 @@
+#fashion-retail-backend/app/services/forecast_store.py
+import os
+import numpy as np
+import pandas as pd
+
+QUANTILE_PREFIX = "q_"
+
+class ForecastStore:
+    """
+    Read side of the precomputed forecast table written by app.jobs.precompute_forecasts.
+    Rows are (item_id, date, prediction, q_*, history_version, model_version), sorted by item,
+    and held as flat arrays with an item_id -> (start, stop) offset table.
+    """
+    def __init__(self):
+        self.offsets = {}
+        self.dates = None
+        self.predictions = None
+        self.quantiles = {}
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @staticmethod
+    def write(frame: pd.DataFrame, path: str):
+        """Atomically replaces the store file so readers never see a half-written table."""
+        tmp_path = path + ".tmp"
+        frame.sort_values(['item_id', 'date'], kind='stable').to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str, history_version: str, model_version: str = None):
+        """Loads the rows produced for the current history (and checkpoint, when known)."""
+        frame = pd.read_parquet(path)
+        fresh = frame['history_version'] == history_version
+        if model_version is not None:
+            fresh &= frame['model_version'] == model_version
+        stale = int((~fresh).sum())
+        frame = frame[fresh].sort_values(['item_id', 'date'], kind='stable')
+
+        item_ids = frame['item_id'].astype(str).to_numpy()
+        starts = np.flatnonzero(np.r_[True, item_ids[1:] != item_ids[:-1]]) if len(item_ids) else np.array([], dtype=int)
+        stops = np.r_[starts[1:], len(item_ids)]
+        self.offsets = {item_ids[s]: (s, e) for s, e in zip(starts, stops)}
+
+        self.dates = pd.DatetimeIndex(frame['date']).strftime("%Y-%m-%d").to_numpy()
+        self.predictions = frame['prediction'].to_numpy(dtype=np.float32)
+        self.quantiles = {
+            col[len(QUANTILE_PREFIX):]: frame[col].to_numpy(dtype=np.float32)
+            for col in frame.columns if col.startswith(QUANTILE_PREFIX)
+        }
+        print(f"📦 Forecast Store Loaded ({len(self.offsets):,} items, {stale:,} stale rows skipped).")
+
+    def discard(self, item_ids) -> int:
+        """Forgets the rows of items whose history changed since the store was computed."""
+        return sum(self.offsets.pop(str(i), None) is not None for i in item_ids)
+
+    def lookup(self, item_id: str):
+        """Returns the forecast list for one item, or None on a miss."""
+        span = self.offsets.get(item_id)
+        if span is None:
+            return None
+        start, stop = span
+        forecast = []
+        for row in range(start, stop):
+            entry = {"date": self.dates[row], "prediction": max(0.0, float(self.predictions[row]))}
+            if self.quantiles:
+                entry["quantiles"] = {q: float(values[row]) for q, values in self.quantiles.items()}
+            forecast.append(entry)
+        return forecast
@@ -1,173 +1,366 @@
 #fashion-retail-backend/app/services/forecasting_service.py
 import warnings
 import os
+import hashlib
+import threading
+import time
 
 warnings.filterwarnings('ignore', category=UserWarning, module='lightning')
 os.environ['PYTORCH_ENABLE_MPS_FALLBACK'] = '1'
 
-import torch
 import pandas as pd
 import numpy as np
-from pytorch_forecasting import TemporalFusionTransformer, TimeSeriesDataSet
 from app.config import settings
+from app.core.cache import LRUTTLCache
+from app.core.metrics import stage
+from app.core.warmup import EngineLoader
+from app.services.feature_pipeline import append_history, build_history_features, load_metadata, persist_history
+from app.services.forecast_store import ForecastStore
+from app.services.history_store import HistoryStore
+
+# torch / pytorch_forecasting are imported inside the methods that need them,
+# so serving from the precomputed store never pays for those imports.
 
 warnings.filterwarnings('ignore', message='.*InconsistentVersionWarning.*')
 
+PREDICTION_STEPS = 28
+HISTORY_DAYS = 60
+
+def _checkpoint_hash(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
 class ForecastingService:
     def __init__(self):
         self.model = None
         self.history = None
-        self.metadata = None
         self._is_loaded = False
         self.global_min_date = None
+        self.model_version = None
+        self.cache = LRUTTLCache(maxsize=settings.FORECAST_CACHE_SIZE, ttl=settings.FORECAST_CACHE_TTL)
+        self.store = None
+        self._store_path = settings.FORECAST_STORE_PATH
+        self._store_loaded = (None, None) # (file mtime, history version) of the last load
+        self._store_checked = 0.0
+        self._store_lock = threading.Lock()
+        self._ingest_lock = threading.Lock()
+        self.loader = EngineLoader("forecast", self.load_model, self.is_loaded, warm_fn=self.warm_up)
     
     def load_model(self):
         print(f"📊 Loading Forecasting Model from {settings.TFT_MODEL_PATH}...")
-        if self._try_direct_load(): return
-        if self._try_state_dict_load(): return
-        print("❌ Failed to load TFT model.")
+        model = self._try_direct_load() or self._try_state_dict_load()
+        if model is None:
+            print("❌ Failed to load TFT model.")
+            return
+        # Version before the flag: is_loaded() lets requests (and cache keys) through
+        self.model_version = _checkpoint_hash(settings.TFT_MODEL_PATH)
+        self.model = model
+        self._is_loaded = True
     
-    def _try_direct_load(self) -> bool:
+    def _try_direct_load(self):
         try:
-            self.model = TemporalFusionTransformer.load_from_checkpoint(
+            from pytorch_forecasting import TemporalFusionTransformer
+            model = TemporalFusionTransformer.load_from_checkpoint(
                 settings.TFT_MODEL_PATH,
                 map_location=lambda storage, loc: storage
             )
-            self.model.eval()
-            self._is_loaded = True
+            model.eval()
             print("✅ Forecasting Model Loaded (Direct Method)")
-            return True
+            return model
         except Exception:
-            return False
+            return None
     
-    def _try_state_dict_load(self) -> bool:
+    def _try_state_dict_load(self):
         try:
             print("🔄 Attempting State Dict Load...")
+            import torch
+            from pytorch_forecasting import TemporalFusionTransformer
             checkpoint = torch.load(settings.TFT_MODEL_PATH, map_location='cpu')
-            self.model = TemporalFusionTransformer(**checkpoint["hyper_parameters"])
-            self.model.load_state_dict(checkpoint["state_dict"], strict=False)
-            self.model.eval()
-            self._is_loaded = True
+            model = TemporalFusionTransformer(**checkpoint["hyper_parameters"])
+            model.load_state_dict(checkpoint["state_dict"], strict=False)
+            model.eval()
             print("✅ Forecasting Model Loaded (State Dict Method)")
-            return True
+            return model
         except Exception as e:
             print(f"⚠️ State dict load failed: {e}")
-            return False
+            return None
 
     def load_data(self, df: pd.DataFrame):
         print("🛠️ Processing Data...")
         try:
             print(f"   - Loading Metadata from {settings.ARTICLES_PATH}...")
-            self.metadata = pd.read_csv(settings.ARTICLES_PATH)
-            self.metadata['article_id'] = self.metadata['article_id'].astype(str)
-            
-            df['t_dat'] = pd.to_datetime(df['t_dat'])
-            
-            if 'sales' not in df.columns:
-                print("   - Aggregating raw transactions...")
-                self.history = df.groupby(['t_dat', 'article_id']).size().reset_index(name='sales')
-            else:
-                self.history = df
-
-            self.global_min_date = self.history['t_dat'].min()
-            self.history['time_idx'] = (self.history['t_dat'] - self.global_min_date).dt.days
-            
-            print("   - Calculating Lags & Rolling features...")
-            all_dates = pd.date_range(start=self.history['t_dat'].min(), end=self.history['t_dat'].max(), freq='D')
-            sales_pivot = self.history.pivot(index='t_dat', columns='article_id', values='sales').reindex(all_dates).fillna(0.0)
-            self.history = sales_pivot.stack().reset_index()
-            self.history.columns = ['t_dat', 'article_id', 'sales']
-            self.history['time_idx'] = (self.history['t_dat'] - self.global_min_date).dt.days
-            
-            self.history['sales_lag_7'] = self.history.groupby('article_id')['sales'].shift(7).fillna(0.0)
-            self.history['sales_lag_28'] = self.history.groupby('article_id')['sales'].shift(28).fillna(0.0)
-            self.history['sales_rolling_mean_7'] = self.history.groupby('article_id')['sales'].transform(lambda x: x.rolling(7, min_periods=1).mean()).fillna(0.0)
+            metadata = load_metadata(settings.ARTICLES_PATH)
+            self.load_history(build_history_features(df, metadata))
+        except Exception as e:
+            self.history = None
+            print(f"❌ Error processing data: {e}")
 
-            cols_to_merge = ['article_id', 'product_type_name', 'product_group_name', 'colour_group_name', 'graphical_appearance_name']
-            self.history = self.history.merge(self.metadata[cols_to_merge], on='article_id', how='left')
-            
-            for col in cols_to_merge[1:]:
-                mode_val = self.metadata[col].mode()[0]
-                self.history[col] = self.history[col].fillna(mode_val)
+    def load_history(self, history: HistoryStore):
+        self.history = history
+        self.global_min_date = history.start_date
+        # Entries keyed on the previous history version can never hit again
+        self.cache.clear()
+        self.store = None
+        print(f"📦 Data Ready ({len(self.history):,} rows).")
 
-            print(f"📦 Data Ready ({len(self.history):,} rows).")
-            
+    def load_store(self, path: str):
+        """Loads precomputed forecasts that match the current history (and checkpoint, if present)."""
+        if self.history is None:
+            print("⚠️ Forecast Store needs history data first.")
+            return
+        self._store_path = path
+        try:
+            loaded = (os.path.getmtime(path), self.history.version)
+            model_version = _checkpoint_hash(settings.TFT_MODEL_PATH) if os.path.exists(settings.TFT_MODEL_PATH) else None
+            store = ForecastStore()
+            store.load(path, self.history.version, model_version)
+            self.store = store
+            self._store_loaded = loaded
         except Exception as e:
-            print(f"❌ Error processing data: {e}")
+            print(f"❌ Error loading Forecast Store: {e}")
+
+    def refresh_store(self, force: bool = False) -> bool:
+        """
+        Reloads the precomputed store when its file was rewritten (nightly job) or the history
+        moved on (an ingest drops the store) since the last load. Without `force`, checks at
+        most every FORECAST_STORE_CHECK_SECONDS and never waits on a reload already running.
+        Returns True when the store was reloaded.
+        """
+        interval = settings.FORECAST_STORE_CHECK_SECONDS
+        now = time.monotonic()
+        if not force and (interval <= 0 or now - self._store_checked < interval):
+            return False
+        if self.history is None or not self._store_lock.acquire(blocking=force):
+            return False
+        try:
+            self._store_checked = now
+            if not os.path.exists(self._store_path):
+                return False
+            if not force and (os.path.getmtime(self._store_path), self.history.version) == self._store_loaded:
+                return False
+            self.load_store(self._store_path)
+            return True
+        finally:
+            self._store_lock.release()
+
+    def _cache_key(self, item_id: str, history_version: str = None):
+        return (item_id, self.model_version, history_version or self.history.version)
+
+    def invalidate_cache(self, item_ids: list = None) -> int:
+        if item_ids is None:
+            return self.cache.clear()
+        targets = {str(i) for i in item_ids}
+        return self.cache.discard_if(lambda key: key[0] in targets)
+
+    def ingest(self, df: pd.DataFrame, persist: bool = False) -> dict:
+        """
+        Appends new daily sales to the live history (see feature_pipeline.append_history)
+        and drops only the forecasts they affect. persist=True also rewrites the artifact on disk.
+        """
+        if self.history is None:
+            return {"error": "Service not ready"}
+        with self._ingest_lock:
+            old_version = self.history.version
+            with stage("forecast", "ingest"):
+                summary = append_history(self.history, df)
+            updated_ids = set(summary.pop("updated_ids"))
+            invalidated = 0
+            if summary["days_added"]:
+                # Every forecast window moved forward: nothing cached or precomputed is current.
+                # refresh_store() picks the store up again once the nightly job has caught up
+                invalidated = self.cache.clear()
+                self.store = None
+            elif updated_ids:
+                invalidated = self._carry_over(old_version, updated_ids)
+                if self.store is not None:
+                    self.store.discard(updated_ids)
+                    # The remaining rows hold for the new version too: refresh_store() must not
+                    # reload the file (its rows carry the old version and would all be skipped)
+                    self._store_loaded = (self._store_loaded[0], self.history.version)
+            if persist and summary["version"] != old_version:
+                persist_history(self.history, settings.DATA_PATH, settings.ARTICLES_PATH,
+                                note={"rows": summary["rows"], "last_day": summary["last_day"]})
+        summary["updated_articles"] = len(updated_ids)
+        summary["invalidated"] = invalidated
+        print(f"📥 Ingested {summary['rows']:,} rows: +{summary['days_added']} days, "
+              f"{len(updated_ids):,} articles updated, {invalidated:,} forecasts invalidated.")
+        return summary
+
+    def _carry_over(self, old_version: str, affected: set) -> int:
+        """Re-keys cached forecasts of unaffected items to the new history version; returns how many were dropped."""
+        new_version = self.history.version
+
+        def move(key):
+            item_id, model_version, history_version = key
+            if history_version != old_version or item_id in affected:
+                return None
+            return (item_id, model_version, new_version)
+
+        return self.cache.rekey(move)
+
+    def warm_cache(self, item_ids: list) -> dict:
+        results = self.predict_many(item_ids)
+        warmed = sum(1 for r in results if "error" not in r)
+        return {"requested": len(item_ids), "warmed": warmed, "failed": len(results) - warmed}
 
     def is_loaded(self) -> bool:
         return self._is_loaded and self.model is not None
 
+    def warm_up(self):
+        """One uncached forecast so the first real request doesn't pay for kernel/graph setup."""
+        if self.history is not None and len(self.history.article_ids):
+            self._predict_live([self.history.article_ids[0]], 1, False, False)
+
     def predict(self, item_id: str):
+        return self.predict_many([item_id], batch_size=1)[0]
+
+    def _build_inference_frames(self, item_id: str):
+        max_encoder_length = self.model.dataset_parameters['max_encoder_length']
+        encoder_data = self.history.window(item_id, max_encoder_length)
+        
+        last_time_idx = encoder_data['time_idx'].max()
+        future_time_idx = np.arange(last_time_idx + 1, last_time_idx + 1 + PREDICTION_STEPS)
+        future_dates = self.global_min_date + pd.to_timedelta(future_time_idx, unit='D')
+        
+        decoder_data = pd.DataFrame({
+            "time_idx": future_time_idx, "t_dat": future_dates, "article_id": item_id,
+            "sales": 0.0, "sales_lag_7": 0.0, "sales_rolling_mean_7": 0.0, "sales_lag_28": 0.0
+        })
+        
+        for col, value in self.history.details(item_id).items(): decoder_data[col] = value
+
+        for df_temp in [encoder_data, decoder_data]:
+            df_temp['day_of_week'] = df_temp['t_dat'].dt.dayofweek.astype(str)
+            df_temp['month'] = df_temp['t_dat'].dt.month.astype(str)
+            df_temp['is_weekend'] = df_temp['day_of_week'].isin(['5', '6']).astype(str)
+
+        return encoder_data, decoder_data
+
+    def _format_result(self, item_id, forecast_list):
+        dates, sales = self.history.sales_tail(item_id, HISTORY_DAYS)
+        history_list = [{"date": d, "sales": s} 
+                        for d, s in zip(dates.strftime("%Y-%m-%d"), sales.tolist())]
+        
+        return {
+            "item_id": item_id,
+            "details": self.history.details(item_id),
+            "history": history_list,
+            "forecast": forecast_list
+        }
+
+    def predict_many(self, item_ids: list, batch_size: int = None, with_quantiles: bool = False):
+        """
+        Forecasts many articles with a single inference dataset.
+        Output: one payload per requested id (same shape as predict), in request order.
+        Order of lookup: result cache -> precomputed store (FORECAST_SERVE_MODE=store) -> live TFT.
+        """
+        if self.history is None:
+            return [{"item_id": i, "error": "Service not ready"} for i in item_ids]
+
+        unique_ids = list(dict.fromkeys(str(i) for i in item_ids))
+        # Read once: an ingest mid-request must not file these results under the new version
+        history_version = self.history.version
+        use_cache = not with_quantiles
+        if settings.FORECAST_SERVE_MODE == "store" and not with_quantiles:
+            self.refresh_store()
+        use_store = self.store is not None and settings.FORECAST_SERVE_MODE == "store" and not with_quantiles
+        results = {}
+        misses = []
+
+        with stage("forecast", "lookup"):
+            for item_id in unique_ids:
+                cached = self.cache.get(self._cache_key(item_id, history_version)) if use_cache else None
+                if cached is not None:
+                    results[item_id] = cached
+                    continue
+                if item_id not in self.history:
+                    results[item_id] = {"item_id": item_id, "error": "Item not found"}
+                    continue
+                stored = self.store.lookup(item_id) if use_store else None
+                if stored is not None:
+                    results[item_id] = self._format_result(item_id, stored)
+                    self.cache.set(self._cache_key(item_id, history_version), results[item_id])
+                    continue
+                misses.append(item_id)
+
+        if misses:
+            results.update(self._predict_live(misses, batch_size, with_quantiles, use_cache, history_version))
+
+        return [results[str(i)] for i in item_ids]
+
+    def _predict_live(self, item_ids: list, batch_size: int, with_quantiles: bool, use_cache: bool,
+                      history_version: str = None) -> dict:
         # LAZY LOAD: If model isn't loaded, try to load it now
         if not self.is_loaded():
             print("⚠️ Lazy Loading Forecasting Model...")
-            self.load_model()
-        if not self.is_loaded() or self.history is None:
-            return {"error": "Service not ready"}
+            self.loader.ensure()
+        if not self.is_loaded():
+            return {i: {"item_id": i, "error": "Service not ready"} for i in item_ids}
+
+        import torch
+        from pytorch_forecasting import TimeSeriesDataSet
+
+        batch_size = batch_size or settings.FORECAST_BATCH_SIZE
+        quantile_levels = getattr(self.model.loss, "quantiles", None) if with_quantiles else None
+        results = {}
+        prepared = {}
+        frames = []
 
-        item_data = self.history[self.history['article_id'] == item_id].copy()
-        if item_data.empty: return {"error": "Item not found"}
+        with stage("forecast", "slice"):
+            for item_id in item_ids:
+                encoder_data, decoder_data = self._build_inference_frames(item_id)
+                prepared[item_id] = decoder_data
+                frames.extend([encoder_data, decoder_data])
 
         try:
-            max_encoder_length = self.model.dataset_parameters['max_encoder_length']
-            encoder_data = item_data.iloc[-max_encoder_length:].copy()
-            
-            last_time_idx = encoder_data['time_idx'].max()
-            prediction_steps = 28
-            future_time_idx = np.arange(last_time_idx + 1, last_time_idx + 1 + prediction_steps)
-            future_dates = self.global_min_date + pd.to_timedelta(future_time_idx, unit='D')
-            
-            decoder_data = pd.DataFrame({
-                "time_idx": future_time_idx, "t_dat": future_dates, "article_id": item_id,
-                "sales": 0.0, "sales_lag_7": 0.0, "sales_rolling_mean_7": 0.0, "sales_lag_28": 0.0
-            })
-            
-            static_cols = ["product_type_name", "product_group_name", "colour_group_name", "graphical_appearance_name"]
-            for col in static_cols: decoder_data[col] = encoder_data.iloc[0][col]
-
-            for df_temp in [encoder_data, decoder_data]:
-                df_temp['day_of_week'] = df_temp['t_dat'].dt.dayofweek.astype(str)
-                df_temp['month'] = df_temp['t_dat'].dt.month.astype(str)
-                df_temp['is_weekend'] = df_temp['day_of_week'].isin(['5', '6']).astype(str)
-
-            inference_data = pd.concat([encoder_data, decoder_data], ignore_index=True)
-
-            # --- 🚨 CRITICAL FIX: Use from_parameters instead of from_dataset 🚨 ---
-            dataset = TimeSeriesDataSet.from_parameters(
-                self.model.dataset_parameters, 
-                inference_data, 
-                predict=True, 
-                stop_randomization=True
-            )
-            # -----------------------------------------------------------------------
-            
-            dataloader = dataset.to_dataloader(train=False, batch_size=1, num_workers=0)
-            x, _ = next(iter(dataloader))
-            
-            with torch.no_grad():
-                output = self.model(x)
-                interpretation = self.model.to_prediction(output)
-            
-            forecast_values = interpretation[0].detach().numpy().flatten()
-            
-            forecast_list = [{"date": d.strftime("%Y-%m-%d"), "prediction": max(0.0, float(v))} 
-                             for d, v in zip(decoder_data['t_dat'], forecast_values)]
-            
-            history_list = [{"date": r['t_dat'].strftime("%Y-%m-%d"), "sales": float(r['sales'])} 
-                            for _, r in item_data.tail(60).iterrows()]
+            with stage("forecast", "dataset"):
+                inference_data = pd.concat(frames, ignore_index=True)
+
+                # --- 🚨 CRITICAL FIX: Use from_parameters instead of from_dataset 🚨 ---
+                dataset = TimeSeriesDataSet.from_parameters(
+                    self.model.dataset_parameters, 
+                    inference_data, 
+                    predict=True, 
+                    stop_randomization=True
+                )
+                # -----------------------------------------------------------------------
             
-            return {
-                "item_id": item_id,
-                "details": {k: encoder_data.iloc[0][k] for k in static_cols},
-                "history": history_list,
-                "forecast": forecast_list
-            }
+                dataloader = dataset.to_dataloader(train=False, batch_size=batch_size, num_workers=0)
+            for x, _ in dataloader:
+                with stage("forecast", "forward"), torch.no_grad():
+                    output = self.model(x)
+                    interpretation = self.model.to_prediction(output)
+                    quantiles = self.model.to_quantiles(output) if quantile_levels else None
+
+                # Samples come back grouped by article, not in request order
+                batch_ids = dataset.x_to_index(x)['article_id'].astype(str).tolist()
+                for row, item_id in enumerate(batch_ids):
+                    forecast_values = interpretation[row].detach().numpy().flatten()
+                    forecast_list = [{"date": d.strftime("%Y-%m-%d"), "prediction": max(0.0, float(v))} 
+                                     for d, v in zip(prepared[item_id]['t_dat'], forecast_values)]
+                    if quantiles is not None:
+                        item_quantiles = quantiles[row].detach().numpy()
+                        for step, entry in enumerate(forecast_list):
+                            entry["quantiles"] = {str(q): float(v) for q, v in zip(quantile_levels, item_quantiles[step])}
+
+                    results[item_id] = self._format_result(item_id, forecast_list)
+                    if use_cache:
+                        self.cache.set(self._cache_key(item_id, history_version), results[item_id])
 
         except Exception as e:
             print(f"❌ Prediction Error: {e}")
             import traceback
             traceback.print_exc()
-            return {"error": f"Prediction failed: {str(e)}"}
+            for item_id in item_ids:
+                results.setdefault(item_id, {"item_id": item_id, "error": f"Prediction failed: {str(e)}"})
+
+        for item_id in item_ids:
+            # TimeSeriesDataSet silently drops series that are too short to encode
+            results.setdefault(item_id, {"item_id": item_id, "error": "Prediction failed: not enough history"})
+
+        return results
 
 forecaster = ForecastingService()
\ No newline at end of file
@@ -0,0 +1,160 @@
+#fashion-retail-backend/app/services/history_store.py
+import os
+import uuid
+import numpy as np
+import pandas as pd
+
+FEATURE_COLS = ["sales", "sales_lag_7", "sales_lag_28", "sales_rolling_mean_7"]
+STATIC_COLS = ["product_type_name", "product_group_name", "colour_group_name", "graphical_appearance_name"]
+
+class HistoryStore:
+    """
+    Article-major view of the daily sales history.
+    Every feature is an (articles x days) float32 matrix, so the window of one
+    article is a contiguous row slice and lookups never scan the whole catalog.
+    """
+    def __init__(self, article_ids, start_date, features: dict, static: pd.DataFrame, version: str = None):
+        self.article_ids = np.asarray(article_ids, dtype=object)
+        self.positions = {aid: i for i, aid in enumerate(self.article_ids)}
+        self.start_date = pd.Timestamp(start_date)
+        # Full (articles x capacity) matrices; readers only see the first n_days columns
+        self._buffers = {name: np.ascontiguousarray(features[name], dtype=np.float32) for name in FEATURE_COLS}
+        self.static = static.loc[self.article_ids, STATIC_COLS]
+        # Identifies this exact history so cached forecasts can be invalidated when it changes
+        self.publish(self._buffers['sales'].shape[1], version or uuid.uuid4().hex)
+
+    @property
+    def n_days(self) -> int:
+        return self._view[0]
+
+    @property
+    def features(self) -> dict:
+        return self._view[1]
+
+    def reserve(self, n_days: int) -> dict:
+        """
+        Writable feature buffers with room for `n_days` days. Columns past the published
+        n_days stay invisible to readers until publish(). Read-only (memory-mapped) or full
+        buffers are copied once, with geometric growth so daily appends amortize.
+        """
+        capacity = self._buffers['sales'].shape[1]
+        writable = all(buf.flags.writeable for buf in self._buffers.values())
+        if n_days <= capacity and writable:
+            return self._buffers
+        if n_days > capacity:
+            capacity = max(n_days, capacity + capacity // 4 + 32)
+        published = self.n_days
+        for name, buf in list(self._buffers.items()):
+            grown = np.zeros((buf.shape[0], capacity), dtype=np.float32)
+            grown[:, :published] = buf[:, :published]
+            self._buffers[name] = grown
+        self.publish(published, self.version)
+        return self._buffers
+
+    def publish(self, n_days: int, version: str):
+        """Makes the first `n_days` columns visible; readers take days and views in one read."""
+        views = {name: buf[:, :n_days] for name, buf in self._buffers.items()}
+        self._view = (n_days, views)
+        self.version = version
+
+    @classmethod
+    def from_frame(cls, history: pd.DataFrame, version: str = None):
+        """Builds the store from a long (t_dat, article_id, ...) frame covering every article on every day."""
+        history = history.sort_values(['article_id', 'time_idx'], kind='stable')
+        first_rows = history.drop_duplicates('article_id').set_index('article_id')
+        first_rows.index = first_rows.index.astype(str)
+        article_ids = first_rows.index.to_numpy()
+        n_days = len(history) // len(article_ids)
+
+        features = {
+            col: history[col].to_numpy(dtype=np.float32).reshape(len(article_ids), n_days)
+            for col in FEATURE_COLS
+        }
+        return cls(article_ids, history['t_dat'].min(), features, first_rows[STATIC_COLS], version=version)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long, article-major frame (the inverse of from_frame) with categorical static columns."""
+        n_days, features = self._view
+        n_articles = len(self.article_ids)
+        codes = np.repeat(np.arange(n_articles), n_days)
+        frame = pd.DataFrame({
+            "t_dat": np.tile((self.start_date + pd.to_timedelta(np.arange(n_days), unit='D')).to_numpy(), n_articles),
+            "article_id": pd.Categorical.from_codes(codes, categories=self.article_ids),
+            "time_idx": np.tile(np.arange(n_days, dtype=np.int32), n_articles),
+        })
+        for col in FEATURE_COLS:
+            frame[col] = features[col].ravel()
+        for col in STATIC_COLS:
+            static_col = self.static[col].astype('category')
+            frame[col] = pd.Categorical.from_codes(
+                np.repeat(static_col.cat.codes.to_numpy(), n_days),
+                categories=static_col.cat.categories,
+            )
+        return frame
+
+    def save_arrays(self, prefix: str):
+        """
+        Writes one .npy per feature plus the static table, for memory-mapped loading.
+        Files are replaced atomically: processes that mapped the old ones keep their pages.
+        """
+        _, features = self._view
+        for col in FEATURE_COLS:
+            with open(f"{prefix}.{col}.npy.tmp", "wb") as f:
+                np.save(f, features[col])
+            os.replace(f"{prefix}.{col}.npy.tmp", f"{prefix}.{col}.npy")
+        static = self.static.reset_index()
+        static['start_date'] = self.start_date
+        static.to_parquet(f"{prefix}.static.parquet.tmp", index=False)
+        os.replace(f"{prefix}.static.parquet.tmp", f"{prefix}.static.parquet")
+
+    @classmethod
+    def load_arrays(cls, prefix: str, version: str = None):
+        """Maps the feature matrices read-only; workers on one host share the same pages."""
+        static = pd.read_parquet(f"{prefix}.static.parquet")
+        start_date = static.pop('start_date').iloc[0]
+        static = static.set_index('article_id')
+        features = {col: np.load(f"{prefix}.{col}.npy", mmap_mode='r') for col in FEATURE_COLS}
+        return cls(static.index.to_numpy(), start_date, features, static, version=version)
+
+    def __contains__(self, item_id) -> bool:
+        return item_id in self.positions
+
+    def __len__(self) -> int:
+        return len(self.article_ids) * self.n_days
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return pd.date_range(start=self.start_date, periods=self.n_days, freq='D')
+
+    @property
+    def last_time_idx(self) -> int:
+        return self.n_days - 1
+
+    def details(self, item_id: str) -> dict:
+        row = self.static.iloc[self.positions[item_id]]
+        return {col: str(row[col]) for col in STATIC_COLS}
+
+    def window(self, item_id: str, length: int) -> pd.DataFrame:
+        """Returns the last `length` days of one article in the long format the TFT dataset expects."""
+        pos = self.positions[item_id]
+        n_days, features = self._view
+        start = max(0, n_days - length)
+        time_idx = np.arange(start, n_days)
+
+        frame = pd.DataFrame({
+            "t_dat": self.start_date + pd.to_timedelta(time_idx, unit='D'),
+            "article_id": item_id,
+            "time_idx": time_idx,
+        })
+        for col in FEATURE_COLS:
+            frame[col] = features[col][pos, start:]
+        for col, value in self.details(item_id).items():
+            frame[col] = value
+        return frame
+
+    def sales_tail(self, item_id: str, length: int):
+        """Returns (dates, sales) for the last `length` days of one article."""
+        n_days, features = self._view
+        start = max(0, n_days - length)
+        dates = self.start_date + pd.to_timedelta(np.arange(start, n_days), unit='D')
+        return dates, features['sales'][self.positions[item_id], start:]
@@ -0,0 +1,53 @@
+#fashion-retail-backend/app/services/image_index.py
+import math
+import os
+import numpy as np
+from app.config import settings
+
+# FAISS factory strings per index type; {nlist}, {m} and {hnsw_m} are filled in by build_index
+INDEX_KINDS = {
+    "flat": "Flat",
+    "flat_fp16": "SQfp16",
+    "ivf_flat": "IVF{nlist},Flat",
+    "ivf_fp16": "IVF{nlist},SQfp16",
+    "ivf_pq": "IVF{nlist},PQ{m}",
+    "hnsw": "HNSW{hnsw_m},Flat",
+    "hnsw_fp16": "HNSW{hnsw_m},SQfp16",
+}
+
+def image_index_path(kind: str) -> str:
+    """The exhaustive index keeps its original file name; ANN variants sit next to it."""
+    if kind == "flat":
+        return settings.FAISS_PATH
+    root, ext = os.path.splitext(settings.FAISS_PATH)
+    return f"{root}.{kind}{ext}"
+
+def extract_vectors(index) -> np.ndarray:
+    """All stored vectors of an exhaustive index, as float32 (n x d)."""
+    return index.reconstruct_n(0, index.ntotal)
+
+def build_index(vectors: np.ndarray, kind: str, metric: int = None,
+                nlist: int = None, m: int = 64, hnsw_m: int = 32):
+    import faiss
+    metric = faiss.METRIC_L2 if metric is None else metric
+    if kind not in INDEX_KINDS:
+        raise ValueError(f"Unknown index type '{kind}', expected one of {list(INDEX_KINDS)}")
+    n, d = vectors.shape
+    # Rule of thumb: ~4*sqrt(n) lists, but keep >= 39 training points per centroid
+    nlist = nlist or max(1, min(int(4 * math.sqrt(n)), n // 39))
+    index = faiss.index_factory(d, INDEX_KINDS[kind].format(nlist=nlist, m=m, hnsw_m=hnsw_m), metric)
+    if not index.is_trained:
+        index.train(vectors)
+    index.add(vectors)
+    apply_search_params(index)
+    return index
+
+def apply_search_params(index, nprobe: int = None, ef_search: int = None):
+    """Sets the recall/speed knobs that apply to this index type; others are ignored."""
+    import faiss
+    space = faiss.ParameterSpace()
+    for name, value in (("nprobe", nprobe or settings.FAISS_NPROBE), ("efSearch", ef_search or settings.FAISS_EF_SEARCH)):
+        try:
+            space.set_index_parameter(index, name, value)
+        except RuntimeError:
+            pass
@@ -0,0 +1,130 @@
+#fashion-retail-backend/app/services/lexical_index.py
+import json
+import os
+import re
+from collections import Counter
+import numpy as np
+from app.config import settings
+from app.core.shared_artifacts import atomic_path
+from app.services.text_index import file_hash
+
+# Bump when tokenisation or field weighting changes so persisted indexes are rebuilt
+LEXICAL_VERSION = 1
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = {
+    "a", "an", "and", "the", "of", "in", "on", "for", "with", "to", "is", "it", "me", "my", "i",
+    "show", "find", "want", "need", "looking", "some", "any", "under", "below", "less", "than", "max",
+}
+
+def tokenize(text: str) -> list:
+    return [t for t in TOKEN_RE.findall(str(text).lower()) if t not in STOPWORDS]
+
+class BM25Index:
+    """
+    Okapi BM25 over the catalog, stored as CSR postings (term -> doc ids, weights).
+    Per-posting BM25 weights are precomputed at build time, so a query is one
+    scatter-add per query term over that term's postings.
+    """
+    def __init__(self, terms, indptr, doc_ids, weights, n_docs: int):
+        self.terms = np.asarray(terms, dtype=object)
+        self.vocab = {t: i for i, t in enumerate(self.terms)}
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.n_docs = int(n_docs)
+
+    @classmethod
+    def build(cls, documents: list, k1: float = 1.2, b: float = 0.75):
+        vocab = {}
+        term_ids, doc_ids, tfs = [], [], []
+        doc_len = np.zeros(len(documents), dtype=np.float32)
+        for doc_id, tokens in enumerate(documents):
+            doc_len[doc_id] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                term_ids.append(vocab.setdefault(term, len(vocab)))
+                doc_ids.append(doc_id)
+                tfs.append(tf)
+
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        order = np.argsort(term_ids, kind='stable')
+        term_ids = term_ids[order]
+        doc_ids = np.asarray(doc_ids, dtype=np.int32)[order]
+        tfs = np.asarray(tfs, dtype=np.float32)[order]
+
+        df = np.bincount(term_ids, minlength=len(vocab)).astype(np.float32)
+        indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(df)
+
+        n_docs = len(documents)
+        idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+        norm = k1 * (1 - b + b * doc_len[doc_ids] / max(doc_len.mean(), 1e-6))
+        weights = (idf[term_ids] * tfs * (k1 + 1) / (tfs + norm)).astype(np.float32)
+
+        terms = [None] * len(vocab)
+        for term, i in vocab.items():
+            terms[i] = term
+        return cls(terms, indptr, doc_ids, weights, n_docs)
+
+    def save(self, path: str):
+        with atomic_path(path) as tmp_path, open(tmp_path, "wb") as f:
+            np.savez(f, terms=self.terms.astype(str), indptr=self.indptr, doc_ids=self.doc_ids,
+                     weights=self.weights, n_docs=np.array(self.n_docs))
+
+    @classmethod
+    def load(cls, path: str):
+        data = np.load(path)
+        return cls(data['terms'], data['indptr'], data['doc_ids'], data['weights'], data['n_docs'])
+
+    def search(self, query: str, k: int, mask: np.ndarray = None) -> list:
+        """Row ids of the top-k BM25 matches (only rows where `mask` is True, if given)."""
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        for term in set(tokenize(query)):
+            i = self.vocab.get(term)
+            if i is None:
+                continue
+            start, stop = self.indptr[i], self.indptr[i + 1]
+            # Each doc appears at most once per term, so fancy-index add is safe
+            scores[self.doc_ids[start:stop]] += self.weights[start:stop]
+        if mask is not None:
+            scores[~mask] = 0.0
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k)[:k]]
+        return candidates[np.argsort(-scores[candidates], kind='stable')].tolist()
+
+def reciprocal_rank_fusion(rankings: list, k: int, rrf_k: int = 60) -> list:
+    """Merges several ranked lists of row ids: score(row) = sum 1 / (rrf_k + rank)."""
+    scores = {}
+    for ranking in rankings:
+        for rank, row in enumerate(ranking):
+            scores[row] = scores.get(row, 0.0) + 1.0 / (rrf_k + rank + 1)
+    return sorted(scores, key=scores.get, reverse=True)[:k]
+
+def load_or_build_lexical_index(documents_fn, articles_path: str, expected_count: int = None, force: bool = False) -> BM25Index:
+    """
+    Loads the persisted BM25 index when articles.csv is unchanged, else builds and saves it.
+    `documents_fn` returns the tokenised documents and is only called on a rebuild.
+    """
+    path = os.path.join(settings.CHAT_INDEX_DIR, "chat_bm25.npz")
+    manifest_path = path + ".json"
+    articles_hash = file_hash(articles_path)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        manifest = {}
+
+    if not force and manifest == {"articles_hash": articles_hash, "version": LEXICAL_VERSION} and os.path.exists(path):
+        print(f"   - Loading persisted lexical index from {path}...")
+        index = BM25Index.load(path)
+        if expected_count is None or index.n_docs == expected_count:
+            return index
+
+    print("   - Building Lexical (BM25) Index...")
+    index = BM25Index.build(documents_fn())
+    index.save(path)
+    with atomic_path(manifest_path) as tmp_path, open(tmp_path, "w") as f:
+        json.dump({"articles_hash": articles_hash, "version": LEXICAL_VERSION}, f)
+    return index
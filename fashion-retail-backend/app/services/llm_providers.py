@@ -0,0 +1,232 @@
+#fashion-retail-backend/app/services/llm_providers.py
+import asyncio
+import os
+import random
+import threading
+import time
+from app.config import settings
+from app.core.executor import EngineSaturated
+
+class LLMUnavailable(Exception):
+    """The provider failed after all retries (network, timeout, rate limit, 5xx)."""
+
+class LLMProvider:
+    """
+    Chat completion backend used by ChatService.
+    Subclasses implement `_complete`, `_acomplete` and `_astream` for one attempt;
+    this base adds the concurrency limit and retry with exponential backoff.
+    """
+    name = "base"
+
+    def __init__(self, max_concurrency: int = 8, max_retries: int = 2, backoff: float = 0.5, queue_timeout: float = 5.0):
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.queue_timeout = queue_timeout
+        # One limit for both paths: async calls wait on the same semaphore off the event loop
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+
+    def _retryable(self, exc: Exception) -> bool:
+        return False
+
+    def _delay(self, attempt: int) -> float:
+        # Full jitter keeps synchronized retries from hammering the API together
+        return random.uniform(0, self.backoff * (2 ** attempt))
+
+    async def _aacquire(self):
+        if self._slots.acquire(blocking=False):
+            return
+        future = asyncio.get_running_loop().run_in_executor(None, self._slots.acquire, True, self.queue_timeout)
+        try:
+            acquired = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The wait goes on in the worker thread: hand the slot back if it still gets one
+            future.add_done_callback(lambda f: f.cancelled() or not f.result() or self._slots.release())
+            raise
+        if not acquired:
+            raise EngineSaturated(f"llm:{self.name}")
+
+    def complete(self, messages: list) -> str:
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise EngineSaturated(f"llm:{self.name}")
+        try:
+            for attempt in range(self.max_retries + 1):
+                self.calls += 1
+                try:
+                    return self._complete(messages)
+                except Exception as e:
+                    if attempt == self.max_retries or not self._retryable(e):
+                        self.failures += 1
+                        raise LLMUnavailable(str(e)) from e
+                    self.retries += 1
+                    time.sleep(self._delay(attempt))
+        finally:
+            self._slots.release()
+
+    async def acomplete(self, messages: list) -> str:
+        await self._aacquire()
+        try:
+            for attempt in range(self.max_retries + 1):
+                self.calls += 1
+                try:
+                    return await self._acomplete(messages)
+                except Exception as e:
+                    if attempt == self.max_retries or not self._retryable(e):
+                        self.failures += 1
+                        raise LLMUnavailable(str(e)) from e
+                    self.retries += 1
+                    await asyncio.sleep(self._delay(attempt))
+        finally:
+            self._slots.release()
+
+    async def astream(self, messages: list):
+        """Yields reply chunks. Retries only happen before the first chunk has been sent."""
+        await self._aacquire()
+        try:
+            for attempt in range(self.max_retries + 1):
+                self.calls += 1
+                started = False
+                try:
+                    async for chunk in self._astream(messages):
+                        started = True
+                        yield chunk
+                    return
+                except Exception as e:
+                    if started or attempt == self.max_retries or not self._retryable(e):
+                        self.failures += 1
+                        raise LLMUnavailable(str(e)) from e
+                    self.retries += 1
+                    await asyncio.sleep(self._delay(attempt))
+        finally:
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "provider": self.name,
+            "max_concurrency": self.max_concurrency,
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+        }
+
+    def close(self):
+        pass
+
+    async def aclose(self):
+        """Shutdown hook for clients bound to the event loop; sync resources go through close()."""
+        self.close()
+
+class GroqProvider(LLMProvider):
+    """Groq chat completions over pooled keep-alive HTTP clients with explicit timeouts."""
+    name = "groq"
+
+    def __init__(self, model: str, timeout: float = 20.0, max_connections: int = 20, temperature: float = 0.5,
+                 max_tokens: int = 300, **kwargs):
+        super().__init__(**kwargs)
+        import groq
+        import httpx
+        self._groq = groq
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        api_key = os.environ.get("GROQ_API_KEY", "YOUR_API_KEY_HERE")
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        http_timeout = httpx.Timeout(timeout, connect=min(timeout, 5.0))
+        # SDK retries are disabled: the backoff above is the single retry policy
+        self.client = groq.Groq(api_key=api_key, max_retries=0, timeout=http_timeout,
+                                http_client=httpx.Client(limits=limits, timeout=http_timeout))
+        self.async_client = groq.AsyncGroq(api_key=api_key, max_retries=0, timeout=http_timeout,
+                                           http_client=httpx.AsyncClient(limits=limits, timeout=http_timeout))
+
+    def _retryable(self, exc: Exception) -> bool:
+        groq = self._groq
+        return isinstance(exc, (groq.APIConnectionError, groq.APITimeoutError, groq.RateLimitError, groq.InternalServerError))
+
+    def _args(self, messages: list) -> dict:
+        return dict(model=self.model, messages=messages, temperature=self.temperature, max_tokens=self.max_tokens, stop=None)
+
+    def _complete(self, messages: list) -> str:
+        completion = self.client.chat.completions.create(**self._args(messages))
+        return completion.choices[0].message.content
+
+    async def _acomplete(self, messages: list) -> str:
+        completion = await self.async_client.chat.completions.create(**self._args(messages))
+        return completion.choices[0].message.content
+
+    async def _astream(self, messages: list):
+        stream = await self.async_client.chat.completions.create(**self._args(messages), stream=True)
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def close(self):
+        self.client.close()
+
+    async def aclose(self):
+        # The pooled httpx.AsyncClient must be closed on the loop that used it
+        await self.async_client.close()
+        self.close()
+
+class TemplateProvider(LLMProvider):
+    """
+    Deterministic offline stand-in: answers from the inventory listed in the system prompt.
+    Lets tests and load runs exercise the full RAG path without network access.
+    """
+    name = "stub"
+
+    def __init__(self, token_delay_ms: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.token_delay = token_delay_ms / 1000.0
+
+    def _reply(self, messages: list) -> str:
+        system, query = messages[0]["content"], messages[-1]["content"]
+        # Reads the "- Item ID: / - Name: / - Color:" fields of the INVENTORY MATCHES block
+        items = []
+        for line in system.splitlines():
+            label, _, value = line.strip().lstrip("- ").partition(": ")
+            if label == "Item ID":
+                items.append({})
+            if items and value:
+                items[-1][label] = value
+        if not items:
+            return "Sorry, I couldn't find anything matching that request. Could you describe it differently?"
+        lines = [f"Here are my picks for \"{query}\":"]
+        for item in items:
+            lines.append(f"- {item.get('Item ID')}: {item.get('Name')} in {item.get('Color')}.")
+        lines.append("Let me know if you'd like other colours or styles!")
+        return "\n".join(lines)
+
+    def _complete(self, messages: list) -> str:
+        return self._reply(messages)
+
+    async def _acomplete(self, messages: list) -> str:
+        return self._reply(messages)
+
+    async def _astream(self, messages: list):
+        tokens = self._reply(messages).split(" ")
+        for i, token in enumerate(tokens):
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay)
+            yield token if i == len(tokens) - 1 else token + " "
+
+PROVIDERS = {"groq": GroqProvider, "stub": TemplateProvider}
+
+def build_provider(name: str = None) -> LLMProvider:
+    name = name or settings.CHAT_LLM_BACKEND
+    common = dict(
+        max_concurrency=settings.CHAT_LLM_MAX_CONCURRENCY,
+        max_retries=settings.CHAT_LLM_MAX_RETRIES,
+        backoff=settings.CHAT_LLM_BACKOFF,
+        queue_timeout=settings.CHAT_LLM_QUEUE_TIMEOUT,
+    )
+    if name == "groq":
+        return GroqProvider(
+            settings.CHAT_LLM_MODEL, timeout=settings.CHAT_LLM_TIMEOUT, max_connections=settings.CHAT_LLM_MAX_CONNECTIONS,
+            temperature=settings.CHAT_LLM_TEMPERATURE, max_tokens=settings.CHAT_LLM_MAX_TOKENS, **common
+        )
+    if name == "stub":
+        return TemplateProvider(token_delay_ms=settings.CHAT_STUB_TOKEN_DELAY_MS, **common)
+    raise ValueError(f"Unknown CHAT_LLM_BACKEND '{name}' (expected one of {sorted(PROVIDERS)})")
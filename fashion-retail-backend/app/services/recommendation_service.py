@@ -1,13 +1,20 @@
 #fashion-retail-backend/app/services/reccomendation_service.py
-import torch
-import clip
-import faiss
-import pickle
-import numpy as np
 from PIL import Image
 import io
 import os
 from app.config import settings
+from app.core.batching import MicroBatcher
+from app.core.executor import get_executor
+from app.core.metrics import stage
+from app.core.warmup import EngineLoader
+from app.core.shared_artifacts import load_article_ids, read_faiss_index
+from app.services.catalog_service import catalog
+from app.services.image_index import apply_search_params, image_index_path
+
+# torch / CLIP are imported when the engine loads, so workers that never serve
+# visual search (ENABLED_ENGINES) don't pay for them at startup.
+
+ENRICH_COLUMNS = ["prod_name", "product_type_name", "colour_group_name", "index_group_name"]
 
 class RecommendationService:
     def __init__(self):
@@ -15,87 +22,146 @@ class RecommendationService:
         self.preprocess = None
         self.index = None
         self.article_ids = None
+        self._ready = False
         self.device = "cpu" # Force CPU on Mac
+        self.loader = EngineLoader("recommend", self.load_model, lambda: self._ready, warm_fn=self.warm_up)
 
     def load_model(self):
         print(f" Loading Visual Engine (CLIP & FAISS)...")
         try:
+            import clip
+            # Built into locals and published together at the end: the engine only
+            # reports ready once CLIP, the index and the id mapping are all in place
             # 1. Load CLIP
             # We use jit=False to ensure compatibility on some systems
-            self.model, self.preprocess = clip.load("ViT-B/32", device=self.device, jit=False)
+            model, preprocess = clip.load("ViT-B/32", device=self.device, jit=False)
             
-            # 2. Load FAISS Index
-            if os.path.exists(settings.FAISS_PATH):
-                self.index = faiss.read_index(settings.FAISS_PATH)
-            else:
-                print(f"FAISS Index not found at {settings.FAISS_PATH}")
+            # 2. Load FAISS Index (IMAGE_INDEX_TYPE picks an ANN variant, falling back to flat)
+            index_path = image_index_path(settings.IMAGE_INDEX_TYPE)
+            if not os.path.exists(index_path) and index_path != settings.FAISS_PATH:
+                print(f"'{settings.IMAGE_INDEX_TYPE}' index not found at {index_path}, using the flat index")
+                index_path = settings.FAISS_PATH
+            if not os.path.exists(index_path):
+                print(f"FAISS Index not found at {index_path}")
+                return
+            index = read_faiss_index(index_path)
+            apply_search_params(index)
 
             # 3. Load ID Mapping
-            if os.path.exists(settings.IDS_PATH):
-                with open(settings.IDS_PATH, "rb") as f:
-                    self.article_ids = pickle.load(f)
+            article_ids = None
+            if os.path.exists(settings.IDS_PATH) or os.path.exists(settings.IDS_NPY_PATH):
+                article_ids = load_article_ids()
             else:
                 print(f" ID Mapping not found at {settings.IDS_PATH}")
-                
+
+            # 4. Article Catalog (for enriching hits)
+            if os.path.exists(settings.ARTICLES_PATH) or os.path.exists(settings.ARTICLES_ARROW_PATH):
+                catalog.ensure_loaded()
+
+            self.model, self.preprocess, self.index, self.article_ids = model, preprocess, index, article_ids
+            self._ready = True
             print(" Visual Engine Loaded.")
         except Exception as e:
             print(f" Error loading Visual Engine: {e}")
 
+    def warm_up(self):
+        """Runs one blank image through CLIP and FAISS."""
+        buffer = io.BytesIO()
+        Image.new('RGB', (224, 224), color=(128, 128, 128)).save(buffer, format='PNG')
+        self.search_batch([buffer.getvalue()], k=1)
+
     def search(self, image_bytes, k=5):
         """
         Takes raw image bytes, converts to vector, searches FAISS.
         """
+        return self.search_batch([image_bytes], k)[0]
+
+    def search_batch(self, images: list, k=5) -> list:
+        """
+        Batched search: decodes every image, runs one CLIP forward pass and one FAISS search.
+        Returns one result per image (a list of hits, or {"error": ...} for that image only).
+        """
         # LAZY LOAD
-        if self.model is None:
+        if not self._ready:
             print("⚠️ Lazy Loading Visual Engine...")
-            self.load_model()
-        if self.model is None or self.index is None:
-            return {"error": "Visual Engine not loaded"}
+            self.loader.ensure()
+        if not self._ready:
+            return [{"error": "Visual Engine not loaded"} for _ in images]
 
-        try:
-            # 1. Preprocess Image
-            image = Image.open(io.BytesIO(image_bytes)).convert('RGB')
-            image_input = self.preprocess(image).unsqueeze(0).to(self.device)
+        results = [None] * len(images)
+        tensors, rows = [], []
+        with stage("recommend", "decode"):
+            for row, image_bytes in enumerate(images):
+                try:
+                    # 1. Preprocess Image
+                    image = Image.open(io.BytesIO(image_bytes)).convert('RGB')
+                    tensors.append(self.preprocess(image))
+                    rows.append(row)
+                except Exception as e:
+                    print(f"Search Error: {e}")
+                    results[row] = {"error": f"Search Failed: {str(e)}"}
 
-            # 2. Generate Vector
-            with torch.no_grad():
+        if not tensors:
+            return results
+
+        import torch
+        try:
+            # 2. Generate Vectors
+            with stage("recommend", "clip_encode"), torch.no_grad():
+                image_input = torch.stack(tensors).to(self.device)
                 image_features = self.model.encode_image(image_input)
                 # Normalize
                 image_features /= image_features.norm(dim=-1, keepdim=True)
+                query_vectors = image_features.cpu().numpy().astype('float32')
             
             # 3. Search FAISS
-            query_vector = image_features.cpu().numpy().astype('float32')
-            distances, indices = self.index.search(query_vector, k)
-
-            # 4. Format Results
-            results = []
-            for i in range(k):
-                idx = indices[0][i]
-                score = float(distances[0][i])
-                
-                if self.article_ids and idx < len(self.article_ids):
-                    raw_id = str(self.article_ids[idx])
-                    
-                    # FIX: Add leading zero to make it 10 digits (Standard H&M format)
-                    article_id = raw_id.zfill(10)
-                    
-                    # Logic: The first 3 digits usually determine the folder on older H&M datasets
-                    folder = article_id[:3]
-                                   
-                    # USE THIS NEW LINE INSTEAD:
-                    img_url = f"https://placehold.co/400x600/1f2937/white?text=Item+{article_id}"
-                    
-                    results.append({
-                        "article_id": article_id,
-                        "score": round(score, 2),
-                        "image_url": img_url 
-                    })
-            
-            return results
+            with stage("recommend", "faiss_search"):
+                distances, indices = self.index.search(query_vectors, k)
+
+            with stage("recommend", "enrich"):
+                for i, row in enumerate(rows):
+                    results[row] = self._format_hits(distances[i], indices[i])
 
         except Exception as e:
             print(f"Search Error: {e}")
-            return {"error": f"Search Failed: {str(e)}"}
+            for row in rows:
+                results[row] = {"error": f"Search Failed: {str(e)}"}
+
+        return results
+
+    def _format_hits(self, distances, indices) -> list:
+        # 4. Format Results
+        if self.article_ids is None:
+            return []
+        hits = [(idx, float(d)) for idx, d in zip(indices, distances) if 0 <= idx < len(self.article_ids)]
+        raw_ids = [self.article_ids[idx] for idx, _ in hits]
+
+        # One bulk catalog lookup for names/colours instead of per-hit string work
+        enrich = {}
+        if catalog.df is not None:
+            found = catalog.lookup(raw_ids, ["article_id"] + ENRICH_COLUMNS)
+            enrich = dict(zip(found["article_id"].tolist(), found[ENRICH_COLUMNS].astype(str).to_dict("records")))
+        results = []
+        for (idx, score), raw_id in zip(hits, raw_ids):
+            article_id = catalog.format_id(raw_id)
+                           
+            # USE THIS NEW LINE INSTEAD:
+            img_url = f"https://placehold.co/400x600/1f2937/white?text=Item+{article_id}"
+            
+            result = {
+                "article_id": article_id,
+                "score": round(score, 2),
+                "image_url": img_url 
+            }
+            result.update(enrich.get(catalog.to_key(raw_id), {}))
+            results.append(result)
+        
+        return results
 
 
-recommender = RecommendationService()
\ No newline at end of file
+recommender = RecommendationService()
+# Concurrent visual-search requests share CLIP forward passes and FAISS searches
+visual_batcher = MicroBatcher(
+    recommender.search_batch, get_executor("recommend"),
+    max_batch_size=settings.VISUAL_BATCH_SIZE, max_wait_ms=settings.VISUAL_BATCH_WAIT_MS
+)
\ No newline at end of file
@@ -0,0 +1,124 @@
+#fashion-retail-backend/app/services/response_cache.py
+import re
+import threading
+import numpy as np
+from app.core.cache import LRUTTLCache
+
+def normalize_query(query: str) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^\w$ ]", " ", query.lower())).strip()
+
+def cache_key(query: str, filters: dict) -> tuple:
+    return (normalize_query(query), tuple(sorted(filters.items())))
+
+class ChatResponseCache:
+    """
+    LLM replies (with the item cards shown next to them) keyed by (normalized query,
+    detected filters), with TTL/LRU eviction.
+    Optionally, a small FAISS inner-product index over the embeddings of recent queries
+    answers paraphrases: a neighbour above `threshold` cosine with the same filters is a hit.
+    """
+    def __init__(self, maxsize: int = 512, ttl: float = None, semantic: bool = False, threshold: float = 0.95):
+        self.responses = LRUTTLCache(maxsize=maxsize, ttl=ttl)
+        self.semantic = semantic
+        self.threshold = threshold
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index = None
+        self._slot_keys = [None] * maxsize
+        self._slots = {}
+        self._next_slot = 0
+
+    @staticmethod
+    def _unit(query_vec) -> np.ndarray:
+        vec = np.asarray(query_vec, dtype=np.float32).reshape(1, -1)
+        return vec / max(float(np.linalg.norm(vec)), 1e-12)
+
+    def lookup_exact(self, query: str, filters: dict):
+        """
+        Cached entry {"reply", "cards"} for this exact query, or None. Cheap enough to run
+        before retrieval; with the semantic cache on, follow a miss with lookup_similar().
+        """
+        entry = self.responses.get(cache_key(query, filters))
+        if entry is not None:
+            self.exact_hits += 1
+        elif not self.semantic:
+            self.misses += 1
+        return entry
+
+    def lookup_similar(self, query: str, filters: dict, query_vec):
+        """Cached entry of a paraphrase with the same filters, or None."""
+        key = cache_key(query, filters)
+        with self._lock:
+            if query_vec is None or self._index is None or self._index.ntotal == 0:
+                self.misses += 1
+                return None
+            scores, slots = self._index.search(self._unit(query_vec), min(4, self._index.ntotal))
+            candidates = [self._slot_keys[s] for score, s in zip(scores[0], slots[0]) if s != -1 and score >= self.threshold]
+
+        for candidate in candidates:
+            # Filters must match exactly: "under $30" and "under $50" embed almost identically
+            if candidate is not None and candidate[1] == key[1]:
+                entry = self.responses.get(candidate)
+                if entry is not None:
+                    self.semantic_hits += 1
+                    return entry
+        self.misses += 1
+        return None
+
+    def lookup(self, query: str, filters: dict, query_vec=None):
+        """Cached entry for this query (exact, then semantic), or None."""
+        entry = self.lookup_exact(query, filters)
+        if entry is None and self.semantic:
+            entry = self.lookup_similar(query, filters, query_vec)
+        return entry
+
+    def store(self, query: str, filters: dict, reply: str, query_vec=None, cards: list = None):
+        # The item cards travel with the reply, so a hit can skip retrieval entirely
+        key = cache_key(query, filters)
+        self.responses.set(key, {"reply": reply, "cards": cards or []})
+        if not self.semantic or query_vec is None:
+            return
+
+        vec = self._unit(query_vec)
+        with self._lock:
+            if self._index is None:
+                import faiss
+                self._index = faiss.IndexIDMap2(faiss.IndexFlatIP(vec.shape[1]))
+            if key in self._slots:
+                return
+            # Ring of recent queries: reuse the oldest slot once full
+            slot = self._next_slot
+            self._next_slot = (slot + 1) % len(self._slot_keys)
+            old_key = self._slot_keys[slot]
+            if old_key is not None:
+                self._index.remove_ids(np.array([slot], dtype=np.int64))
+                self._slots.pop(old_key, None)
+            self._index.add_with_ids(vec, np.array([slot], dtype=np.int64))
+            self._slot_keys[slot] = key
+            self._slots[key] = slot
+
+    def clear(self) -> int:
+        with self._lock:
+            self._index = None
+            self._slot_keys = [None] * len(self._slot_keys)
+            self._slots = {}
+            self._next_slot = 0
+        return self.responses.clear()
+
+    def stats(self) -> dict:
+        # The inner LRU also counts the neighbour probes, so report our own counters
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "size": len(self.responses),
+            "maxsize": self.responses.maxsize,
+            "ttl_seconds": self.responses.ttl,
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "evictions": self.responses.evictions,
+            "hit_rate": round((self.exact_hits + self.semantic_hits) / lookups, 4) if lookups else 0.0,
+            "semantic_enabled": self.semantic,
+            "semantic_threshold": self.threshold,
+        }
@@ -0,0 +1,106 @@
+#fashion-retail-backend/app/services/text_index.py
+import hashlib
+import json
+import os
+import numpy as np
+from app.config import settings
+from app.core.shared_artifacts import atomic_path, read_faiss_index
+
+def file_hash(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def row_keys(article_ids, texts) -> np.ndarray:
+    """64-bit key per catalog row; changes whenever the article's indexed text changes."""
+    return np.array([
+        int.from_bytes(hashlib.blake2b(f"{aid}\x1f{text}".encode(), digest_size=8).digest(), "little")
+        for aid, text in zip(article_ids, texts)
+    ], dtype=np.uint64)
+
+def _paths():
+    base = settings.CHAT_INDEX_DIR
+    return {
+        "manifest": os.path.join(base, "chat_index.json"),
+        "embeddings": os.path.join(base, "chat_embeddings.npy"),
+        "keys": os.path.join(base, "chat_row_keys.npy"),
+        "index": os.path.join(base, "chat_index.faiss"),
+    }
+
+def _read_manifest(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def _encode(model, texts: list) -> np.ndarray:
+    return np.asarray(model.encode(texts, convert_to_numpy=True, batch_size=256, show_progress_bar=len(texts) > 1000), dtype=np.float32)
+
+def build_text_index(article_ids, texts: list, model, model_name: str, articles_hash: str):
+    """
+    Embeds the catalog and writes embeddings, row keys, FAISS index and manifest.
+    Rows whose (article_id, text) key already exists in the previous build are reused,
+    so only new or edited articles go through SBERT.
+    """
+    paths = _paths()
+    keys = row_keys(article_ids, texts)
+    embeddings = None
+
+    manifest = _read_manifest(paths["manifest"])
+    if manifest.get("model_name") == model_name and os.path.exists(paths["embeddings"]) and os.path.exists(paths["keys"]):
+        old_embeddings = np.load(paths["embeddings"], mmap_mode="r")
+        old_keys = np.load(paths["keys"])
+    else:
+        old_keys = np.empty(0, dtype=np.uint64)
+
+    if len(old_keys):
+        sorter = np.argsort(old_keys)
+        found = np.searchsorted(old_keys, keys, sorter=sorter)
+        found = np.minimum(found, len(old_keys) - 1)
+        old_rows = sorter[found]
+        reuse = old_keys[old_rows] == keys
+
+        embeddings = np.empty((len(keys), old_embeddings.shape[1]), dtype=np.float32)
+        embeddings[reuse] = old_embeddings[old_rows[reuse]]
+        todo = np.flatnonzero(~reuse)
+        print(f"   - Reusing {int(reuse.sum()):,} embeddings, encoding {len(todo):,} new/changed articles...")
+        if len(todo):
+            embeddings[todo] = _encode(model, [texts[i] for i in todo])
+        del old_embeddings
+
+    if embeddings is None:
+        print(f"   - Encoding {len(texts):,} articles...")
+        embeddings = _encode(model, texts)
+
+    import faiss
+    index = faiss.IndexFlatL2(embeddings.shape[1])
+    index.add(embeddings)
+
+    # Serving workers may have these mapped: each file is swapped in whole, never rewritten in place
+    for name, array in (("embeddings", embeddings), ("keys", keys)):
+        with atomic_path(paths[name]) as tmp_path, open(tmp_path, "wb") as f:
+            np.save(f, array)
+    with atomic_path(paths["index"]) as tmp_path:
+        faiss.write_index(index, tmp_path)
+    # Manifest last: a crash mid-build leaves a mismatching manifest and forces a rebuild
+    with atomic_path(paths["manifest"]) as tmp_path, open(tmp_path, "w") as f:
+        json.dump({"articles_hash": articles_hash, "model_name": model_name,
+                   "count": int(index.ntotal), "dims": int(embeddings.shape[1])}, f)
+    return index
+
+def load_or_build_text_index(article_ids, texts: list, model, model_name: str, articles_path: str, force: bool = False):
+    """Loads the persisted index when the articles file and model are unchanged, else (re)builds it."""
+    paths = _paths()
+    articles_hash = file_hash(articles_path)
+    manifest = _read_manifest(paths["manifest"])
+
+    if (not force and manifest.get("articles_hash") == articles_hash and manifest.get("model_name") == model_name
+            and manifest.get("count") == len(texts) and os.path.exists(paths["index"])):
+        print(f"   - Loading persisted text index from {paths['index']}...")
+        return read_faiss_index(paths["index"])
+
+    print("   - Building Vector Index...")
+    return build_text_index(article_ids, texts, model, model_name, articles_hash)
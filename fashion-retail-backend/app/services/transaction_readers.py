@@ -0,0 +1,48 @@
+#fashion-retail-backend/app/services/transaction_readers.py
+import io
+import json
+import os
+import pandas as pd
+
+FORMATS = ("ndjson", "csv", "parquet")
+SCORED_COLUMNS = ["sales", "lag_7"]
+
+def detect_format(filename: str):
+    """Guesses the upload format from its extension (.ndjson/.jsonl, .csv, .parquet)."""
+    ext = os.path.splitext(filename or "")[1].lower()
+    return {".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv", ".parquet": "parquet", ".pq": "parquet"}.get(ext)
+
+def _iter_ndjson(fileobj, chunk_size: int):
+    chunk = []
+    for line in io.TextIOWrapper(fileobj, encoding="utf-8"):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            chunk.append(json.loads(line))
+        except json.JSONDecodeError:
+            # Kept as a raw string so the scorer reports it as an ERROR row
+            chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _iter_csv(fileobj, chunk_size: int):
+    yield from pd.read_csv(fileobj, chunksize=chunk_size, usecols=lambda c: c in SCORED_COLUMNS)
+
+def _iter_parquet(fileobj, chunk_size: int):
+    import pyarrow.parquet as pq
+    parquet = pq.ParquetFile(fileobj)
+    columns = [c for c in SCORED_COLUMNS if c in parquet.schema_arrow.names]
+    for batch in parquet.iter_batches(batch_size=chunk_size, columns=columns):
+        yield batch.to_pandas()
+
+def iter_transaction_chunks(fileobj, fmt: str, chunk_size: int):
+    """
+    Yields bounded chunks from a binary file: lists of dicts for NDJSON,
+    DataFrames with only the scored columns for CSV/Parquet.
+    """
+    readers = {"ndjson": _iter_ndjson, "csv": _iter_csv, "parquet": _iter_parquet}
+    return readers[fmt](fileobj, chunk_size)
@@ -0,0 +1 @@
+#fashion-retail-backend/benchmarks/__init__.py
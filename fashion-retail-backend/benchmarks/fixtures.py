@@ -0,0 +1,175 @@
+#fashion-retail-backend/benchmarks/fixtures.py
+"""
+Synthetic stand-ins for everything in models/, so the engines can be benchmarked offline.
+Sizes are configurable; shapes and column names match the real artifacts:
+articles.csv, the aggregated transactions parquet, a 512-d image FAISS index with its
+id mapping, a random-weight TFT built from the same dataset definition, a random-weight
+CLIP ViT-B/32 and a hashing sentence encoder. The chat LLM is the offline "stub" provider.
+"""
+import hashlib
+import os
+import pickle
+import numpy as np
+import pandas as pd
+from app.config import settings
+
+PRODUCT_TYPES = ["Dress", "Trousers", "Sweater", "T-shirt", "Jacket", "Skirt", "Shorts", "Blouse", "Hoodie", "Jeans"]
+PRODUCT_GROUPS = ["Garment Upper body", "Garment Lower body", "Garment Full body"]
+COLOURS = ["Black", "White", "Dark Blue", "Light Pink", "Red", "Green", "Beige", "Grey", "Yellow", "Brown"]
+APPEARANCES = ["Solid", "Stripe", "All over pattern", "Melange", "Denim"]
+INDEX_GROUPS = ["Ladieswear", "Menswear", "Divided", "Baby/Children", "Sport"]
+SECTIONS = ["Womens Everyday Basics", "Mens Casual", "Divided Collection", "Kids Girl", "Ladies Denim"]
+MATERIALS = ["cotton", "denim", "jersey", "viscose", "wool", "linen", "recycled polyester"]
+
+def configure(root: str, llm_backend: str = "stub"):
+    """
+    Points every artifact path in `settings` at `root`.
+    Must run before app.services.* is imported: some services read settings at import.
+    """
+    os.makedirs(root, exist_ok=True)
+    settings.MODEL_DIR = root
+    settings.TFT_MODEL_PATH = os.path.join(root, "tft_saved_model.ckpt")
+    settings.DATA_PATH = os.path.join(root, "transactions_synthetic.parquet")
+    settings.FAISS_PATH = os.path.join(root, "fashion_image_index.faiss")
+    settings.IDS_PATH = os.path.join(root, "article_ids.pkl")
+    settings.ANOMALY_PATH = os.path.join(root, "anomaly.pth")
+    settings.ARTICLES_PATH = os.path.join(root, "articles.csv")
+    settings.ARTICLES_ARROW_PATH = os.path.join(root, "articles.arrow")
+    settings.IDS_NPY_PATH = os.path.join(root, "article_ids.npy")
+    settings.FORECAST_STORE_PATH = os.path.join(root, "forecasts_precomputed.parquet")
+    settings.CHAT_INDEX_DIR = root
+    settings.IMAGE_INDEX_TYPE = "flat"
+    settings.CHAT_LLM_BACKEND = llm_backend
+    settings.WARMUP_ENGINES = []
+
+def make_articles(n_articles: int, rng) -> pd.DataFrame:
+    pick = lambda values: rng.choice(values, size=n_articles)
+    product_type = pick(PRODUCT_TYPES)
+    colour = pick(COLOURS)
+    material = pick(MATERIALS)
+    return pd.DataFrame({
+        "article_id": np.arange(108775015, 108775015 + n_articles, dtype=np.int64),
+        "prod_name": [f"{m.title()} {t}" for m, t in zip(material, product_type)],
+        "product_type_name": product_type,
+        "product_group_name": pick(PRODUCT_GROUPS),
+        "graphical_appearance_name": pick(APPEARANCES),
+        "colour_group_name": colour,
+        "index_group_name": pick(INDEX_GROUPS),
+        "section_name": pick(SECTIONS),
+        "detail_desc": [
+            f"{t} in soft {m} with a relaxed fit, in {c.lower()}. " * int(k)
+            for t, m, c, k in zip(product_type, material, colour, rng.integers(1, 5, size=n_articles))
+        ],
+        "price": np.round(rng.uniform(5, 80, size=n_articles), 2),
+    })
+
+def make_transactions(article_ids, n_days: int, rng) -> pd.DataFrame:
+    """Daily aggregated sales (t_dat, article_id, sales) with weekly seasonality and per-article level."""
+    dates = pd.date_range("2020-01-01", periods=n_days, freq="D")
+    level = rng.gamma(2.0, 3.0, size=len(article_ids))
+    weekly = 1.0 + 0.3 * np.sin(2 * np.pi * np.arange(n_days) / 7)
+    sales = rng.poisson(level[:, None] * weekly[None, :]).astype(np.float32)
+    return pd.DataFrame({
+        "t_dat": np.tile(dates.to_numpy(), len(article_ids)),
+        "article_id": np.repeat(np.asarray(article_ids), n_days),
+        "sales": sales.ravel(),
+    })
+
+def make_image_index(article_ids, rng, dims: int = 512):
+    import faiss
+    vectors = rng.normal(size=(len(article_ids), dims)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    index = faiss.IndexFlatL2(dims)
+    index.add(vectors)
+    faiss.write_index(index, settings.FAISS_PATH)
+    with open(settings.IDS_PATH, "wb") as f:
+        pickle.dump([str(a).zfill(10) for a in article_ids], f)
+
+def make_fixtures(root: str, n_articles: int = 1000, n_days: int = 120, seed: int = 0) -> dict:
+    """Writes the synthetic artifacts under `root` (and points settings at them)."""
+    if settings.MODEL_DIR != root:
+        configure(root)
+    rng = np.random.default_rng(seed)
+    articles = make_articles(n_articles, rng)
+    articles.to_csv(settings.ARTICLES_PATH, index=False)
+    make_transactions(articles["article_id"], n_days, rng).to_parquet(settings.DATA_PATH, index=False)
+    make_image_index(articles["article_id"], rng)
+    return {"root": root, "articles": n_articles, "days": n_days, "seed": seed}
+
+def random_tft(history, max_encoder_length: int = 30, hidden_size: int = 16):
+    """
+    Random-weight TemporalFusionTransformer whose dataset_parameters match the serving path
+    (same columns as ForecastingService._build_inference_frames), built from the history itself.
+    """
+    from pytorch_forecasting import TemporalFusionTransformer, TimeSeriesDataSet
+    from pytorch_forecasting.data import GroupNormalizer, NaNLabelEncoder
+    from pytorch_forecasting.metrics import QuantileLoss
+    from app.services.forecasting_service import PREDICTION_STEPS
+    from app.services.history_store import STATIC_COLS
+
+    frame = history.to_frame()
+    frame["article_id"] = frame["article_id"].astype(str)
+    frame["day_of_week"] = frame["t_dat"].dt.dayofweek.astype(str)
+    frame["month"] = frame["t_dat"].dt.month.astype(str)
+    frame["is_weekend"] = frame["day_of_week"].isin(["5", "6"]).astype(str)
+    for col in STATIC_COLS:
+        frame[col] = frame[col].astype(str)
+
+    dataset = TimeSeriesDataSet(
+        frame,
+        time_idx="time_idx",
+        target="sales",
+        group_ids=["article_id"],
+        max_encoder_length=max_encoder_length,
+        max_prediction_length=PREDICTION_STEPS,
+        static_categoricals=["article_id"] + STATIC_COLS,
+        time_varying_known_categoricals=["day_of_week", "month", "is_weekend"],
+        time_varying_known_reals=["time_idx"],
+        time_varying_unknown_reals=["sales", "sales_lag_7", "sales_lag_28", "sales_rolling_mean_7"],
+        target_normalizer=GroupNormalizer(groups=["article_id"], transformation="softplus"),
+        # Forecast horizons can run into a month the (short) synthetic history never saw
+        categorical_encoders={"month": NaNLabelEncoder(add_nan=True)},
+        add_relative_time_idx=True,
+        add_target_scales=True,
+        add_encoder_length=True,
+    )
+    model = TemporalFusionTransformer.from_dataset(
+        dataset, hidden_size=hidden_size, attention_head_size=1, hidden_continuous_size=hidden_size // 2,
+        dropout=0.0, loss=QuantileLoss(),
+    )
+    model.eval()
+    return model
+
+def random_clip():
+    """ViT-B/32 CLIP with random weights (real architecture and FLOPs) plus the real preprocessing."""
+    from clip.clip import _transform
+    from clip.model import CLIP
+    model = CLIP(embed_dim=512, image_resolution=224, vision_layers=12, vision_width=768, vision_patch_size=32,
+                 context_length=77, vocab_size=49408, transformer_width=512, transformer_heads=8, transformer_layers=12)
+    model.eval()
+    return model, _transform(224)
+
+class HashingEncoder:
+    """
+    SentenceTransformer stand-in: deterministic pseudo-random unit vectors per text.
+    It keeps the index, filter, BM25 and prompt stages honest but costs ~nothing itself,
+    so chat numbers measure the retrieval pipeline, not SBERT.
+    """
+    def __init__(self, dims: int = 384):
+        self.dims = dims
+
+    def encode(self, texts, convert_to_numpy: bool = True, batch_size: int = 32, show_progress_bar: bool = False):
+        out = np.empty((len(texts), self.dims), dtype=np.float32)
+        for i, text in enumerate(texts):
+            seed = int.from_bytes(hashlib.blake2b(str(text).encode(), digest_size=8).digest(), "little")
+            vec = np.random.default_rng(seed).normal(size=self.dims)
+            out[i] = vec / np.linalg.norm(vec)
+        return out
+
+def random_image_bytes(rng, size: int = 256) -> bytes:
+    import io
+    from PIL import Image
+    pixels = rng.integers(0, 255, size=(size, size, 3), dtype=np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
@@ -0,0 +1,69 @@
+#fashion-retail-backend/benchmarks/import_profile.py
+"""
+Cold-start import profile of the API, per engine selection.
+Runs `python -X importtime -c "import app.main"` in a fresh interpreter for each
+ENABLED_ENGINES scenario and reports wall time plus the slowest top-level packages.
+Usage: python benchmarks/import_profile.py [--scenarios all,monitor,forecast] [--top 15] [--output import_profile.json]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)")
+PROBE = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+
+def profile(engines: str, top: int) -> dict:
+    env = dict(os.environ, ENABLED_ENGINES=engines)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", PROBE],
+                          cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return {"engines": engines, "error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"}
+
+    # A package's own line (e.g. "torch") carries the cumulative cost of everything it pulled in;
+    # nested packages are counted again under their own name, so this is attribution, not a sum
+    packages = {}
+    modules = 0
+    for line in proc.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if not match:
+            continue
+        modules += 1
+        _, cumulative, name = match.groups()
+        if "." not in name and name != "app":
+            packages[name] = max(packages.get(name, 0), int(cumulative))
+
+    slowest = sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:top]
+    return {
+        "engines": engines,
+        "import_app_main_s": round(float(proc.stdout.strip().splitlines()[-1]), 3),
+        "modules_imported": modules,
+        "slowest_packages_ms": {name: round(us / 1000, 1) for name, us in slowest},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile `import app.main` for several ENABLED_ENGINES settings.")
+    parser.add_argument("--scenarios", default="all,forecast,recommend,monitor,chat",
+                        help="Comma-separated ENABLED_ENGINES values; 'all' = every engine, use '+' to combine (forecast+monitor)")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", help="Write the JSON report here as well as to stdout")
+    args = parser.parse_args()
+
+    report = []
+    for scenario in args.scenarios.split(","):
+        engines = "forecast,recommend,monitor,chat" if scenario == "all" else scenario.replace("+", ",")
+        result = profile(engines, args.top)
+        print(f"{scenario:>20}: {result.get('import_app_main_s', result.get('error'))}", file=sys.stderr)
+        report.append(result)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+#fashion-retail-backend/benchmarks/run.py
+"""
+Offline benchmark of the four engines on synthetic fixtures (see benchmarks/fixtures.py).
+Measures latency percentiles, throughput and memory in-process, and optionally through
+the FastAPI app under concurrent load (in-process ASGI transport, no network).
+Usage: python -m benchmarks.run [--engines forecast,recommend,chat,monitor] [--articles 1000] [--days 120]
+                                [--iterations 100] [--http --concurrency 16 --requests 400]
+                                [--workdir /tmp/fris-bench] [--output results.json]
+Compare runs by diffing the JSON reports (same --seed and sizes).
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+
+ENGINES = ["forecast", "recommend", "chat", "monitor"]
+CHAT_QUERIES = [
+    "black cotton dress under $40", "denim jeans for men", "something light for summer",
+    "white t-shirt", "warm wool sweater for women", "red skirt under $25", "grey hoodie",
+    "striped blouse for work", "linen shorts for a guy", "beige jacket",
+]
+
+def summarize(latencies: list, elapsed: float) -> dict:
+    ms = np.asarray(latencies) * 1000
+    return {
+        "n": len(ms),
+        "mean_ms": round(float(ms.mean()), 3),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "throughput_per_s": round(len(ms) / elapsed, 2) if elapsed else None,
+    }
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def measure(fn, iterations: int, warmup: int = 3, items_per_call: int = 1) -> dict:
+    """Runs `fn(i)` sequentially; reports latency per call, items/s and the Python heap peak."""
+    for i in range(warmup):
+        fn(i)
+    latencies = []
+    tracemalloc.start()
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        fn(i)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result = summarize(latencies, elapsed)
+    result["items_per_s"] = round(iterations * items_per_call / elapsed, 2)
+    result["heap_peak_mb"] = round(peak / 1e6, 2)
+    return result
+
+def check(result, what: str):
+    """Fails the run instead of timing error payloads (an engine that did not load answers fast)."""
+    results = result if isinstance(result, list) else [result]
+    if not results or any(r is None or (isinstance(r, dict) and "error" in r) for r in results):
+        raise SystemExit(f"❌ {what} returned an error: {results[:1]}")
+
+# --- Engine setup (synthetic models assigned directly, bypassing the checkpoint loaders) ---
+
+def setup_forecast():
+    from app.config import settings
+    from app.services.feature_pipeline import load_or_build_history
+    from app.services.forecasting_service import forecaster
+    from benchmarks.fixtures import random_tft
+
+    forecaster.load_history(load_or_build_history(settings.DATA_PATH, settings.ARTICLES_PATH))
+    forecaster.model = random_tft(forecaster.history)
+    forecaster._is_loaded = True
+    forecaster.model_version = "synthetic"
+    return forecaster
+
+def setup_recommend():
+    from app.config import settings
+    from app.core.shared_artifacts import load_article_ids, read_faiss_index
+    from app.services.catalog_service import catalog
+    from app.services.recommendation_service import recommender
+    from benchmarks.fixtures import random_clip
+
+    recommender.model, recommender.preprocess = random_clip()
+    recommender.index = read_faiss_index(settings.FAISS_PATH)
+    recommender.article_ids = load_article_ids()
+    catalog.ensure_loaded()
+    recommender._ready = True
+    return recommender
+
+def setup_chat():
+    from app.services.chat_service import chat_engine
+    from benchmarks.fixtures import HashingEncoder
+
+    chat_engine.model = HashingEncoder()
+    chat_engine.load_resources()
+    return chat_engine
+
+def setup_monitor():
+    from app.services.anomaly_service import watchdog
+    # No anomaly.pth in the fixtures: load_model keeps the randomly initialised autoencoder
+    watchdog.load_model()
+    return watchdog
+
+# --- In-process benchmarks ---
+
+def bench_forecast(iterations: int) -> dict:
+    forecaster = setup_forecast()
+    ids = [str(i) for i in forecaster.history.article_ids]
+
+    def live_single(i):
+        forecaster.cache.clear()
+        forecaster.predict(ids[i % len(ids)])
+
+    def live_batch(i):
+        forecaster.cache.clear()
+        forecaster.predict_many(ids[:64])
+
+    check(forecaster.predict(ids[0]), "forecast")
+    return {
+        "predict_live_single": measure(live_single, iterations),
+        "predict_live_batch64": measure(live_batch, max(5, iterations // 10), items_per_call=64),
+        "predict_cached": measure(lambda i: forecaster.predict(ids[0]), iterations * 10),
+    }
+
+def bench_recommend(iterations: int, rng) -> dict:
+    from benchmarks.fixtures import random_image_bytes
+    recommender = setup_recommend()
+    images = [random_image_bytes(rng) for _ in range(32)]
+    check(recommender.search_batch([images[0]], 5), "recommend")
+    return {
+        "search_single": measure(lambda i: recommender.search_batch([images[i % 32]], 5), iterations),
+        "search_batch16": measure(lambda i: recommender.search_batch(images[:16], 5), max(5, iterations // 8), items_per_call=16),
+    }
+
+def bench_chat(iterations: int) -> dict:
+    chat_engine = setup_chat()
+    message = lambda i: [{"role": "user", "content": f"{CHAT_QUERIES[i % len(CHAT_QUERIES)]} #{i}"}]
+
+    def full(i):
+        prepared = chat_engine.retrieve(message(i))
+        chat_engine.llm.complete(chat_engine._llm_messages(prepared))
+
+    check(chat_engine.retrieve(message(0)), "chat")
+    return {
+        "retrieve": measure(lambda i: chat_engine.retrieve(message(i)), iterations),
+        "retrieve_and_stub_llm": measure(full, iterations),
+    }
+
+def bench_monitor(iterations: int, rng) -> dict:
+    import pandas as pd
+    watchdog = setup_monitor()
+    rows = [{"sales": float(s), "lag_7": float(l)} for s, l in rng.poisson(20, size=(1000, 2))]
+    frame = pd.DataFrame(rng.poisson(20, size=(100_000, 2)).astype(float), columns=["sales", "lag_7"])
+    check(watchdog.detect(rows), "monitor")
+    return {
+        "detect_1k_rows": measure(lambda i: watchdog.detect(rows), iterations, items_per_call=len(rows)),
+        "detect_frame_100k_rows": measure(lambda i: watchdog.detect_frame(frame), max(5, iterations // 10), items_per_call=len(frame)),
+    }
+
+# --- HTTP load through the FastAPI app ---
+
+async def _load(client, make_request, total: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], {}
+
+    async def one(i):
+        async with semaphore:
+            t0 = time.perf_counter()
+            response = await make_request(client, i)
+            latencies.append(time.perf_counter() - t0)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    result = summarize(latencies, time.perf_counter() - started)
+    result["status_codes"] = {str(k): v for k, v in sorted(statuses.items())}
+    return result
+
+async def bench_http(engines: list, total: int, concurrency: int, rng) -> dict:
+    import httpx
+    from app.main import app
+    from benchmarks.fixtures import random_image_bytes
+
+    requests = {}
+    if "forecast" in engines:
+        from app.services.forecasting_service import forecaster
+        ids = [str(i) for i in forecaster.history.article_ids]
+        # Distinct ids per request on an empty cache: measures live inference, not cache hits
+        # (only while --requests <= --articles)
+        forecaster.cache.clear()
+        requests["forecast_get"] = lambda c, i: c.get(f"/api/forecast/{ids[i % len(ids)]}")
+    if "recommend" in engines:
+        images = [random_image_bytes(rng) for _ in range(32)]
+        requests["recommend_visual_search"] = lambda c, i: c.post(
+            "/api/recommend/visual-search", files={"file": ("q.jpg", images[i % 32], "image/jpeg")})
+    if "chat" in engines:
+        requests["chat_stub_llm"] = lambda c, i: c.post(
+            "/api/chat/", json={"messages": [{"role": "user", "content": f"{CHAT_QUERIES[i % len(CHAT_QUERIES)]} #{i}"}]})
+    if "monitor" in engines:
+        rows = [{"sales": float(s), "lag_7": float(l)} for s, l in rng.poisson(20, size=(500, 2))]
+        requests["monitor_check_500"] = lambda c, i: c.post("/api/monitor/check", json=rows)
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        for name, make_request in requests.items():
+            results[name] = await _load(client, make_request, total, concurrency)
+            print(f"   {name}: {results[name]['p50_ms']} ms p50, {results[name]['throughput_per_s']} req/s", file=sys.stderr)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the FRIS engines on synthetic fixtures.")
+    parser.add_argument("--engines", default=",".join(ENGINES))
+    parser.add_argument("--articles", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--http", action="store_true", help="Also load-test the FastAPI app")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=400, help="HTTP requests per endpoint")
+    parser.add_argument("--workdir", help="Fixture directory (default: a fresh temp dir)")
+    parser.add_argument("--output", help="Write the JSON report here as well as to stdout")
+    args = parser.parse_args()
+    engines = [e for e in args.engines.split(",") if e in ENGINES]
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="fris-bench-")
+    # Settings must point at the fixtures before any service module is imported
+    os.environ["ENABLED_ENGINES"] = ",".join(engines)
+    from benchmarks import fixtures
+    fixtures.configure(workdir)
+    fixture_info = fixtures.make_fixtures(workdir, args.articles, args.days, args.seed)
+
+    rng = np.random.default_rng(args.seed)
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "iterations": args.iterations,
+            "fixtures": fixture_info,
+        },
+        "in_process": {},
+    }
+    runners = {
+        "forecast": lambda: bench_forecast(args.iterations),
+        "recommend": lambda: bench_recommend(args.iterations, rng),
+        "chat": lambda: bench_chat(args.iterations),
+        "monitor": lambda: bench_monitor(args.iterations, rng),
+    }
+    # Engine logs go to stderr so stdout carries only the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        for engine in engines:
+            print(f"⏱️ Benchmarking {engine}...")
+            report["in_process"][engine] = runners[engine]()
+
+        if args.http:
+            print(f"🌐 HTTP load: {args.requests} requests/endpoint at concurrency {args.concurrency}...")
+            report["http"] = asyncio.run(bench_http(engines, args.requests, args.concurrency, rng))
+            report["meta"]["concurrency"] = args.concurrency
+
+    report["meta"]["peak_rss_mb"] = peak_rss_mb()
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+if __name__ == "__main__":
+    main()
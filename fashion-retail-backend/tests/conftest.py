@@ -0,0 +1,80 @@
+#fashion-retail-backend/tests/conftest.py
+"""
+Tests run on the synthetic artifacts from benchmarks/fixtures.py, written once per session
+to a temp dir. Settings must point there before any app.services module is imported.
+"""
+import os
+import tempfile
+
+os.environ.setdefault("CHAT_LLM_BACKEND", "stub")
+os.environ.setdefault("WARMUP_ENGINES", "")
+
+import pytest
+from benchmarks import fixtures
+
+ARTIFACTS_DIR = tempfile.mkdtemp(prefix="fris-tests-")
+fixtures.configure(ARTIFACTS_DIR)
+
+@pytest.fixture(scope="session")
+def artifacts():
+    """Small synthetic catalog (60 articles x 90 days) plus image index; returns the settings."""
+    fixtures.make_fixtures(ARTIFACTS_DIR, n_articles=60, n_days=90, seed=0)
+    return fixtures.settings
+
+@pytest.fixture(scope="session")
+def tft(artifacts):
+    from app.services.feature_pipeline import load_or_build_history
+    return fixtures.random_tft(load_or_build_history(artifacts.DATA_PATH, artifacts.ARTICLES_PATH))
+
+@pytest.fixture
+def forecast_engine(artifacts, tft):
+    """The shared forecaster on a fresh copy of the history, serving the random-weight TFT."""
+    from app.services.feature_pipeline import load_or_build_history
+    from app.services.forecasting_service import forecaster
+    forecaster.load_history(load_or_build_history(artifacts.DATA_PATH, artifacts.ARTICLES_PATH))
+    forecaster.model, forecaster.model_version, forecaster._is_loaded = tft, "synthetic", True
+    return forecaster
+
+@pytest.fixture(scope="session")
+def client(artifacts):
+    # No `with`: the lifespan (history load, warm-up, executor shutdown) stays out of the tests
+    from fastapi.testclient import TestClient
+    from app.main import app
+    return TestClient(app)
+
+@pytest.fixture
+def write_store(monkeypatch, tmp_path):
+    """Serves in store mode from a precomputed table whose predictions are all `value` (easy to tell from live TFT output)."""
+    import numpy as np
+    import pandas as pd
+    from app.services.forecast_store import ForecastStore
+    from app.services.forecasting_service import PREDICTION_STEPS
+    path = str(tmp_path / "forecasts.parquet")
+    monkeypatch.setattr(fixtures.settings, "FORECAST_SERVE_MODE", "store")
+
+    def write(engine, item_ids, value: float = 7.0, history_version: str = None) -> str:
+        dates = engine.history.start_date + pd.to_timedelta(np.arange(PREDICTION_STEPS) + engine.history.n_days, unit='D')
+        ForecastStore.write(pd.DataFrame({
+            "item_id": np.repeat([str(i) for i in item_ids], PREDICTION_STEPS),
+            "date": np.tile(dates, len(item_ids)),
+            "prediction": np.float32(value),
+            "history_version": history_version or engine.history.version,
+            "model_version": "synthetic",
+        }), path)
+        return path
+    return write
+
+@pytest.fixture(scope="session")
+def chat_loaded(artifacts):
+    # Offline path end to end: hashing encoder instead of SBERT, template LLM instead of Groq
+    from app.services.chat_service import chat_engine
+    assert fixtures.settings.CHAT_LLM_BACKEND == "stub"
+    chat_engine.model = fixtures.HashingEncoder()
+    chat_engine.load_resources()
+    assert chat_engine.loader.status()["ready"]
+    return chat_engine
+
+@pytest.fixture
+def chat(chat_loaded):
+    chat_loaded.responses.clear()
+    return chat_loaded
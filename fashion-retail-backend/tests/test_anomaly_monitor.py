@@ -0,0 +1,56 @@
+#fashion-retail-backend/tests/test_anomaly_monitor.py
+import numpy as np
+import pytest
+from app.services.anomaly_service import OnlineAnomalyMonitor, watchdog
+
+@pytest.fixture
+def monitor(artifacts):
+    # No anomaly.pth in the fixtures: the autoencoder keeps its random init, fine for state tests
+    return OnlineAnomalyMonitor(watchdog, window=14, max_articles=2)
+
+def test_lag_and_rolling_mean_are_tracked_per_article(monitor):
+    results = monitor.ingest([{"article_id": "a", "day": d, "sales": d + 1} for d in range(9)])
+    last = results[-1]
+    assert last["sales"] == 9
+    assert last["lag_7"] == 2        # sales of day 1
+    assert last["rolling_mean"] == 5  # mean of 1..9
+    assert results[3]["lag_7"] == 0   # not enough history yet
+
+def test_events_on_the_same_day_accumulate(monitor):
+    monitor.ingest([{"article_id": "a", "day": 0, "sales": 2}])
+    result = monitor.ingest([{"article_id": "a", "day": 0, "sales": 3}])[0]
+    assert result["sales"] == 5
+
+def test_skipped_days_count_as_zero_sales(monitor):
+    monitor.ingest([{"article_id": "a", "day": 0, "sales": 7}])
+    result = monitor.ingest([{"article_id": "a", "day": 7, "sales": 1}])[0]
+    assert result["lag_7"] == 7
+    assert result["rolling_mean"] == pytest.approx(1.0)  # (7 + 0 * 6 + 1) / 8
+
+def test_out_of_order_event_is_an_error_for_that_row_only(monitor):
+    results = monitor.ingest([
+        {"article_id": "a", "day": 5, "sales": 1},
+        {"article_id": "a", "day": 3, "sales": 1},
+        {"article_id": "b", "day": 1, "sales": 1},
+    ])
+    assert results[0]["status"] in ("OK", "CRITICAL")
+    assert results[1]["status"] == "ERROR"
+    assert results[2]["article_id"] == "b"
+
+def test_least_recently_seen_article_is_evicted(monitor):
+    monitor.ingest([{"article_id": a, "day": 0, "sales": 1} for a in ("a", "b", "c")])
+    stats = monitor.stats()
+    assert stats["articles"] == 2
+    assert stats["evictions"] == 1
+    # "a" starts over after eviction
+    assert monitor.ingest([{"article_id": "a", "day": 9, "sales": 4}])[0]["rolling_mean"] == 4
+
+def test_articles_are_scored_against_their_own_baseline(monitor):
+    from app.config import settings
+    quiet = monitor.ingest([{"article_id": "quiet", "day": d, "sales": 10} for d in range(14)] + [{"article_id": "quiet", "day": 14, "sales": 100}])
+    busy = monitor.ingest([{"article_id": "busy", "day": d, "sales": 100} for d in range(14)] + [{"article_id": "busy", "day": 14, "sales": 100}])
+    assert quiet[0]["baseline"] == settings.ANOMALY_NORM_SCALE  # too little history yet
+    assert quiet[-1]["baseline"] == 10 and busy[-1]["baseline"] == 100
+    # Same sales, same lag_7: only the per-article normalisation tells them apart
+    assert quiet[-1]["reconstruction_error"] > busy[-1]["reconstruction_error"]
+    assert quiet[-1]["reconstruction_error"] == pytest.approx(float(watchdog.score(np.array([100.0]), np.array([10.0]), scale=10.0)[0]), abs=1e-4)
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+import torch
+from app.config import settings
+from app.services.anomaly_service import watchdog
+
+@pytest.fixture(scope="module")
+def detector(artifacts):
+    # No anomaly.pth in the fixtures: the autoencoder keeps its random init
+    assert watchdog.loader.ensure()
+    return watchdog
+
+def _torch_errors(model, rows: list) -> np.ndarray:
+    """The per-row torch forward pass that the NumPy batch scorer replaces."""
+    x = torch.tensor([[r["sales"] / settings.ANOMALY_NORM_SCALE, r["lag_7"] / settings.ANOMALY_NORM_SCALE] for r in rows])
+    with torch.no_grad():
+        return torch.mean((x - model(x)) ** 2, dim=1).numpy()
+
+def test_batch_scores_match_the_torch_model(detector):
+    rng = np.random.default_rng(0)
+    rows = [{"sales": float(s), "lag_7": float(l)} for s, l in rng.poisson(30, size=(500, 2))]
+    results = detector.detect(rows)
+    np.testing.assert_allclose([r["reconstruction_error"] for r in results], _torch_errors(detector.model, rows), atol=1e-4)
+    assert [r["sales"] for r in results] == [r["sales"] for r in rows]
+
+def test_chunked_scoring_matches_one_pass(detector, monkeypatch):
+    values = np.random.default_rng(1).uniform(0, 500, size=1000)
+    whole = detector.score(values, values[::-1].copy())
+    monkeypatch.setattr(settings, "ANOMALY_CHUNK_SIZE", 64)
+    np.testing.assert_array_equal(detector.score(values, values[::-1].copy()), whole)
+
+def test_bad_rows_are_errors_and_do_not_affect_the_others(detector):
+    good = {"sales": 40.0, "lag_7": 35.0}
+    results = detector.detect([good, {"sales": "abc", "lag_7": 1}, "not a row", {"lag_7": 35.0}, good])
+    assert [r["status"] for r in results[1:3]] == ["ERROR", "ERROR"]
+    assert "object" in results[2]["error"]
+    assert results[0] == results[4]
+    assert results[3]["sales"] == 0  # missing keys count as 0
+
+def test_frames_score_like_row_lists(detector):
+    rows = [{"sales": 50.0, "lag_7": 45.0}, {"sales": 5000.0, "lag_7": 10.0}, {"sales": None, "lag_7": 1.0}]
+    from_rows = detector.detect([{**r, "sales": r["sales"] if r["sales"] is not None else float("nan")} for r in rows])
+    from_frame = detector.detect_frame(pd.DataFrame(rows))
+    assert [r["status"] for r in from_frame] == [r["status"] for r in from_rows]
+    assert from_frame[0] == from_rows[0] and from_frame[1] == from_rows[1]
+    assert from_frame[1]["status"] == "CRITICAL"
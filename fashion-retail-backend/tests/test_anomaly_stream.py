@@ -0,0 +1,63 @@
+#fashion-retail-backend/tests/test_anomaly_stream.py
+import json
+import pytest
+from app.config import settings
+from app.core.executor import EngineSaturated, get_executor
+from app.services.anomaly_service import watchdog
+
+ROWS = [{"sales": 50, "lag_7": 45}, {"sales": 5000, "lag_7": 10}, {"sales": 40, "lag_7": 38},
+        {"sales": "abc", "lag_7": 1}, {"sales": 6000, "lag_7": 5}]
+
+@pytest.fixture
+def stream(client, artifacts, monkeypatch):
+    monkeypatch.setattr(settings, "ANOMALY_STREAM_CHUNK_SIZE", 2)
+    # Random-init autoencoder: pin the threshold so only the x100 rows are CRITICAL
+    assert watchdog.loader.ensure()
+    monkeypatch.setattr(watchdog, "critical_error", 100.0)
+
+    def post(body: str, filename: str = "tx.ndjson", **params):
+        return client.post("/api/monitor/check/stream", params=params, files={"file": (filename, body.encode())})
+    return post
+
+def _lines(response) -> list:
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+def test_ndjson_upload_streams_one_result_per_row(stream):
+    results = _lines(stream("\n".join(json.dumps(r) for r in ROWS)))
+    assert [r["row"] for r in results] == list(range(len(ROWS)))
+    assert results[1]["status"] == "CRITICAL" and results[3]["status"] == "ERROR"
+
+def test_csv_upload_with_only_critical(stream):
+    body = "sales,lag_7\n" + "\n".join(f"{s},{l}" for s, l in [(50, 45), (5000, 10), (40, 38), (45, 40), (6000, 5)])
+    results = _lines(stream(body, filename="tx.csv", only_critical="true"))
+    assert [r["row"] for r in results] == [1, 4]
+
+def test_every_chunk_is_a_job_on_the_monitor_executor(stream):
+    executor = get_executor("monitor")
+    completed = executor.completed
+    assert len(_lines(stream("\n".join(json.dumps(r) for r in ROWS), only_critical="true"))) == 2
+    # 3 chunks of at most 2 rows, plus the step that finds the input exhausted
+    assert executor.completed == completed + 4
+
+def test_saturated_executor_rejects_the_upload(stream, monkeypatch):
+    executor = get_executor("monitor")
+    monkeypatch.setattr(executor, "pending", executor.max_pending)
+    response = stream(json.dumps(ROWS[0]))
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+def test_saturation_mid_stream_ends_with_an_error_line(stream, monkeypatch):
+    executor = get_executor("monitor")
+    run, calls = executor.run, []
+
+    async def run_once(fn, *args, **kwargs):
+        calls.append(fn)
+        if len(calls) > 1:
+            raise EngineSaturated(executor.name)
+        return await run(fn, *args, **kwargs)
+    monkeypatch.setattr(executor, "run", run_once)
+
+    results = _lines(stream("\n".join(json.dumps(r) for r in ROWS)))
+    assert [r["row"] for r in results[:-1]] == [0, 1]
+    assert results[-1]["status"] == "ERROR" and "saturated" in results[-1]["error"]
@@ -0,0 +1,53 @@
+#fashion-retail-backend/tests/test_batching.py
+import asyncio
+import pytest
+from app.core.batching import MicroBatcher
+from app.core.executor import EngineExecutor
+
+def test_concurrent_submits_are_batched_and_answered_in_order():
+    executor = EngineExecutor("test-batch", max_workers=1, max_pending=8)
+    sizes = []
+
+    def double(items):
+        sizes.append(len(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(double, executor, max_batch_size=8, max_wait_ms=20)
+
+    async def main():
+        try:
+            return await asyncio.gather(*(batcher.submit(i) for i in range(20)))
+        finally:
+            await batcher.close()
+
+    assert asyncio.run(main()) == [i * 2 for i in range(20)]
+    assert sum(sizes) == 20
+    assert max(sizes) <= 8 and len(sizes) < 20
+    assert batcher.stats()["items"] == 20
+    executor.shutdown()
+
+def test_batch_failure_reaches_every_caller():
+    executor = EngineExecutor("test-batch-error", max_workers=1, max_pending=4)
+
+    def fail(items):
+        raise RuntimeError("model crashed")
+
+    batcher = MicroBatcher(fail, executor, max_batch_size=4, max_wait_ms=5)
+
+    async def main():
+        try:
+            return await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+        finally:
+            await batcher.close()
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    executor.shutdown()
+
+def test_batcher_restarts_on_a_new_event_loop():
+    executor = EngineExecutor("test-batch-loops", max_workers=1, max_pending=4)
+    batcher = MicroBatcher(lambda items: [i + 1 for i in items], executor, max_batch_size=4, max_wait_ms=1)
+    # Each asyncio.run() is a new loop; the collector must not be bound to the old one
+    assert asyncio.run(batcher.submit(1)) == 2
+    assert asyncio.run(batcher.submit(2)) == 3
+    executor.shutdown()
@@ -0,0 +1,44 @@
+def _ask(text: str) -> list:
+    return [{"role": "user", "content": text}]
+
+def test_stub_reply_lists_retrieved_items_and_is_cached(chat):
+    messages = _ask("grey hoodie for men")
+    cards = chat.retrieve(messages)["cards"]
+    reply = chat.generate_response(messages)
+    assert all(card["article_id"] in reply for card in cards)
+
+    hits = chat.responses.stats()["exact_hits"]
+    assert chat.generate_response(_ask("Grey  hoodie for men!")) == reply
+    assert chat.responses.stats()["exact_hits"] == hits + 1
+
+def test_different_filters_never_share_a_reply(chat):
+    misses = chat.responses.stats()["misses"]
+    chat.generate_response(_ask("black dress under $30"))
+    chat.generate_response(_ask("black dress under $50"))
+    assert chat.responses.stats()["misses"] == misses + 2
+    assert len(chat.responses.responses) == 2
+
+def _no_retrieval(*args, **kwargs):
+    raise AssertionError("retrieval ran for a cached query")
+
+def test_exact_hit_skips_embedding_and_search(chat, monkeypatch):
+    messages = _ask("grey hoodie for men")
+    first = chat.retrieve(messages)
+    reply = chat.generate_response(messages)
+
+    monkeypatch.setattr(chat, "embed_query", _no_retrieval)
+    monkeypatch.setattr(chat, "hybrid_search", _no_retrieval)
+    cached = chat.retrieve(_ask("Grey hoodie, for men"))
+    assert cached["reply"] == reply
+    assert cached["cards"] == first["cards"] and cached["filters"] == first["filters"]
+
+def test_semantic_hit_skips_search(chat, monkeypatch):
+    monkeypatch.setattr(chat.responses, "semantic", True)
+    monkeypatch.setattr(chat.responses, "threshold", -1.0)  # any query with the same filters is a neighbour
+    reply = chat.generate_response(_ask("grey hoodie for men"))
+
+    monkeypatch.setattr(chat, "hybrid_search", _no_retrieval)
+    hits = chat.responses.stats()["semantic_hits"]
+    cached = chat.retrieve(_ask("something cosy in grey for men"))
+    assert cached["reply"] == reply and cached["cards"]
+    assert chat.responses.stats()["semantic_hits"] == hits + 1
@@ -0,0 +1,27 @@
+import numpy as np
+from app.config import settings
+from app.services.context_snippets import estimate_tokens, select_within_budget
+
+def test_budget_keeps_ranked_rows_that_fit_and_always_the_top_one():
+    tokens = np.array([50, 30, 40, 10, 200])
+    assert select_within_budget([0, 1, 2, 3], tokens, budget=90) == [0, 1, 3]
+    assert select_within_budget([4, 0], tokens, budget=90) == [4]
+
+def test_snippets_are_rendered_once_per_catalog_row(chat):
+    assert len(chat.snippets) == len(chat.df)
+    assert chat.snippets[0].startswith(f"- Item ID: {chat.df['article_id'].iat[0]:010d}\n- Name: ")
+    np.testing.assert_array_equal(chat.snippet_tokens, estimate_tokens(chat.snippets))
+    assert all(len(s.split("- Description: ")[1]) <= settings.CHAT_SNIPPET_DESC_CHARS + 1 for s in chat.snippets)
+
+def test_prompt_holds_exactly_the_carded_items_within_budget(chat, monkeypatch):
+    messages = [{"role": "user", "content": "cotton dress"}]
+    full = chat.retrieve(messages)
+    assert len(full["cards"]) > 1
+
+    monkeypatch.setattr(settings, "CHAT_CONTEXT_TOKEN_BUDGET", int(chat.snippet_tokens.max()) + 1)
+    tight = chat.retrieve(messages)
+    assert 1 <= len(tight["cards"]) < len(full["cards"])
+    assert tight["cards"][0] == full["cards"][0]
+    for prepared in (full, tight):
+        listed = [line.split(": ")[1] for line in prepared["system_prompt"].splitlines() if line.startswith("- Item ID: ")]
+        assert listed == [card["article_id"] for card in prepared["cards"]]
@@ -0,0 +1,37 @@
+from app.config import settings
+
+def _ask(text: str) -> list:
+    return [{"role": "user", "content": text}]
+
+def test_filters_are_extracted_from_the_query(chat):
+    assert chat.extract_filters("black dress under $60 for a lady") == {"max_price": 60.0, "color": "black", "gender": "Ladieswear"}
+    assert chat.extract_filters("something nice") == {}
+
+def test_retrieved_items_satisfy_the_filters(chat):
+    prepared = chat.retrieve(_ask("black dress under $60"))
+    assert prepared["filters"] == {"max_price": 60.0, "color": "black"}
+    assert 0 < len(prepared["cards"]) <= settings.CHAT_TOP_K
+    for card in prepared["cards"]:
+        assert card["colour_group_name"] == "Black"
+        assert card["price"] <= 60
+
+def test_filtered_search_is_the_exact_top_k_of_the_matching_rows(chat):
+    query_vec = chat.embed_query("warm jacket")
+    rows = set(chat.filter_rows({"color": "grey"}).tolist())
+    assert len(rows) > 3
+    # Brute force: rank the whole catalog, then keep the matching rows
+    _, ranked = chat.index.search(query_vec, chat.index.ntotal)
+    expected = [i for i in ranked[0] if i in rows][:3]
+    assert chat.filtered_search(query_vec, {"color": "grey"}, k=3) == expected
+
+def test_filter_matching_fewer_rows_than_k_returns_all_of_them(chat):
+    filters = {"color": "grey", "gender": "Menswear"}
+    rows = chat.filter_rows(filters).tolist()
+    assert 0 < len(rows) < 5
+    assert sorted(chat.filtered_search(chat.embed_query("warm jacket"), filters, k=5)) == sorted(rows)
+
+def test_unmatched_filters_fall_back_to_closest_items(chat):
+    assert chat.filtered_search(chat.embed_query("dress"), {"max_price": 1.0}, k=5) == []
+    prepared = chat.retrieve(_ask("black dress under $1"))
+    assert prepared["cards"]
+    assert "couldn't find exact matches" in prepared["system_prompt"]
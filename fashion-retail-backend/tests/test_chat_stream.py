@@ -0,0 +1,31 @@
+import asyncio
+import json
+
+def _ask(text: str) -> list:
+    return [{"role": "user", "content": text}]
+
+def test_stream_sends_items_then_tokens_then_done(chat):
+    async def collect():
+        prepared = chat.retrieve(_ask("white t-shirt for a lady"))
+        return [event async for event in chat.astream_events(prepared)]
+
+    events = asyncio.run(collect())
+    assert events[0]["type"] == "items" and events[0]["items"]
+    assert {e["type"] for e in events[1:-1]} == {"token"}
+    assert events[-1]["type"] == "done" and not events[-1]["cached"]
+    assert "".join(e["text"] for e in events if e["type"] == "token") == events[-1]["reply"]
+
+def test_ndjson_endpoint_replays_a_cached_reply(client, chat):
+    body = {"messages": _ask("denim jeans")}
+    first = [json.loads(line) for line in client.post("/api/chat/stream", json=body).text.splitlines()]
+    second = [json.loads(line) for line in client.post("/api/chat/stream", json=body).text.splitlines()]
+    assert first[-1]["type"] == second[-1]["type"] == "done"
+    assert second[-1]["cached"] and second[-1]["reply"] == first[-1]["reply"]
+    assert second[0]["items"] == first[0]["items"]
+
+def test_sse_endpoint_frames_events(client, chat):
+    response = client.post("/api/chat/stream?format=sse", json={"messages": _ask("red skirt")})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    blocks = [b for b in response.text.split("\n\n") if b]
+    assert blocks[0].startswith("event: items\ndata: ")
+    assert blocks[-1].startswith("event: done\n")
@@ -0,0 +1,32 @@
+#fashion-retail-backend/tests/test_config.py
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _settings_in_subprocess(**env) -> list:
+    # Settings are read once at import, so each case needs a fresh interpreter
+    probe = "from app.config import settings as s; print(s.ENABLED_ENGINES); print(s.WARMUP_ENGINES)"
+    proc = subprocess.run([sys.executable, "-c", probe], cwd=BACKEND_DIR, capture_output=True, text=True,
+                          env={k: v for k, v in {**os.environ, **env}.items() if v is not None})
+    assert proc.returncode == 0, proc.stderr
+    return proc.stdout.strip().splitlines()
+
+def test_engine_lists_default_to_every_engine():
+    enabled, warmup = _settings_in_subprocess(ENABLED_ENGINES=None, WARMUP_ENGINES=None)
+    assert enabled == str(["forecast", "recommend", "monitor", "chat"])
+    assert warmup == enabled
+
+def test_warmup_is_restricted_to_enabled_engines():
+    enabled, warmup = _settings_in_subprocess(ENABLED_ENGINES="monitor, chat,bogus", WARMUP_ENGINES="chat,forecast")
+    assert enabled == str(["monitor", "chat"])
+    assert warmup == str(["chat"])
+
+def test_app_imports_without_the_heavy_model_libraries():
+    probe = ("import sys, app.main; "
+             "print(sorted(m for m in ('torch', 'pytorch_forecasting', 'sentence_transformers', 'clip', 'faiss') if m in sys.modules))")
+    proc = subprocess.run([sys.executable, "-c", probe], cwd=BACKEND_DIR, capture_output=True, text=True,
+                          env={**os.environ, "ENABLED_ENGINES": "forecast,recommend,monitor,chat", "CHAT_LLM_BACKEND": "stub"})
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip().splitlines()[-1] == "[]"
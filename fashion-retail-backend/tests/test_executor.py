@@ -0,0 +1,60 @@
+#fashion-retail-backend/tests/test_executor.py
+import asyncio
+import threading
+import time
+import pytest
+from app.core.executor import EngineExecutor, EngineSaturated, executors
+from app.services.anomaly_service import watchdog
+
+def _wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+def test_cancelled_request_keeps_its_slot_until_the_job_finishes():
+    executor = EngineExecutor("test-cancel", max_workers=1, max_pending=1)
+    started, release = threading.Event(), threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait(5)
+
+    async def main():
+        task = asyncio.create_task(executor.run(blocking))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The worker thread is still busy: the slot must not be handed out again
+        assert executor.pending == 1
+        with pytest.raises(EngineSaturated):
+            await executor.run(len, [])
+
+    asyncio.run(main())
+    release.set()
+    _wait_for(lambda: executor.pending == 0)
+    assert executor.stats()["completed"] == 1 and executor.stats()["rejected"] == 1
+    executor.shutdown()
+
+def test_requests_beyond_max_pending_get_503(client, monkeypatch):
+    executor = EngineExecutor("monitor", max_workers=1, max_pending=1)
+    monkeypatch.setitem(executors, "monitor", executor)
+    release = threading.Event()
+    monkeypatch.setattr(watchdog, "detect", lambda rows: release.wait(5) and [])
+
+    body = [{"sales": 50, "lag_7": 45}]
+    first = threading.Thread(target=client.post, args=("/api/monitor/check",), kwargs={"json": body})
+    first.start()
+    try:
+        _wait_for(lambda: executor.pending == 1)
+        response = client.post("/api/monitor/check", json=body)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert "saturated" in response.json()["detail"]
+    finally:
+        release.set()
+        first.join(5)
+    _wait_for(lambda: executor.pending == 0)
+    assert client.post("/api/monitor/check", json=body).status_code == 200
+    executor.shutdown()
@@ -0,0 +1,33 @@
+import numpy as np
+
+def _values(result: dict) -> list:
+    return [entry["prediction"] for entry in result["forecast"]]
+
+def test_results_follow_request_order_with_duplicates_and_unknown_ids(forecast_engine):
+    ids = [str(i) for i in forecast_engine.history.article_ids[:3]]
+    results = forecast_engine.predict_many([ids[2], "999", ids[0], ids[2]])
+    assert [r["item_id"] for r in results] == [ids[2], "999", ids[0], ids[2]]
+    assert results[1]["error"] == "Item not found"
+    assert results[0] is results[3]
+    assert len(results[0]["forecast"]) == 28 and len(results[0]["history"]) == 60
+
+def test_batch_size_does_not_change_the_forecasts(forecast_engine):
+    ids = [str(i) for i in forecast_engine.history.article_ids[:5]]
+    one_pass = forecast_engine.predict_many(ids, batch_size=64)
+    forecast_engine.cache.clear()
+    small_batches = forecast_engine.predict_many(ids, batch_size=2)
+    for a, b in zip(one_pass, small_batches):
+        np.testing.assert_allclose(_values(a), _values(b), rtol=1e-5, atol=1e-5)
+
+def test_batch_endpoint(client, forecast_engine):
+    ids = [str(i) for i in forecast_engine.history.article_ids[:2]]
+    response = client.post("/api/forecast/batch", json={"item_ids": ids, "batch_size": 8})
+    assert response.status_code == 200
+    assert [r["item_id"] for r in response.json()["results"]] == ids
+
+def test_batch_endpoint_rejects_bad_requests(client, forecast_engine):
+    item = str(forecast_engine.history.article_ids[0])
+    for batch_size in (0, -4):
+        response = client.post("/api/forecast/batch", json={"item_ids": [item], "batch_size": batch_size})
+        assert response.status_code == 422
+    assert client.post("/api/forecast/batch", json={"item_ids": []}).status_code == 400
@@ -0,0 +1,43 @@
+def _ids(engine, n: int) -> list:
+    return [str(i) for i in engine.history.article_ids[:n]]
+
+def test_repeated_forecast_is_served_from_the_cache(forecast_engine):
+    item = _ids(forecast_engine, 1)[0]
+    first = forecast_engine.predict(item)
+    hits = forecast_engine.cache.hits
+    assert forecast_engine.predict(item) is first
+    assert forecast_engine.cache.hits == hits + 1
+
+def test_new_checkpoint_or_history_version_misses(forecast_engine):
+    item = _ids(forecast_engine, 1)[0]
+    first = forecast_engine.predict(item)
+
+    forecast_engine.model_version = "retrained"
+    assert forecast_engine.predict(item) is not first
+
+    forecast_engine.history.version = "reloaded"
+    misses = forecast_engine.cache.misses
+    forecast_engine.predict(item)
+    assert forecast_engine.cache.misses == misses + 1
+
+def test_loading_a_new_history_clears_the_cache(forecast_engine):
+    forecast_engine.predict_many(_ids(forecast_engine, 3))
+    assert len(forecast_engine.cache) == 3
+    forecast_engine.load_history(forecast_engine.history)
+    assert len(forecast_engine.cache) == 0
+
+def test_quantile_requests_bypass_the_cache(forecast_engine):
+    item = _ids(forecast_engine, 1)[0]
+    result = forecast_engine.predict_many([item], with_quantiles=True)[0]
+    assert "quantiles" in result["forecast"][0]
+    assert len(forecast_engine.cache) == 0
+
+def test_admin_endpoints_warm_report_and_invalidate(client, forecast_engine):
+    ids = _ids(forecast_engine, 3)
+    assert client.post("/api/forecast/cache/warm", json={"item_ids": ids + ["999"]}).json() == {
+        "requested": 4, "warmed": 3, "failed": 1}
+    assert client.get("/api/forecast/cache").json()["size"] == 3
+
+    assert client.post("/api/forecast/cache/invalidate", json={"item_ids": ids[:1]}).json() == {"invalidated": 1}
+    assert client.post("/api/forecast/cache/invalidate", json={}).json() == {"invalidated": 2}
+    assert client.post("/api/forecast/cache/warm", json={}).status_code == 400
@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+from app.config import settings
+
+STORED = 7.0
+
+@pytest.fixture
+def store_engine(forecast_engine, write_store, monkeypatch):
+    """Forecaster in store mode with the first four articles precomputed; refresh_store() checks on every call."""
+    monkeypatch.setattr(settings, "FORECAST_STORE_CHECK_SECONDS", 1e-9)
+    ids = [str(i) for i in forecast_engine.history.article_ids[:4]]
+    forecast_engine.load_store(write_store(forecast_engine, ids, value=STORED))
+    return forecast_engine, ids
+
+def _modes(engine, ids) -> list:
+    return ["store" if all(e["prediction"] == STORED for e in r["forecast"]) else "live" for r in engine.predict_many(ids)]
+
+def _day(engine, offset: int) -> pd.Timestamp:
+    return engine.history.start_date + pd.Timedelta(days=engine.history.n_days - 1 + offset)
+
+def test_corrections_keep_the_store_for_untouched_articles(store_engine):
+    engine, ids = store_engine
+    summary = engine.ingest(pd.DataFrame({"t_dat": [_day(engine, -3)], "article_id": [ids[0]], "sales": [99.0]}))
+    assert summary["days_added"] == 0 and summary["updated_articles"] == 1
+
+    assert _modes(engine, ids) == ["live", "store", "store", "store"]
+    assert len(engine.store) == 3
+    assert not engine.refresh_store()
+
+def test_new_days_drop_the_store_until_the_nightly_job_catches_up(store_engine, write_store):
+    engine, ids = store_engine
+    engine.ingest(pd.DataFrame({"t_dat": [_day(engine, 1)], "article_id": [ids[0]], "sales": [3.0]}))
+    assert engine.store is None
+    assert _modes(engine, ids) == ["live"] * 4
+
+    write_store(engine, ids[:2], value=STORED)
+    engine.cache.clear()  # the live answers above are cached and still valid
+    assert _modes(engine, ids) == ["store", "store", "live", "live"]
@@ -0,0 +1,33 @@
+from app.config import settings
+
+STORED = 7.0
+
+def _ids(engine, n: int) -> list:
+    return [str(i) for i in engine.history.article_ids[:n]]
+
+def _mode(result: dict) -> str:
+    return "store" if all(e["prediction"] == STORED for e in result["forecast"]) else "live"
+
+def test_store_hits_are_served_and_misses_fall_back_to_live(forecast_engine, write_store):
+    ids = _ids(forecast_engine, 4)
+    forecast_engine.load_store(write_store(forecast_engine, ids[:2]))
+    assert len(forecast_engine.store) == 2
+
+    results = forecast_engine.predict_many(ids)
+    assert [_mode(r) for r in results] == ["store", "store", "live", "live"]
+    assert all(len(r["forecast"]) == 28 and r["history"] for r in results)
+
+def test_rows_of_another_history_version_are_skipped(forecast_engine, write_store):
+    ids = _ids(forecast_engine, 1)
+    forecast_engine.load_store(write_store(forecast_engine, ids, history_version="older"))
+    assert len(forecast_engine.store) == 0
+    assert _mode(forecast_engine.predict(ids[0])) == "live"
+
+def test_live_mode_and_quantile_requests_ignore_the_store(forecast_engine, write_store, monkeypatch):
+    ids = _ids(forecast_engine, 1)
+    forecast_engine.load_store(write_store(forecast_engine, ids))
+    result = forecast_engine.predict_many(ids, with_quantiles=True)[0]
+    assert _mode(result) == "live" and "quantiles" in result["forecast"][0]
+
+    monkeypatch.setattr(settings, "FORECAST_SERVE_MODE", "live")
+    assert _mode(forecast_engine.predict(ids[0])) == "live"
@@ -0,0 +1,110 @@
+#fashion-retail-backend/tests/test_history_append.py
+import glob
+import os
+import shutil
+import numpy as np
+import pandas as pd
+import pytest
+from app.jobs import export_shared_artifacts
+from app.services.feature_pipeline import (append_history, artifact_path, build_history_features, load_metadata,
+                                           load_or_build_history, persist_history)
+from app.services.history_store import FEATURE_COLS, HistoryStore
+
+@pytest.fixture(scope="module")
+def source(artifacts):
+    transactions = pd.read_parquet(artifacts.DATA_PATH)
+    return transactions, load_metadata(artifacts.ARTICLES_PATH), sorted(transactions['t_dat'].unique())
+
+def _assert_same_features(store: HistoryStore, full: HistoryStore):
+    assert store.n_days == full.n_days
+    rows = [full.positions[a] for a in store.article_ids]
+    for col in FEATURE_COLS:
+        np.testing.assert_allclose(store.features[col], full.features[col][rows], atol=1e-4, err_msg=col)
+
+def test_daily_appends_match_a_full_rebuild(source):
+    transactions, metadata, days = source
+    store = build_history_features(transactions[transactions['t_dat'] < days[60]], metadata)
+    for day in days[60:]:
+        summary = append_history(store, transactions[transactions['t_dat'] == day])
+        assert summary["days_added"] == 1
+    _assert_same_features(store, build_history_features(transactions, metadata))
+
+def test_corrections_recompute_the_tail_of_affected_articles_only(source):
+    transactions, metadata, days = source
+    store = build_history_features(transactions, metadata)
+    correction = transactions[transactions['t_dat'] == days[40]].head(3).assign(sales=lambda f: f['sales'] + 5)
+    untouched = store.features['sales_lag_7'][3:].copy()
+
+    summary = append_history(store, correction)
+    assert summary["days_added"] == 0
+    assert summary["corrected_rows"] == 3
+    assert sorted(summary["updated_ids"]) == sorted(correction['article_id'].astype(str))
+
+    key = lambda f: pd.MultiIndex.from_frame(f[['t_dat', 'article_id']])
+    corrected = pd.concat([transactions[~key(transactions).isin(key(correction))], correction])
+    _assert_same_features(store, build_history_features(corrected, metadata))
+    np.testing.assert_array_equal(store.features['sales_lag_7'][3:], untouched)
+
+def test_raw_transactions_are_counted_and_gaps_filled(source):
+    transactions, metadata, days = source
+    store = build_history_features(transactions, metadata)
+    article = store.article_ids[0]
+    gap_day = pd.Timestamp(days[-1]) + pd.Timedelta(days=3)
+    raw = pd.DataFrame({"t_dat": [gap_day] * 4, "article_id": [article] * 4})
+
+    summary = append_history(store, raw)
+    assert summary["days_added"] == 3
+    assert store.features['sales'][store.positions[article], -3:].tolist() == [0.0, 0.0, 4.0]
+
+def test_unknown_articles_and_days_before_the_history_are_skipped(source):
+    transactions, metadata, days = source
+    store = build_history_features(transactions, metadata)
+    version = store.version
+    batch = pd.DataFrame({
+        "t_dat": [days[-1], pd.Timestamp(days[0]) - pd.Timedelta(days=1)],
+        "article_id": ["999", store.article_ids[0]],
+        "sales": [1.0, 1.0],
+    })
+    summary = append_history(store, batch)
+    assert summary["unknown_articles"] == 1
+    assert summary["rows_before_history"] == 1
+    assert store.version == version
+
+def test_appends_to_a_memory_mapped_store_leave_the_files_untouched(source, tmp_path):
+    transactions, metadata, days = source
+    build_history_features(transactions[transactions['t_dat'] < days[-1]], metadata).save_arrays(str(tmp_path / "h"))
+    mapped = HistoryStore.load_arrays(str(tmp_path / "h"), version="v0")
+    on_disk = np.load(tmp_path / "h.sales.npy").copy()
+
+    append_history(mapped, transactions[transactions['t_dat'] == days[-1]])
+    assert mapped.n_days == len(days)
+    np.testing.assert_array_equal(np.load(tmp_path / "h.sales.npy"), on_disk)
+
+def test_version_is_deterministic_per_batch(source):
+    transactions, metadata, days = source
+    base = transactions[transactions['t_dat'] < days[-1]]
+    batch = transactions[transactions['t_dat'] == days[-1]]
+    first, second = (build_history_features(base, metadata, version="base") for _ in range(2))
+    assert append_history(first, batch)["version"] == append_history(second, batch)["version"] != "base"
+
+def test_exporting_shared_arrays_keeps_ingested_days(source, artifacts, tmp_path, monkeypatch):
+    transactions, _, days = source
+    data_path, articles_path = str(tmp_path / "transactions.parquet"), str(tmp_path / "articles.csv")
+    transactions[transactions['t_dat'] < days[-1]].to_parquet(data_path, index=False)
+    shutil.copy(artifacts.ARTICLES_PATH, articles_path)
+    for name, value in {"DATA_PATH": data_path, "ARTICLES_PATH": articles_path,
+                        "ARTICLES_ARROW_PATH": str(tmp_path / "articles.arrow"), "IDS_PATH": str(tmp_path / "none.pkl")}.items():
+        monkeypatch.setattr(artifacts, name, value)
+
+    store = load_or_build_history(data_path, articles_path)
+    append_history(store, transactions[transactions['t_dat'] == days[-1]])
+    persist_history(store, data_path, articles_path)
+    prefix = os.path.splitext(artifact_path(data_path))[0]
+    for path in glob.glob(prefix + ".*.npy") + [prefix + ".static.parquet"]:
+        os.remove(path)
+
+    export_shared_artifacts.main()
+    exported = HistoryStore.load_arrays(prefix)
+    assert exported.n_days == len(days)
+    np.testing.assert_array_equal(exported.features['sales'], store.features['sales'])
+    assert load_or_build_history(data_path, articles_path).n_days == len(days)
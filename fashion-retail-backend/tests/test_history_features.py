@@ -0,0 +1,52 @@
+import os
+import shutil
+import numpy as np
+import pandas as pd
+import pytest
+from app.services.feature_pipeline import artifact_path, build_history_features, load_metadata, load_or_build_history
+
+@pytest.fixture(scope="module")
+def sparse(artifacts):
+    # Drop a third of the rows so the pivot has to fill missing days with zero sales
+    transactions = pd.read_parquet(artifacts.DATA_PATH)
+    return transactions.sample(frac=0.66, random_state=0), load_metadata(artifacts.ARTICLES_PATH)
+
+def _reference(transactions: pd.DataFrame) -> pd.DataFrame:
+    """The per-article groupby/shift/rolling formulation the matrix build replaces."""
+    days = pd.date_range(transactions['t_dat'].min(), transactions['t_dat'].max(), freq='D')
+    full = (transactions.assign(article_id=transactions['article_id'].astype(str))
+            .set_index(['article_id', 't_dat'])['sales']
+            .unstack(fill_value=0.0).reindex(columns=days, fill_value=0.0)
+            .stack().rename('sales').reset_index())
+    grouped = full.groupby('article_id')['sales']
+    full['sales_lag_7'] = grouped.shift(7).fillna(0.0)
+    full['sales_lag_28'] = grouped.shift(28).fillna(0.0)
+    full['sales_rolling_mean_7'] = grouped.transform(lambda s: s.rolling(7, min_periods=1).mean())
+    return full
+
+def test_matrix_features_match_the_groupby_formulation(sparse):
+    transactions, metadata = sparse
+    store = build_history_features(transactions, metadata)
+    reference = _reference(transactions)
+    for article_id, expected in reference.groupby('article_id'):
+        row = store.positions[article_id]
+        for col in ('sales', 'sales_lag_7', 'sales_lag_28', 'sales_rolling_mean_7'):
+            np.testing.assert_allclose(store.features[col][row], expected[col].to_numpy(), atol=1e-4, err_msg=col)
+
+def test_artifact_is_reused_until_the_source_changes(artifacts, tmp_path):
+    data_path = str(tmp_path / "transactions.parquet")
+    articles_path = str(tmp_path / "articles.csv")
+    shutil.copy(artifacts.DATA_PATH, data_path)
+    shutil.copy(artifacts.ARTICLES_PATH, articles_path)
+
+    built = load_or_build_history(data_path, articles_path)
+    assert os.path.exists(artifact_path(data_path))
+    cached = load_or_build_history(data_path, articles_path)
+    assert cached.version == built.version
+    np.testing.assert_array_equal(cached.features['sales_rolling_mean_7'], built.features['sales_rolling_mean_7'])
+
+    source = pd.read_parquet(data_path)
+    source[source['t_dat'] < source['t_dat'].max()].to_parquet(data_path, index=False)
+    rebuilt = load_or_build_history(data_path, articles_path)
+    assert rebuilt.version != built.version
+    assert rebuilt.n_days == built.n_days - 1
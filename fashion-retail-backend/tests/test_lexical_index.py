@@ -0,0 +1,45 @@
+#fashion-retail-backend/tests/test_lexical_index.py
+import numpy as np
+from app.services.lexical_index import BM25Index, reciprocal_rank_fusion, tokenize
+
+DOCS = [
+    "black cotton dress with a relaxed fit",
+    "blue denim jeans",
+    "black wool sweater",
+    "white linen shirt",
+    "black denim jacket",
+]
+
+def _index():
+    return BM25Index.build([tokenize(d) for d in DOCS])
+
+def test_ranks_documents_matching_more_terms_first():
+    results = _index().search("black dress", k=5)
+    assert results[0] == 0
+    assert set(results) == {0, 2, 4}
+
+def test_unknown_terms_return_nothing():
+    assert _index().search("purple sandals", k=5) == []
+
+def test_mask_restricts_results():
+    mask = np.array([False, True, True, True, True])
+    results = _index().search("black denim", k=5, mask=mask)
+    assert 0 not in results
+    assert results[0] == 4
+
+def test_top_k_is_truncated():
+    assert len(_index().search("black", k=2)) == 2
+
+def test_save_and_load_roundtrip(tmp_path):
+    index = _index()
+    path = str(tmp_path / "bm25.npz")
+    index.save(path)
+    loaded = BM25Index.load(path)
+    assert loaded.n_docs == index.n_docs
+    for query in ("black dress", "denim", "linen shirt"):
+        assert loaded.search(query, k=5) == index.search(query, k=5)
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([[1, 2, 3], [3, 1, 4]], k=3)
+    assert fused[0] == 1
+    assert set(fused) <= {1, 2, 3, 4} and len(fused) == 3
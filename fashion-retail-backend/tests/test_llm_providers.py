@@ -0,0 +1,55 @@
+#fashion-retail-backend/tests/test_llm_providers.py
+import asyncio
+import threading
+import pytest
+from app.core.executor import EngineSaturated
+from app.services.llm_providers import LLMProvider
+
+class BlockingProvider(LLMProvider):
+    """Holds its concurrency slot until `release` is set, on either path."""
+    name = "blocking"
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.started, self.release = threading.Event(), threading.Event()
+
+    def _complete(self, messages: list) -> str:
+        self.started.set()
+        self.release.wait(5)
+        return "sync"
+
+    async def _acomplete(self, messages: list) -> str:
+        self.started.set()
+        for _ in range(500):
+            if self.release.is_set():
+                break
+            await asyncio.sleep(0.01)
+        return "async"
+
+@pytest.fixture
+def provider():
+    provider = BlockingProvider(max_concurrency=1, queue_timeout=0.1)
+    yield provider
+    provider.release.set()
+
+def test_async_calls_wait_on_the_slots_held_by_sync_calls(provider):
+    sync_call = threading.Thread(target=provider.complete, args=([],))
+    sync_call.start()
+    assert provider.started.wait(5)
+    with pytest.raises(EngineSaturated):
+        asyncio.run(provider.acomplete([]))
+    provider.release.set()
+    sync_call.join(5)
+    assert asyncio.run(provider.acomplete([])) == "async"
+
+def test_sync_calls_wait_on_the_slots_held_by_async_calls(provider):
+    async def main():
+        call = asyncio.create_task(provider.acomplete([]))
+        await asyncio.get_running_loop().run_in_executor(None, provider.started.wait, 5)
+        with pytest.raises(EngineSaturated):
+            await asyncio.get_running_loop().run_in_executor(None, provider.complete, [])
+        provider.release.set()
+        return await call
+
+    assert asyncio.run(main()) == "async"
+    assert provider.complete([]) == "sync"
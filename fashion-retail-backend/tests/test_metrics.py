@@ -0,0 +1,37 @@
+from app.core.metrics import MetricsRegistry
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("demo_seconds", "Demo.", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        latency.observe(value, stage="embed")
+    text = registry.render()
+    assert 'demo_seconds_bucket{stage="embed",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{stage="embed",le="1.0"} 3' in text
+    assert 'demo_seconds_bucket{stage="embed",le="+Inf"} 4' in text
+    assert 'demo_seconds_count{stage="embed"} 4' in text
+
+def test_collectors_are_read_at_scrape_time_and_failures_are_skipped():
+    registry = MetricsRegistry()
+    state = {"size": 1}
+    registry.register_collector(lambda: [("demo_size", "gauge", "Demo.", [({"cache": "x"}, state["size"])])])
+    registry.register_collector(lambda: 1 / 0)
+    state["size"] = 5
+    assert 'demo_size{cache="x"} 5' in registry.render()
+
+def test_requests_are_counted_by_route_template(client, forecast_engine):
+    item = str(forecast_engine.history.article_ids[0])
+    client.get(f"/api/forecast/{item}")
+    text = client.get("/metrics").text
+    assert 'fris_http_requests_total{method="GET",route="/api/forecast/{item_id}",status="200"}' in text
+    assert item not in text
+    assert 'fris_stage_seconds_count{engine="forecast",stage="forward"}' in text
+    assert 'fris_cache_size{cache="forecast"}' in text
+    assert 'fris_executor_completed_total{engine="forecast"}' in text
+
+def test_profile_header_returns_stage_timings(client, forecast_engine):
+    item = str(forecast_engine.history.article_ids[1])
+    timing = client.get(f"/api/forecast/{item}", headers={"X-Profile": "1"}).headers["Server-Timing"]
+    stages = [part.split(";")[0] for part in timing.split(", ")]
+    assert {"forecast.lookup", "forecast.forward", "total"} <= set(stages)
+    assert "Server-Timing" not in client.get(f"/api/forecast/{item}").headers
@@ -0,0 +1,20 @@
+#fashion-retail-backend/tests/test_recommend_hits.py
+import numpy as np
+import pytest
+from app.services.catalog_service import catalog
+from app.services.recommendation_service import ENRICH_COLUMNS, recommender
+
+@pytest.fixture
+def hits(artifacts, monkeypatch):
+    catalog.load()
+    known = catalog.df["article_id"].tolist()[:3]
+    monkeypatch.setattr(recommender, "article_ids", np.array(known + [1], dtype=np.int64))
+    return known
+
+def test_hits_are_enriched_from_the_catalog_in_rank_order(hits):
+    results = recommender._format_hits(np.array([0.9, 0.8, 0.7, 0.6, 0.5]), np.array([2, 3, 0, -1, 7]))
+    assert [r["article_id"] for r in results] == [catalog.format_id(hits[2]), "0000000001", catalog.format_id(hits[0])]
+    row = catalog.rows([hits[2]])[0]
+    assert {col: results[0][col] for col in ENRICH_COLUMNS} == {col: str(catalog.df[col].iat[row]) for col in ENRICH_COLUMNS}
+    # Unknown ids keep their score but get no catalog fields
+    assert results[1]["score"] == 0.8 and not set(ENRICH_COLUMNS) & set(results[1])
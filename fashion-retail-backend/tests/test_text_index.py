@@ -0,0 +1,67 @@
+import os
+import numpy as np
+import pytest
+from app.config import settings
+from app.services.text_index import build_text_index
+from benchmarks.fixtures import HashingEncoder
+
+class CountingEncoder(HashingEncoder):
+    def __init__(self):
+        super().__init__(dims=16)
+        self.encoded = 0
+
+    def encode(self, texts, **kwargs):
+        self.encoded += len(texts)
+        return super().encode(texts, **kwargs)
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CHAT_INDEX_DIR", str(tmp_path))
+    return tmp_path
+
+IDS = [str(i) for i in range(100, 140)]
+TEXTS = [f"article {i} in cotton" for i in range(40)]
+
+def test_rebuild_reencodes_only_new_or_changed_articles(index_dir):
+    encoder = CountingEncoder()
+    build_text_index(IDS, TEXTS, encoder, "m", "hash-1")
+    assert encoder.encoded == 40
+
+    texts = TEXTS[:-1] + ["a brand new description"]
+    index = build_text_index(IDS + ["999"], texts + ["another article"], encoder, "m", "hash-2")
+    assert encoder.encoded == 42
+    np.testing.assert_allclose(index.reconstruct(0), encoder.encode([TEXTS[0]])[0])
+    assert index.ntotal == 41
+
+def test_rebuild_swaps_files_instead_of_overwriting_mapped_ones(index_dir):
+    encoder = CountingEncoder()
+    build_text_index(IDS, TEXTS, encoder, "m", "hash-1")
+    embeddings_path = str(index_dir / "chat_embeddings.npy")
+    mapped = np.load(embeddings_path, mmap_mode="r")
+    before = mapped.copy()
+    inodes = {name: os.stat(index_dir / name).st_ino for name in ("chat_embeddings.npy", "chat_index.faiss")}
+
+    build_text_index(IDS, [t.upper() for t in TEXTS], encoder, "m", "hash-2")
+    # A worker that mapped the old file keeps reading the old, intact pages
+    np.testing.assert_array_equal(mapped, before)
+    assert all(os.stat(index_dir / name).st_ino != inode for name, inode in inodes.items())
+    assert not [p for p in os.listdir(index_dir) if p.endswith(".tmp")]
+
+def test_interrupted_rebuild_leaves_the_previous_index_and_manifest(index_dir, monkeypatch):
+    import faiss
+    encoder = CountingEncoder()
+    build_text_index(IDS, TEXTS, encoder, "m", "hash-1")
+    manifest = (index_dir / "chat_index.json").read_text()
+    index_bytes = (index_dir / "chat_index.faiss").read_bytes()
+
+    def crash(index, path):
+        with open(path, "wb") as f:
+            f.write(b"partial")
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(faiss, "write_index", crash)
+    with pytest.raises(RuntimeError):
+        build_text_index(IDS, TEXTS[::-1], encoder, "m", "hash-2")
+    assert (index_dir / "chat_index.json").read_text() == manifest
+    assert (index_dir / "chat_index.faiss").read_bytes() == index_bytes
+    assert not [p for p in os.listdir(index_dir) if p.endswith(".tmp")]
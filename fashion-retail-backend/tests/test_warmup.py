@@ -0,0 +1,80 @@
+import threading
+import time
+import pytest
+from app.config import settings
+from app.core import warmup
+from app.core.warmup import EngineLoader, start_warmup
+
+@pytest.fixture(autouse=True)
+def loaders(monkeypatch):
+    # Loaders register themselves by name: keep the test ones out of the real registry
+    monkeypatch.setattr(warmup, "loaders", dict(warmup.loaders))
+    return warmup.loaders
+
+class SlowEngine:
+    def __init__(self, delay: float = 0.05, fail: bool = False):
+        self.delay, self.fail = delay, fail
+        self.loads = 0
+        self.ready = False
+
+    def load(self):
+        self.loads += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("checkpoint missing")
+        self.ready = True
+
+def test_concurrent_callers_share_one_load():
+    engine = SlowEngine()
+    loader = EngineLoader("slow", engine.load, lambda: engine.ready)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(loader.ensure())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [True] * 8
+    assert engine.loads == 1
+    assert loader.status()["state"] == "ready" and loader.status()["load_seconds"] >= 0.05
+
+def test_failed_load_is_reported_and_retried_on_next_use():
+    engine = SlowEngine(delay=0, fail=True)
+    loader = EngineLoader("broken", engine.load, lambda: engine.ready)
+    assert not loader.ensure()
+    status = loader.status()
+    assert (status["state"], status["ready"], status["error"]) == ("failed", False, "checkpoint missing")
+    engine.fail = False
+    assert loader.ensure() and engine.loads == 2
+
+def test_half_loaded_engine_never_reports_ready(monkeypatch):
+    from app.services.anomaly_service import AnomalyService
+
+    def crash(model):
+        raise RuntimeError("bad weights")
+
+    monkeypatch.setattr(AnomalyService, "_extract_weights", staticmethod(crash))
+    service = AnomalyService()
+    assert not service.loader.ensure()
+    assert service.model is None and service._weights is None
+    assert service.detect([{"sales": 1, "lag_7": 1}])[0]["error"] == "Anomaly Model could not be loaded"
+
+def test_background_warmup_runs_the_dummy_inference():
+    engine = SlowEngine(delay=0)
+    warmed = []
+    EngineLoader("slow", engine.load, lambda: engine.ready, warm_fn=lambda: warmed.append(True))
+    for thread in start_warmup(["slow", "unknown"]):
+        thread.join()
+    assert warmed == [True]
+
+def test_readiness_probe_waits_for_warmup_engines(client, monkeypatch):
+    engine = SlowEngine(delay=0)
+    loader = EngineLoader("slow", engine.load, lambda: engine.ready)
+    monkeypatch.setattr(settings, "WARMUP_ENGINES", ["slow"])
+
+    response = client.get("/health/ready")
+    assert response.status_code == 503 and response.json()["pending"] == ["slow"]
+    assert client.get("/health/").json()["status"] == "warming_up"
+
+    loader.ensure()
+    assert client.get("/health/ready").json() == {"ready": True}
+    assert client.get("/health/").json()["engines"]["slow"]["state"] == "ready"
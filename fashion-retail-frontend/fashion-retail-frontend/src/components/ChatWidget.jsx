@@ -22,21 +22,52 @@ const ChatWidget = () => {
     if (!input.trim()) return;
 
     const userMsg = { role: 'user', content: input };
-    // Keep last 6 messages for context (3 user, 3 assistant)
-    const contextWindow = [...messages, userMsg].slice(-6); 
+    // Keep last 6 messages for context (3 user, 3 assistant); the API only takes role/content
+    const contextWindow = [...messages, userMsg]
+      .map(({ role, content }) => ({ role, content }))
+      .slice(-6);
     const newMessages = [...messages, userMsg]; // For display
 
     setMessages(newMessages);
     setInput('');
     setLoading(true);
 
+    // Streamed reply: item cards arrive first, then tokens are appended as they are generated
+    const updateReply = (patch) => setMessages(prev => {
+      const next = [...prev];
+      next[next.length - 1] = { ...next[next.length - 1], ...patch(next[next.length - 1]) };
+      return next;
+    });
+
     try {
       // Send context window to backend
-      const response = await axiosClient.post('/api/chat/', {
-        messages: contextWindow
+      const response = await fetch(`${axiosClient.defaults.baseURL}/api/chat/stream`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ messages: contextWindow })
       });
-      
-      setMessages(prev => [...prev, { role: 'assistant', content: response.data.reply }]);
+      if (!response.ok || !response.body) throw new Error(`HTTP ${response.status}`);
+
+      setMessages(prev => [...prev, { role: 'assistant', content: '', items: [] }]);
+      setLoading(false);
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        for (const line of lines) {
+          if (!line.trim()) continue;
+          const event = JSON.parse(line);
+          if (event.type === 'items') updateReply(() => ({ items: event.items }));
+          else if (event.type === 'token') updateReply(msg => ({ content: msg.content + event.text }));
+          else if (event.type === 'error') updateReply(() => ({ content: event.error }));
+        }
+      }
     } catch (error) {
       console.error(error);
       setMessages(prev => [...prev, { role: 'assistant', content: "Connection error. Please ensure backend is running." }]);
@@ -82,7 +113,17 @@ const ChatWidget = () => {
                   </div>
                 )}
                 <div className={`max-w-[75%] p-4 rounded-2xl text-sm leading-relaxed ${msg.role === 'user' ? 'bg-fashion-gold text-fashion-obsidian font-medium' : 'bg-white/5 text-fashion-cream border border-white/10'}`}>
-                  {msg.content}
+                  {msg.items?.length > 0 && (
+                    <div className="mb-3 space-y-1">
+                      {msg.items.map(item => (
+                        <div key={item.article_id} className="text-xs bg-white/5 rounded-lg px-3 py-2 border border-white/10">
+                          <span className="text-fashion-gold font-medium">{item.prod_name}</span>
+                          <span className="text-fashion-cream/60"> · {item.colour_group_name} · #{item.article_id}</span>
+                        </div>
+                      ))}
+                    </div>
+                  )}
+                  <div className="whitespace-pre-line">{msg.content}</div>
                 </div>
                 {msg.role === 'user' && (
                   <div className="w-8 h-8 bg-fashion-rose/20 rounded-full flex items-center justify-center flex-shrink-0">